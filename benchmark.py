@@ -0,0 +1,159 @@
+#  ____                  _                          _
+# | __ )  ___ _ __   ___| |__  _ __ ___   __ _ _ __| | __
+# |  _ \ / _ \ '_ \ / __| '_ \| '_ ` _ \ / _` | '__| |/ /
+# | |_) |  __/ | | | (__| | | | | | | | | (_| | |  |   <
+# |____/ \___|_| |_|\___|_| |_|_| |_| |_|\__,_|_|  |_|\_\
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import re
+import sys
+import timeit
+import typing
+from rich.table import Table
+from engine.tinker import ToolKit
+from memcore.design import Design
+from memnova.dissect import Dissect
+
+# Android 13 `dumpsys meminfo <package>` 典型输出
+SAMPLE = b"""\
+====MEM====
+Applications Memory Usage (in Kilobytes):
+Uptime: 81928374 Realtime: 162837465
+
+** MEMINFO in pid 12345 [com.example.app] **
+                   Pss  Private  Private  SwapPss      Rss     Heap     Heap     Heap
+                 Total    Dirty    Clean    Dirty    Total     Size    Alloc     Free
+                ------   ------   ------   ------   ------   ------   ------   ------
+  Native Heap    48210    48124        0     1290    50132    79360    61842    13409
+  Dalvik Heap    21873    21756        0      412    29124    33154    16577    16577
+ Dalvik Other     6104     5432        0       18     7916
+        Stack     2316     2316        0       12     2324
+       Ashmem      258        8        0        0     1276
+      Gfx dev    15408    15408        0        0    15408
+    Other dev      140        0      140        0      444
+     .so mmap    17245      788    11852      153    56740
+    .jar mmap     2890        0      792        0    31844
+    .apk mmap    12873      188     9968        0    35916
+    .ttf mmap      112        0       32        0      416
+    .dex mmap      418        8      404        0     1572
+    .oat mmap      183        0       40        0     6796
+    .art mmap     4827     4120       76      137    21360
+   Other mmap      881       16      604        0     3284
+    GL mtrack    20736    20736        0        0    20736
+      Unknown     3315     3304        0       40     3860
+        TOTAL   160231   122212    23908     2062   160231    112514    78419    29986
+
+ App Summary
+                       Pss(KB)                        Rss(KB)
+                        ------                         ------
+           Java Heap:    25952                          50484
+         Native Heap:    48124                          50132
+                Code:    24136                         133348
+               Stack:     2316                           2324
+            Graphics:    36144                          36144
+       Private Other:     9448
+              System:    14111
+             Unknown:                                    3448
+
+           TOTAL PSS:   160231            TOTAL RSS:   275880       TOTAL SWAP PSS:     2062
+
+ Objects
+               Views:     1024         ViewRootImpl:        2
+         AppContexts:        8           Activities:        2
+              Assets:       32        AssetManagers:        0
+       Local Binders:      128        Proxy Binders:       64
+       Parcel memory:       40         Parcel count:      160
+    Death Recipients:        4             WebViews:        0
+
+ SQL
+         MEMORY_USED:     1536
+  PAGECACHE_OVERFLOW:      412          MALLOC_SIZE:      117
+====EOF====
+"""
+
+
+# 同一进程的 `dumpsys meminfo --checkin --package` 输出，附带主进程 VmRSS
+SAMPLE_CHECKIN = b"====MEM====\n" + (
+    b"4,12345,com.example.app,79360,33154,N/A,112514,61842,16577,N/A,78419,13409,16577,N/A,29986,"
+    b"48210,21873,90148,160231,0,0,0,0,0,0,0,0,0,0,0,0,48124,21756,52332,122212,0,0,23908,23908,0,0,0,"
+    b"0,1290,412,360,2062,Dalvik Other,6104,0,0,0,5432,0,0,18,Stack,2316,0,0,0,2316,0,0,12,Cursor,0,0,"
+    b"0,0,0,0,0,0,Ashmem,258,0,0,0,8,0,0,0,Gfx dev,15408,0,0,0,15408,0,0,0,Other dev,140,0,0,0,0,140,"
+    b"0,0,.so mmap,17245,0,0,0,788,11852,0,153,.jar mmap,2890,0,0,0,0,792,0,0,.apk mmap,12873,0,0,0,"
+    b"188,9968,0,0,.ttf mmap,112,0,0,0,0,32,0,0,.dex mmap,418,0,0,0,8,404,0,0,.oat mmap,183,0,0,0,0,"
+    b"40,0,0,.art mmap,4827,0,0,0,4120,76,0,137,Other mmap,881,0,0,0,16,604,0,0,EGL mtrack,0,0,0,0,0,"
+    b"0,0,0,GL mtrack,20736,0,0,0,20736,0,0,0,Other mtrack,2442,0,0,0,0,0,0,0,"
+) + b"\nVmRSS:\t  275880 kB\n====EOF===="
+
+
+def legacy(mem_info: bytes) -> tuple[dict, dict]:
+    """
+    原 `mem_analyze` 的 ToolKit 路径：逐字段编译正则并重复扫描区段文本。
+    """
+    text = mem_info.decode(encoding="UTF-8", errors="ignore").strip()
+    meminfo_map, summary_map = {}, {}
+
+    if app_meminfo := re.search(r"\*\* MEMINFO.*?(?=App Summary)", text, re.S):
+        meminfo_c = app_meminfo.group()
+        for i in Dissect.meminfo_fields:
+            meminfo_map[i] = ToolKit.fit_mem(i, meminfo_c)
+        meminfo_map["TOTAL USS"] = ToolKit.uss_addition(meminfo_c)
+
+    if app_summary := re.search(r"App Summary.*?(?=Objects)", text, re.S):
+        summary_c = app_summary.group()
+        for i in Dissect.summary_fields:
+            summary_map[i] = ToolKit.fit_mem(i, summary_c)
+
+    return meminfo_map, summary_map
+
+
+def single_pass(mem_info: bytes) -> tuple[dict, dict]:
+    """
+    `Dissect` 单遍字节解析路径。
+    """
+    return Dissect.mem_fields(Dissect.parse(mem_info))
+
+
+def checkin(mem_info: bytes) -> tuple[dict, dict]:
+    """
+    `Dissect` 紧凑格式解析路径。
+    """
+    return Dissect.mem_fields(Dissect.checkin(mem_info, "12345")["12345"])
+
+
+def bench(rounds: int = 2000) -> typing.Any:
+    """
+    对比各条解析路径的单次耗时，并校验映射结果一致。
+
+    Parameters
+    ----------
+    rounds : int
+        每条路径的重复次数。
+    """
+    old = legacy(SAMPLE)
+    for name, new in (("single", single_pass(SAMPLE)), ("checkin", checkin(SAMPLE_CHECKIN))):
+        if old != new:
+            return Design.console.print(f"[bold #FF5F5F]Mismatch\nlegacy={old}\n{name}={new}")
+
+    table = Table(title=f"meminfo parse x {rounds}", show_header=True, header_style="bold #87AFD7")
+    for column in ("path", "bytes", "total ms", "per call us", "speedup"):
+        table.add_column(column, justify="right")
+
+    results = {
+        name: (len(sample), timeit.timeit(lambda: func(sample), number=rounds))
+        for name, func, sample in (
+            ("ToolKit", legacy, SAMPLE), ("Dissect", single_pass, SAMPLE), ("Checkin", checkin, SAMPLE_CHECKIN)
+        )
+    }
+    for name, (size, cost) in results.items():
+        table.add_row(
+            name, f"{size}", f"{cost * 1000:.2f}", f"{cost / rounds * 1e6:.2f}", f"{results['ToolKit'][1] / cost:.1f}x"
+        )
+
+    Design.console.print(table)
+
+
+if __name__ == '__main__':
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
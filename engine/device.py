@@ -69,6 +69,21 @@ class Device(object):
         cmd = self.__initial + ["shell", "am", "dumpheap", package, dst]
         return await Terminal.cmd_line(cmd)
 
+    async def settle_file(self, dst: str, timeout: int = 120, *_, **__) -> typing.Optional[int]:
+        """
+        等待设备上的目标文件写入完成（大小非零且连续两秒不变），返回文件大小（字节），超时返回 None。
+
+        `am dumpheap` 在部分系统版本上立即返回，快照由应用进程异步写出，拉取前需等待写入结束。
+        """
+        cmd = self.__initial + [
+            "shell",
+            f"last=-1; for i in $(seq {max(timeout // 2, 1)}); do sleep 2; "
+            f"size=$(stat -c %s {dst} 2>/dev/null || echo 0); "
+            f"if [ \"$size\" -gt 0 ] && [ \"$size\" = \"$last\" ]; then echo $size; exit 0; fi; last=$size; done"
+        ]
+        response = await Terminal.cmd_line(cmd)
+        return int(response) if response and response.isdigit() else None
+
     async def remove(self, dst: str, *_, **__) -> typing.Any:
         """
         删除设备上的目标文件。
@@ -100,17 +115,22 @@ class Device(object):
 
     async def pid_value(self, package: str, *_, **__) -> typing.Optional["Pid"]:
         """
-        查询指定包名对应的进程 PID（支持多进程）。
+        查询应用的全部进程（`package` 主进程与 `package:*` 子进程），一次遍历 /proc 完成。
+
+        进程名取 /proc/[pid]/cmdline 中第一个 NUL 之前的部分（应用进程由 zygote 改写为进程名），只用 shell 内建命令，
+        每个进程不派生子进程；返回的映射中主进程在前，其余按 PID 升序。
         """
-        cmd = self.__initial + ["shell", "ps", "-A", "|", "grep", package]
+        cmd = self.__initial + [
+            "shell",
+            f"cd /proc && for p in [0-9]*; do n=; read -r -d '' n < $p/cmdline; "
+            f"case $n in {package}|{package}:*) echo $p $n;; esac; done 2>/dev/null"
+        ]
         result = await Terminal.cmd_line(cmd)
         if result and (pid_list := result.split("\n")):
-            try:
-                return Pid(
-                    {i.split()[1]: name for i in pid_list if (name := i.split()[8]) == package}
-                )
-            except IndexError:
-                return None
+            member = [
+                (pid, name.strip()) for pid, _, name in (i.strip().partition(" ") for i in pid_list) if pid.isdigit()
+            ]
+            return Pid(dict(sorted(member, key=lambda m: (m[1] != package, int(m[0])))))
 
     async def activity(self, *_, **__) -> typing.Any:
         """
@@ -133,19 +153,105 @@ class Device(object):
         response = await Terminal.cmd_line(cmd)
         return int(response) if re.fullmatch(r"-?\d+", response or "") else None
 
-    async def mem_info(self, package: str, *_, **__) -> typing.Any:
+    async def mem_info(self, package: str, *_, meter: str = "", **__) -> typing.Any:
         """
-        获取应用内存明细（dumpsys meminfo 原始文本）。
+        获取应用内存明细（dumpsys meminfo 原始字节，不解码）。
         """
-        cmd = self.__initial + ["shell", f"echo ====MEM====; dumpsys meminfo {package}; echo ====EOF===="]
-        return await Terminal.cmd_line(cmd)
+        cmd = self.__initial + ["shell", f"{meter}echo ====MEM====; dumpsys meminfo {package}; echo ====EOF====; {meter}"]
+        return await Terminal.cmd_bytes(cmd)
 
-    async def io_info(self, pid: str, *_, **__) -> typing.Any:
+    async def mem_checkin(self, package: str, pids: list[str], *_, meter: str = "", **__) -> typing.Any:
         """
-        获取指定进程的 /proc/[pid]/io 信息。
+        获取应用全部进程的紧凑格式内存明细（dumpsys meminfo --checkin）及各进程 VmRSS，返回原始字节。
         """
-        cmd = self.__initial + ["shell", f"echo ====I/O====; cat /proc/{pid}/io; echo ====EOF===="]
-        return await Terminal.cmd_line(cmd)
+        status = " ".join(f"/proc/{pid}/status" for pid in pids)
+        cmd = self.__initial + [
+            "shell",
+            f"{meter}echo ====MEM====; dumpsys meminfo --checkin --package {package}; "
+            f"grep -H VmRSS {status}; echo ====EOF====; {meter}"
+        ]
+        return await Terminal.cmd_bytes(cmd)
+
+    async def io_info(self, pid: str, *_, meter: str = "", **__) -> typing.Any:
+        """
+        获取指定进程的 /proc/[pid]/io 信息（原始字节，不解码）。
+        """
+        cmd = self.__initial + ["shell", f"{meter}echo ====I/O====; cat /proc/{pid}/io; echo ====EOF====; {meter}"]
+        return await Terminal.cmd_bytes(cmd)
+
+    async def proc_io(self, pids: list[str], *_, meter: str = "", **__) -> typing.Any:
+        """
+        一次调用获取多个进程的 /proc/[pid]/io 信息，按 `====PID <pid>====` 分段（原始字节，不解码）。
+        """
+        cmd = self.__initial + [
+            "shell",
+            f"{meter}for p in {' '.join(pids)}; do echo ====PID $p====; cat /proc/$p/io; done; echo ====EOF====; {meter}"
+        ]
+        return await Terminal.cmd_bytes(cmd)
+
+    async def smaps_rollup(self, package: str, pids: list[str], *_, meter: str = "", **__) -> typing.Any:
+        """
+        一次调用获取多个进程的 /proc/[pid]/smaps_rollup，按 `====PID <pid>====` 分段（原始字节，不解码）；
+        shell 用户无权读取时以 run-as 重试（仅可调试应用），已退出的进程不输出分段。
+        """
+        cmd = self.__initial + [
+            "shell",
+            f"{meter}for p in {' '.join(pids)}; do [ -d /proc/$p ] || continue; echo ====PID $p====; "
+            f"cat /proc/$p/smaps_rollup 2>/dev/null || run-as {package} cat /proc/$p/smaps_rollup; "
+            f"done; echo ====EOF====; {meter}"
+        ]
+        return await Terminal.cmd_bytes(cmd)
+
+    async def smaps(self, package: str, pids: list[str], *_, meter: str = "", **__) -> typing.Any:
+        """
+        一次调用获取多个进程的 /proc/[pid]/smaps，按 `====PID <pid>====` 分段（原始字节，不解码）；
+        设备端只保留映射头与 Rss、Pss、SwapPss 行，传输量约为原文的五分之一，shell 用户无权读取时以 run-as 重试，
+        已退出的进程不输出分段。
+        """
+        cmd = self.__initial + [
+            "shell",
+            f"{meter}for p in {' '.join(pids)}; do [ -d /proc/$p ] || continue; echo ====PID $p====; "
+            f"{{ cat /proc/$p/smaps 2>/dev/null || run-as {package} cat /proc/$p/smaps; }} "
+            f"| grep -E '^[0-9a-f]+-[0-9a-f]+ |^(Rss|Pss|SwapPss):'; "
+            f"done; echo ====EOF====; {meter}"
+        ]
+        return await Terminal.cmd_bytes(cmd)
+
+    async def logcat(self, package: str, *_, **__) -> "asyncio.subprocess.Process":
+        """
+        启动常驻的 logcat 流，整个采集期间只有这一次 adb 调用；设备端按标签过滤，只输出 ART GC（应用进程名或 zygote 标签）、
+        lowmemorykiller 与 am_kill、am_low_memory 事件，从设备当前时间开始，不回放缓冲区中的旧日志。
+        """
+        tags = (package, "art", "zygote", "zygote64", "lowmemorykiller", "lmkd", "am_kill", "am_low_memory")
+        specs = " ".join(f"{tag}:I" for tag in tags)
+        cmd = self.__initial + [
+            "shell", f'exec logcat -v epoch -b main,system,events -T "$(date +%s).0" {specs} "*:S"'
+        ]
+        return await Terminal.cmd_link(cmd)
+
+    @staticmethod
+    def meter(pids: typing.Iterable[str]) -> str:
+        """
+        生成 CPU 计量片段，插在采集命令前后即可在同一次 shell 调用内取得探测前后的 CPU 快照，不额外增加 adb 往返。
+
+        快照以 `====CPU====` / `====UPC====` 包围：首行为 /proc/stat 的汇总行（shell 内建 read，不派生进程），
+        其后依次为当前 shell 自身（$$，含已回收子进程的耗时）与各 pid 的 /proc/[pid]/stat。
+        """
+        stats = " ".join(f"/proc/{pid}/stat" for pid in pids)
+        return (
+            f'echo ====CPU====; read -r l < /proc/stat; echo "$l"; '
+            f"cat /proc/$$/stat {stats} 2>/dev/null; echo ====UPC====; "
+        )
+
+    async def observer_pids(self, *_, **__) -> dict[str, str]:
+        """
+        查询 system_server 与 adbd 的 PID，返回 pid -> 进程名，用于计量采集本身在设备端引起的 CPU 开销。
+        """
+        cmd = self.__initial + ["shell", "for n in system_server adbd; do echo $n $(pidof $n); done"]
+        response = await Terminal.cmd_line(cmd) or ""
+        return {
+            pid: name for name, *pids in (line.split() for line in response.splitlines() if line.strip()) for pid in pids
+        }
 
     async def union_dump(self, pid: str, package: str, *_, **__) -> typing.Any:
         """
@@ -38,6 +38,22 @@ class Terminal(object):
         if stderr:
             return stderr.decode(encoding=const.CHARSET, errors="ignore").strip()
 
+    @staticmethod
+    async def cmd_bytes(cmd: list[str], transmit: typing.Optional[bytes] = None) -> typing.Optional[bytes]:
+        """
+        执行异步子进程命令并返回原始字节输出，不做解码，供字节级解析器直接使用。
+        """
+        logger.debug(cmd)
+
+        transports = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+
+        stdout, stderr = await transports.communicate(transmit)
+
+        return stdout.strip() or stderr.strip() or None
+
     @staticmethod
     async def cmd_link(cmd: list[str]) -> "asyncio.subprocess.Process":
         """
@@ -12,6 +12,7 @@ import re
 import sys
 import yaml
 import json
+import time
 import random
 import shutil
 import typing
@@ -294,6 +295,41 @@ class Active(object):
 class Period(object):
     """Period"""
 
+    # 墙钟与单调时钟的锚点差值，采样过程中系统时间被修改也不会造成时间戳回退或跳变
+    __anchor: float = time.time() - time.monotonic()
+
+    @staticmethod
+    def stamp() -> int:
+        """
+        返回以单调时钟为基准锚定的 Unix 毫秒时间戳，作为采样数据的统一时间轴。
+        """
+        return int((Period.__anchor + time.monotonic()) * 1000)
+
+    @staticmethod
+    def convert_stamp(raw_time: str) -> int:
+        """
+        将压缩时间字符串（如 20250803143000）转换为 Unix 毫秒时间戳。
+        """
+        try:
+            return int(datetime.strptime(raw_time, "%Y%m%d%H%M%S").timestamp() * 1000)
+        except ValueError:
+            raise MemrixError(f"非法时间格式: {raw_time}")
+
+    @staticmethod
+    def format_stamp(stamp: int) -> str:
+        """
+        将 Unix 毫秒时间戳格式化为本地可读时间（YYYY-MM-DD HH:MM:SS.fff）。
+        """
+        return datetime.fromtimestamp(stamp / 1000).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+    @staticmethod
+    def local_offset() -> int:
+        """
+        返回本地时区相对 UTC 的毫秒偏移量，用于绘图时将 Unix 时间戳映射为本地墙钟时间。
+        """
+        offset = datetime.now().astimezone().utcoffset()
+        return int(offset.total_seconds() * 1000) if offset else 0
+
     @staticmethod
     def convert_time(raw_time: str) -> str:
         """
@@ -0,0 +1,259 @@
+#     _             _     _
+#    / \   _ __ ___| |__ (_)_   _____
+#   / _ \ | '__/ __| '_ \| \ \ / / _ \
+#  / ___ \| | | (__| | | | |\ V /  __/
+# /_/   \_\_|  \___|_| |_|_| \_/ \___|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import os
+import mmap
+import queue
+import struct
+import typing
+import threading
+import zstandard
+from collections import OrderedDict
+from pathlib import Path
+from loguru import logger
+from memnova.dissect import Dissect
+from memnova import const
+
+
+class Archive(object):
+    """
+    原始采集存档，每个任务一个文件（`<data_dir>.mxz`），与任务日志位于同一目录，并配套索引文件（`.mxi`）。
+
+    文件格式：
+
+    - 存档头：magic(4s) + version(H)
+    - 记录：tick(I) + kind(B) + pid(i) + tms(q) + ref(Q) + length(I) + zstd 帧（单条原始输出）
+    - 索引：每条记录一行 tick(I) + kind(B) + pid(i) + tms(q) + ref(Q) + offset(Q) + length(I)，offset 指向记录头
+
+    相邻轮次的 dumpsys 输出几乎相同，逐帧独立压缩收益有限。每个 (kind, pid) 的首条记录独立压缩作为参考帧（ref 为 0），
+    后续记录以参考帧原文作为 zstd 原始内容字典压缩，ref 指向参考帧偏移；每 `refresh` 条更换一次参考帧，
+    避免长时间运行后内容漂移导致压缩率下降，也不会形成引用链。
+    参考帧压缩器最多保留 `capacity` 个，按最近使用淘汰，应用进程反复重启、PID 不断变化时内存占用仍然有界。
+
+    采样循环只把原始字节放入队列，压缩与写盘由后台线程完成，不占用事件循环；
+    任务日志中仅保留一行摘要。索引缺失或不完整时按记录头顺序扫描存档重建。
+    """
+
+    kinds = {"meminfo": 1, "checkin": 2, "io": 3, "smaps": 4, "maps": 5}
+
+    __head = struct.Struct("<4sH")
+    __frame = struct.Struct("<IBiqQI")
+    __entry = struct.Struct("<IBiqQQI")
+
+    def __init__(
+        self, archive_file: typing.Union[str, "Path"], level: int = 3, refresh: int = 1000, capacity: int = 64
+    ):
+        self.archive_file = Path(archive_file)
+        self.index_file = self.archive_file.with_suffix(const.ARCHIVE_INDEX)
+        self.level, self.refresh, self.capacity = level, refresh, capacity
+        self.archived, self.raw_bytes, self.packed_bytes = 0, 0, 0
+        self.__queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.__worker: typing.Optional["threading.Thread"] = None
+
+    def open(self) -> "Archive":
+        """
+        启动后台写入线程。
+        """
+        self.__worker = threading.Thread(target=self.__drain, name="archive writer", daemon=True)
+        self.__worker.start()
+        return self
+
+    def put(self, tick: int, kind: str, pid: typing.Union[str, int], tms: int, raw: bytes) -> None:
+        """
+        投递一条原始输出，立即返回。
+
+        Parameters
+        ----------
+        tick : int
+            采样轮次编号。
+
+        kind : str
+            输出类型，取值见 `Archive.kinds`。
+
+        pid : str or int
+            输出所属进程 PID。
+
+        tms : int
+            采样时间（Unix 毫秒时间戳）。
+
+        raw : bytes
+            原始字节输出。
+        """
+        self.__queue.put((tick, Archive.kinds[kind], int(pid), tms, raw))
+
+    def __drain(self) -> None:
+        compressor = zstandard.ZstdCompressor(level=self.level)
+        # (kind, pid) -> [参考帧偏移, 参考帧压缩器, 已引用次数]
+        references: "OrderedDict[tuple, list]" = OrderedDict()
+
+        with open(self.archive_file, "ab") as sink, open(self.index_file, "ab") as index:
+            if sink.tell() == 0:
+                sink.write(Archive.__head.pack(const.ARCHIVE_MAGIC, const.ARCHIVE_VERSION))
+
+            while (item := self.__queue.get()) is not None:
+                tick, kind, pid, tms, raw = item
+                offset = sink.tell()
+
+                if (reference := references.get((kind, pid))) and reference[2] < self.refresh:
+                    ref, frame = reference[0], reference[1].compress(raw)
+                    reference[2] += 1
+                    references.move_to_end((kind, pid))
+                else:
+                    ref, frame = 0, compressor.compress(raw)
+                    references[(kind, pid)] = [offset, zstandard.ZstdCompressor(
+                        level=self.level, dict_data=Archive.dictionary(raw)
+                    ), 0]
+                    references.move_to_end((kind, pid))
+                    if len(references) > self.capacity:
+                        references.popitem(last=False)
+
+                sink.write(Archive.__frame.pack(tick, kind, pid, tms, ref, len(frame)) + frame)
+                index.write(Archive.__entry.pack(tick, kind, pid, tms, ref, offset, len(frame)))
+
+                self.archived += 1
+                self.raw_bytes += len(raw)
+                self.packed_bytes += len(frame)
+
+                # 队列暂空时刷新，进程被终止最多丢失正在压缩的一批
+                if self.__queue.empty():
+                    sink.flush()
+                    index.flush()
+
+    def close(self) -> None:
+        """
+        写完队列中剩余的记录后停止后台线程，阻塞调用，应通过 `asyncio.to_thread` 调用。
+        """
+        if self.__worker and self.__worker.is_alive():
+            self.__queue.put(None)
+            self.__worker.join()
+            logger.info(
+                f"Archived {self.archived} dumps {self.raw_bytes} B -> {self.packed_bytes} B: {self.archive_file.name}"
+            )
+
+    @staticmethod
+    def dictionary(raw: bytes) -> "zstandard.ZstdCompressionDict":
+        """
+        以参考帧原文构造 zstd 原始内容字典。
+        """
+        return zstandard.ZstdCompressionDict(raw, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+
+    @staticmethod
+    def index(archive_file: typing.Union[str, "Path"]) -> list[tuple]:
+        """
+        读取存档索引，返回 [(tick, kind, pid, tms, ref, offset, length), ...]。
+
+        索引与存档末尾不一致（缺失、截断或滞后）时改为顺序扫描记录头重建。
+        """
+        archive_file = Path(archive_file)
+        index_file, entry, frame = archive_file.with_suffix(const.ARCHIVE_INDEX), Archive.__entry, Archive.__frame
+        size = archive_file.stat().st_size
+
+        if index_file.is_file():
+            data = index_file.read_bytes()
+            entries = [*entry.iter_unpack(data[:len(data) - len(data) % entry.size])]
+            if entries and (last := entries[-1])[5] + frame.size + last[6] == size:
+                return entries
+
+        entries, offset = [], Archive.__head.size
+        with open(archive_file, "rb") as f:
+            f.seek(offset)
+            while len(head := f.read(frame.size)) == frame.size:
+                tick, kind, pid, tms, ref, length = frame.unpack(head)
+                if offset + frame.size + length > size:
+                    break
+                entries.append((tick, kind, pid, tms, ref, offset, length))
+                offset += frame.size + length
+                f.seek(offset)
+
+        logger.warning(f"Archive index rebuilt: {archive_file.name} {len(entries)} records")
+        return entries
+
+    @staticmethod
+    def records(
+        archive_file: typing.Union[str, "Path"],
+        tick: typing.Optional[int] = None,
+        kind: typing.Optional[str] = None
+    ) -> typing.Iterator[dict]:
+        """
+        按索引逐条解压存档记录，可按轮次与类型筛选。
+
+        Parameters
+        ----------
+        archive_file : str or Path
+            存档文件路径。
+
+        tick : int, optional
+            仅返回指定轮次。
+
+        kind : str, optional
+            仅返回指定类型。
+
+        Yields
+        ------
+        dict
+            {"tick", "kind", "pid", "tms", "raw"}。
+        """
+        names = {v: k for k, v in Archive.kinds.items()}
+        decompressor = zstandard.ZstdDecompressor()
+        # 参考帧偏移 -> 以其原文为字典的解压器
+        references: dict[int, "zstandard.ZstdDecompressor"] = {}
+
+        with open(archive_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= Archive.__head.size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                magic, version = Archive.__head.unpack_from(buffer, 0)
+                if magic != const.ARCHIVE_MAGIC or version != const.ARCHIVE_VERSION:
+                    return logger.warning(f"Unknown archive format: {archive_file}")
+
+                frame: typing.Callable[[int], bytes] = lambda at: buffer[
+                    at + Archive.__frame.size:at + Archive.__frame.size + Archive.__frame.unpack_from(buffer, at)[5]
+                ]
+
+                for t, k, pid, tms, ref, offset, length in Archive.index(archive_file):
+                    if (tick is not None and t != tick) or (kind is not None and names.get(k) != kind):
+                        continue
+                    if ref and ref not in references:
+                        references[ref] = zstandard.ZstdDecompressor(
+                            dict_data=Archive.dictionary(decompressor.decompress(frame(ref)))
+                        )
+                    yield {
+                        "tick": t, "kind": names.get(k, str(k)), "pid": str(pid), "tms": tms,
+                        "raw": (references[ref] if ref else decompressor).decompress(frame(offset))
+                    }
+
+    @staticmethod
+    def replay(archive_file: typing.Union[str, "Path"], tick: typing.Optional[int] = None) -> typing.Iterator[dict]:
+        """
+        逐条解压存档并重新送入解析器，返回与采样时一致的字段映射，用于排查解析问题。
+
+        Yields
+        ------
+        dict
+            {"tick", "kind", "pid", "tms", "size", "fields"}；内存类记录 fields 为 (meminfo_map, summary_map)，
+            I/O 记录为 io_map，smaps 记录为 smaps_map，maps 记录为按映射汇总的 (rss, pss, swap_pss) kB，解析失败时为空。
+        """
+        for record in Archive.records(archive_file, tick):
+            raw, pid = record.pop("raw"), record["pid"]
+            if record["kind"] == "meminfo":
+                fields = Dissect.mem_fields(Dissect.parse(raw))
+            elif record["kind"] == "checkin":
+                fields = Dissect.mem_fields(Dissect.checkin(raw, pid).get(pid, {}))
+            elif record["kind"] == "smaps":
+                fields = Dissect.smaps_fields(raw)
+            elif record["kind"] == "maps":
+                fields = Dissect.smaps_mappings(raw)
+            else:
+                fields = Dissect.io_fields(raw)
+            yield {**record, "size": len(raw), "fields": fields}
+
+
+if __name__ == '__main__':
+    pass
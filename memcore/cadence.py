@@ -0,0 +1,369 @@
+#   ____          _
+#  / ___|__ _  __| | ___ _ __   ___ ___
+# | |   / _` |/ _` |/ _ \ '_ \ / __/ _ \
+# | |__| (_| | (_| |  __/ | | | (_|  __/
+#  \____\__,_|\__,_|\___|_| |_|\___\___|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import math
+import time
+import typing
+import asyncio
+import numpy as np
+from collections import deque
+from engine.tinker import Period
+
+
+class Cadence(object):
+    """
+    固定速率采样调度器，以事件循环单调时钟 `loop.time()` 上的绝对截止时间驱动每一轮采样。
+
+    第 n 轮的计划时间固定为 `origin + n * period`，与单轮耗时无关，因此不会随设备负载累积漂移。
+    上一轮尚未结束时，下一轮按时启动并与之重叠（最多 `overlap` 轮同时在途），
+    设备查询互相重叠，写入日志则通过 `turn` 事件按轮次顺序进行；
+    在途轮次已满或事件循环被阻塞超过一个周期时，错过的截止时间直接跳过并计数，不会集中补采。
+
+    轮次编号即截止时间序号，跳过的轮次在编号上留下空缺；
+    每个样本的计划时间与实际时间（Unix 毫秒）用于统计实际速率与抖动，统计量均为增量累加，内存占用恒定。
+
+    `period` 可在运行中修改（自适应采样），自下一个截止时间起生效。
+
+    Parameters
+    ----------
+    period : float
+        采样周期（秒）。
+
+    overlap : int, optional
+        同时在途的最大轮次数，默认 2。
+    """
+
+    def __init__(self, period: float, overlap: int = 2):
+        self.period = self.nominal = period
+        self.overlap = max(overlap, 1)
+
+        self.launched, self.missed = 0, 0
+        self.idle: "asyncio.Event" = asyncio.Event()
+        self.idle.set()
+
+        # 计划与实际时间的偏差（毫秒），Welford 增量均值与方差
+        self.samples, self.lag_mean, self.lag_m2, self.lag_max = 0, 0.0, 0.0, 0.0
+        self.first_actual: typing.Optional[int] = None
+        self.last_actual: typing.Optional[int] = None
+
+        self.__inflight: set["asyncio.Task"] = set()
+
+    async def pace(
+        self,
+        launch: typing.Callable[[int, int, "asyncio.Event"], typing.Awaitable],
+        close_event: "asyncio.Event"
+    ) -> None:
+        """
+        按固定速率启动采样轮次，直到关闭事件触发，返回前等待全部在途轮次结束。
+
+        Parameters
+        ----------
+        launch : Callable
+            单轮采样协程函数，参数为 (轮次编号, 计划时间 Unix 毫秒, 前一轮完成事件)；
+            写入结果前应先等待前一轮完成事件，以保证日志按轮次顺序追加。
+
+        close_event : asyncio.Event
+            关闭事件。
+        """
+        loop = asyncio.get_running_loop()
+        deadline, tick = loop.time(), 0
+        previous = asyncio.Event()
+        previous.set()
+
+        while not close_event.is_set():
+            tick += 1
+
+            if len(self.__inflight) < self.overlap:
+                scheduled = Period.stamp() + int((deadline - loop.time()) * 1000)
+                previous, task = (done := asyncio.Event()), asyncio.create_task(
+                    self.__run(launch, tick, scheduled, previous, done), name=f"tick {tick}"
+                )
+                self.__inflight.add(task)
+                self.idle.clear()
+                task.add_done_callback(self.__settle)
+                self.launched += 1
+            else:
+                self.missed += 1
+
+            deadline += self.period
+
+            # 落后整周期以上的截止时间已无意义，跳过并计数，不集中补采
+            if (behind := loop.time() - deadline) >= self.period:
+                skipped = int(behind // self.period)
+                deadline += skipped * self.period
+                tick += skipped
+                self.missed += skipped
+
+            try:
+                await asyncio.wait_for(close_event.wait(), timeout=max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                pass
+
+        if self.__inflight:
+            await asyncio.gather(*self.__inflight, return_exceptions=True)
+
+    @staticmethod
+    async def __run(
+        launch: typing.Callable,
+        tick: int,
+        scheduled: int,
+        previous: "asyncio.Event",
+        done: "asyncio.Event"
+    ) -> None:
+        try:
+            await launch(tick, scheduled, previous)
+        finally:
+            done.set()
+
+    def __settle(self, task: "asyncio.Task") -> None:
+        self.__inflight.discard(task)
+        if not self.__inflight:
+            self.idle.set()
+
+    def record(self, scheduled: int, actual: int) -> None:
+        """
+        登记一个已写入样本的计划时间与实际时间（Unix 毫秒）。
+        """
+        lag = actual - scheduled
+        self.samples += 1
+        delta = lag - self.lag_mean
+        self.lag_mean += delta / self.samples
+        self.lag_m2 += delta * (lag - self.lag_mean)
+        self.lag_max = max(self.lag_max, abs(lag))
+
+        if self.first_actual is None:
+            self.first_actual = actual
+        self.last_actual = actual
+
+    def summary(self) -> dict:
+        """
+        汇总本次采样的节奏统计。
+
+        Returns
+        -------
+        dict
+            - period  : 初始计划周期（秒）。
+            - target  : 初始计划速率（Hz）。
+            - rate    : 实际速率（Hz），按首末样本实际时间计算。
+            - samples : 写入样本数。
+            - missed  : 跳过的截止时间数。
+            - lag     : 实际时间相对计划时间的平均偏差（毫秒）。
+            - jitter  : 偏差的标准差（毫秒）。
+            - lag_max : 偏差绝对值的最大值（毫秒）。
+        """
+        span = (self.last_actual - self.first_actual) / 1000 if self.samples > 1 else 0.0
+        return {
+            "period": self.nominal,
+            "target": round(1 / self.nominal, 4),
+            "rate": round((self.samples - 1) / span, 4) if span > 0 else 0.0,
+            "samples": self.samples,
+            "missed": self.missed,
+            "lag": round(self.lag_mean, 2),
+            "jitter": round(math.sqrt(self.lag_m2 / self.samples), 2) if self.samples else 0.0,
+            "lag_max": round(self.lag_max, 2)
+        }
+
+
+class Governor(object):
+    """
+    自适应采样周期估计器，根据 PSS 序列的在线趋势在 [floor, ceil] 之间调整内存通道的采样周期。
+
+    每个样本 O(1) 更新：以指数加权滑动平均估计斜率（MB/s），以上一样本加斜率外推的预测残差估计方差。
+
+    - 突变：残差超过 `sigma` 倍标准差，或前后台切换，周期直接收紧到 floor；
+    - 趋势：按当前斜率一个周期内的变化量超过 `tolerance`（MB），周期减半；
+    - 平稳：以上均不满足时周期按 `relax` 倍逐步放宽，直到 ceil。
+
+    Parameters
+    ----------
+    floor : float
+        最短采样周期（秒）。
+
+    ceil : float
+        最长采样周期（秒）。
+
+    tolerance : float, optional
+        一个周期内可忽略的 PSS 变化量（MB），默认 1.0。
+
+    sigma : float, optional
+        判定突变的残差标准差倍数，默认 3.0。
+
+    relax : float, optional
+        平稳时周期的放宽倍数，默认 1.25。
+
+    alpha : float, optional
+        指数加权系数，默认 0.3。
+
+    warmup : int, optional
+        开始判定突变前所需的样本数，默认 5。
+    """
+
+    def __init__(
+        self,
+        floor: float,
+        ceil: float,
+        tolerance: float = 1.0,
+        sigma: float = 3.0,
+        relax: float = 1.25,
+        alpha: float = 0.3,
+        warmup: int = 5
+    ):
+        self.floor, self.ceil = min(floor, ceil), max(floor, ceil)
+        self.tolerance, self.sigma, self.relax, self.alpha, self.warmup = tolerance, sigma, relax, alpha, warmup
+
+        self.interval = self.floor
+        self.count, self.slope, self.variance = 0, 0.0, 0.0
+        self.last: typing.Optional[tuple] = None
+
+        self.tightened, self.relaxed = 0, 0
+        self.interval_sum, self.interval_min, self.interval_max = 0.0, math.inf, 0.0
+
+    def update(self, pss: float, mode: str, timestamp: int) -> float:
+        """
+        输入一个样本，返回下一轮的采样周期（秒）。
+
+        Parameters
+        ----------
+        pss : float
+            样本 PSS（MB）。
+
+        mode : str
+            前后台状态（FG / BG）。
+
+        timestamp : int
+            实际采样时间（Unix 毫秒）。
+
+        Returns
+        -------
+        float
+            下一轮的采样周期（秒）。
+        """
+        self.count += 1
+
+        if self.last is None or timestamp <= self.last[2]:
+            self.last = (pss, mode, timestamp)
+            return self.__choose(self.interval)
+
+        last_pss, last_mode, last_time = self.last
+        self.last = (pss, mode, timestamp)
+        dt = (timestamp - last_time) / 1000
+
+        residual = pss - (last_pss + self.slope * dt)
+        jump = self.count > self.warmup and residual * residual > self.sigma * self.sigma * self.variance
+
+        self.slope += self.alpha * ((pss - last_pss) / dt - self.slope)
+        self.variance += self.alpha * (residual * residual - self.variance)
+
+        if jump or mode != last_mode:
+            self.tightened += 1
+            return self.__choose(self.floor)
+        if abs(self.slope) * self.interval > self.tolerance:
+            self.tightened += 1
+            return self.__choose(self.interval / 2)
+
+        self.relaxed += 1
+        return self.__choose(self.interval * self.relax)
+
+    def __choose(self, interval: float) -> float:
+        self.interval = round(min(self.ceil, max(self.floor, interval)), 3)
+        self.interval_sum += self.interval
+        self.interval_min = min(self.interval_min, self.interval)
+        self.interval_max = max(self.interval_max, self.interval)
+        return self.interval
+
+    def summary(self) -> dict:
+        """
+        汇总自适应调整统计：周期上下限、实际选用周期的均值与范围、收紧与放宽次数。
+        """
+        return {
+            "floor": self.floor,
+            "ceil": self.ceil,
+            "mean": round(self.interval_sum / self.count, 3) if self.count else 0.0,
+            "min": self.interval_min if self.count else 0.0,
+            "max": self.interval_max,
+            "tightened": self.tightened,
+            "relaxed": self.relaxed
+        }
+
+
+class Latency(object):
+    """
+    单轮采样的分阶段耗时统计，以单调时钟 `time.perf_counter()` 计时，单位毫秒。
+
+    阶段依次为进程查询（pid）、前台页面（activity）、优先级（adj）、内存明细（meminfo）、I/O（io）、
+    输出解析（parse）、等待前一轮（wait）、写入日志（journal）与整轮耗时（total）。
+    同一阶段对多个进程并发执行时取最大值，即该阶段在本轮关键路径上的耗时。
+
+    每轮的分解随样本写入 `tick_stats` 表；实时面板只保留最近 `window` 轮用于计算分位数，内存占用恒定。
+
+    Parameters
+    ----------
+    window : int, optional
+        实时分位数的滑动窗口轮数，默认 256。
+    """
+
+    stages = ("pid", "activity", "adj", "meminfo", "io", "parse", "wait", "journal", "total")
+
+    def __init__(self, window: int = 256):
+        self.__recent: dict[str, "deque"] = {stage: deque(maxlen=window) for stage in Latency.stages}
+
+    @staticmethod
+    def lap(timing: dict, stage: str, start: float) -> float:
+        """
+        记录自 `start` 起的耗时，同一阶段多次记录取最大值，返回当前单调时钟读数。
+        """
+        timing[stage] = max(timing.get(stage, 0.0), ((now := time.perf_counter()) - start) * 1000)
+        return now
+
+    @staticmethod
+    async def timed(timing: dict, stage: str, awaitable: typing.Awaitable) -> typing.Any:
+        """
+        等待协程并记录其耗时。
+        """
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            Latency.lap(timing, stage, start)
+
+    def record(self, timing: dict) -> dict:
+        """
+        登记一轮的分阶段耗时，返回保留两位小数的分解（即 `Cubicle.insert_tick_stats` 的负载）。
+        """
+        breakdown = {stage: round(timing[stage], 2) for stage in Latency.stages if stage in timing}
+        for stage, cost in breakdown.items():
+            self.__recent[stage].append(cost)
+        return breakdown
+
+    def percentiles(self, q: tuple = (50, 95)) -> dict[str, list]:
+        """
+        最近窗口内各阶段耗时的分位数（毫秒），无样本的阶段不返回。
+        """
+        return {
+            stage: [round(float(v), 1) for v in np.percentile(recent, q)]
+            for stage, recent in self.__recent.items() if recent
+        }
+
+    def panel(self, top: int = 3) -> str:
+        """
+        实时面板文本：整轮与 p95 最高的 `top` 个阶段的 p50/p95（毫秒）。
+        """
+        if not (quantiles := self.percentiles()):
+            return "*"
+        ranked = sorted(
+            ((k, v) for k, v in quantiles.items() if k != "total"), key=lambda kv: kv[1][-1], reverse=True
+        )[:top]
+        return " · ".join(
+            f"{stage} {p50:g}/{p95:g}" for stage, (p50, p95) in [("total", quantiles.get("total", [0, 0])), *ranked]
+        ) + " ms p50/p95"
+
+
+if __name__ == '__main__':
+    pass
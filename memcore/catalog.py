@@ -0,0 +1,262 @@
+#   ____      _        _
+#  / ___|__ _| |_ __ _| | ___   __ _
+# | |   / _` | __/ _` | |/ _ \ / _` |
+# | |__| (_| | || (_| | | (_) | (_| |
+#  \____\__,_|\__\__,_|_|\___/ \__, |
+#                              |___/
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import json
+import typing
+import aiosqlite
+from memnova import const
+
+
+class Catalog(object):
+    """
+    跨会话全局目录，位于 `Memrix_Library` 根部，按 data_dir 记录每次采样的归属分组、应用、设备、
+    起止时间、样本数量与评分摘要，用于快速检索历史任务并为 `--forge` 解析目标目录。
+    """
+
+    @staticmethod
+    async def catalog_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建目录表，若不存在则新建。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.CATALOG_TABLE} (
+            data_dir TEXT PRIMARY KEY,
+            group_dir TEXT,
+            kind TEXT,
+            scene TEXT,
+            package TEXT,
+            label TEXT,
+            title TEXT,
+            brand TEXT,
+            model TEXT,
+            release TEXT,
+            serialno TEXT,
+            started INTEGER,
+            stopped INTEGER,
+            samples INTEGER DEFAULT 0,
+            scores TEXT)''')
+        await db.execute(
+            f"CREATE INDEX IF NOT EXISTS {const.CATALOG_TABLE}_started ON {const.CATALOG_TABLE} (started)"
+        )
+        return await db.commit()
+
+    @staticmethod
+    async def register(catalog_file: str, data_dir: str, payload: dict) -> typing.Any:
+        """
+        会话开始时登记任务，同名 data_dir 重复登记时覆盖元信息。
+
+        Parameters
+        ----------
+        catalog_file : str
+            目录数据库路径。
+
+        data_dir : str
+            任务数据目录名。
+
+        payload : dict
+            任务元信息：group_dir、kind、scene、package、label、title、started（Unix 毫秒）
+            以及设备信息 brand、model、release、serialno。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        async with aiosqlite.connect(catalog_file, timeout=10) as db:
+            await Catalog.catalog_table(db)
+            await db.execute(f'''INSERT INTO {const.CATALOG_TABLE} (
+                data_dir,
+                group_dir,
+                kind,
+                scene,
+                package,
+                label,
+                title,
+                brand,
+                model,
+                release,
+                serialno,
+                started) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (data_dir) DO UPDATE SET
+                group_dir = excluded.group_dir,
+                kind = excluded.kind,
+                scene = excluded.scene,
+                package = excluded.package,
+                label = excluded.label,
+                title = excluded.title,
+                brand = excluded.brand,
+                model = excluded.model,
+                release = excluded.release,
+                serialno = excluded.serialno,
+                started = excluded.started''', (
+                    data_dir,
+                    payload.get("group_dir"),
+                    payload.get("kind"),
+                    payload.get("scene"),
+                    payload.get("package"),
+                    payload.get("label"),
+                    payload.get("title"),
+                    payload.get("brand"),
+                    payload.get("model"),
+                    payload.get("release"),
+                    payload.get("serialno"),
+                    payload.get("started")
+                )
+            )
+            return await db.commit()
+
+    @staticmethod
+    async def conclude(catalog_file: str, data_dir: str, stopped: int, samples: int) -> typing.Any:
+        """
+        会话结束时写入结束时间（Unix 毫秒）与样本数量。
+        """
+        async with aiosqlite.connect(catalog_file, timeout=10) as db:
+            await Catalog.catalog_table(db)
+            await db.execute(
+                f"UPDATE {const.CATALOG_TABLE} SET stopped = ?, samples = ? WHERE data_dir = ?",
+                (stopped, samples, data_dir)
+            )
+            return await db.commit()
+
+    @staticmethod
+    async def score(catalog_file: str, data_dir: str, scores: dict) -> typing.Any:
+        """
+        报告生成后回写评分摘要（JSON），与已有摘要按键合并。
+
+        合并由单条 UPDATE 内的 `json_patch` 完成，并发回写不会互相覆盖对方的键；值为 None 的键会从摘要中移除。
+        """
+        async with aiosqlite.connect(catalog_file, timeout=10) as db:
+            await Catalog.catalog_table(db)
+            await db.execute(
+                f"""UPDATE {const.CATALOG_TABLE}
+                SET scores = json_patch(COALESCE(scores, '{{}}'), ?) WHERE data_dir = ?""",
+                (json.dumps(scores, ensure_ascii=False), data_dir)
+            )
+            return await db.commit()
+
+    @staticmethod
+    async def search(
+        catalog_file: str,
+        keyword: typing.Optional[str] = None,
+        package: typing.Optional[str] = None,
+        serial: typing.Optional[str] = None,
+        scene: typing.Optional[str] = None,
+        limit: int = 50
+    ) -> list[dict]:
+        """
+        按条件检索任务，按开始时间倒序返回。
+
+        Parameters
+        ----------
+        catalog_file : str
+            目录数据库路径。
+
+        keyword : str, optional
+            模糊匹配 data_dir、分组、应用、标签、标题、机型与序列号。
+
+        package : str, optional
+            精确匹配应用包名。
+
+        serial : str, optional
+            精确匹配设备序列号。
+
+        scene : str, optional
+            精确匹配场景（分组名前缀）。
+
+        limit : int, optional
+            返回条数上限，默认 50。
+
+        Returns
+        -------
+        list of dict
+            每条记录包含目录表全部字段，scores 已解析为 dict。
+        """
+        clauses, params = [], []
+        if keyword:
+            columns = ("data_dir", "group_dir", "package", "label", "title", "model", "serialno")
+            clauses.append("(" + " OR ".join(f"{c} LIKE ?" for c in columns) + ")")
+            params += [f"%{keyword}%"] * len(columns)
+        for column, value in (("package", package), ("serialno", serial), ("scene", scene)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        sql = f"""
+            SELECT * FROM {const.CATALOG_TABLE}
+            {"WHERE " + " AND ".join(clauses) if clauses else ""}
+            ORDER BY started DESC
+            LIMIT ?
+        """
+        async with aiosqlite.connect(catalog_file, timeout=10) as db:
+            await Catalog.catalog_table(db)
+            async with db.execute(sql, (*params, limit)) as cursor:
+                names = [d[0] for d in cursor.description]
+                rows = [dict(zip(names, row)) for row in await cursor.fetchall()]
+
+        for row in rows:
+            row["scores"] = json.loads(row["scores"]) if row["scores"] else {}
+        return rows
+
+    @staticmethod
+    async def entries(catalog_file: str, data_dirs: list[str]) -> list[dict]:
+        """
+        按 data_dir 精确取回任务记录，按开始时间排序，scores 已解析为 dict。
+        """
+        if not data_dirs:
+            return []
+
+        async with aiosqlite.connect(catalog_file, timeout=10) as db:
+            await Catalog.catalog_table(db)
+            async with db.execute(
+                f"""SELECT * FROM {const.CATALOG_TABLE}
+                WHERE data_dir IN ({", ".join("?" * len(data_dirs))})
+                ORDER BY started""", tuple(data_dirs)
+            ) as cursor:
+                names = [d[0] for d in cursor.description]
+                rows = [dict(zip(names, row)) for row in await cursor.fetchall()]
+
+        for row in rows:
+            row["scores"] = json.loads(row["scores"]) if row["scores"] else {}
+        return rows
+
+    @staticmethod
+    async def resolve(catalog_file: str, target: str) -> typing.Optional[dict]:
+        """
+        将 `--forge` 目标解析为分组信息，目标可以是分组目录名或任一 data_dir。
+
+        Returns
+        -------
+        Optional[dict]
+            包含 group_dir、kind、scene 的字典；目录中无记录时返回 None。
+        """
+        async with aiosqlite.connect(catalog_file, timeout=10) as db:
+            await Catalog.catalog_table(db)
+            async with db.execute(
+                f"""SELECT group_dir, kind, scene FROM {const.CATALOG_TABLE}
+                WHERE group_dir = ? OR data_dir = ?
+                ORDER BY started DESC LIMIT 1""", (target, target)
+            ) as cursor:
+                if not (row := await cursor.fetchone()):
+                    return None
+        return dict(zip(("group_dir", "kind", "scene"), row))
+
+
+if __name__ == '__main__':
+    pass
@@ -10,14 +10,135 @@
 
 import json
 import typing
+import weakref
 import asyncio
 import aiosqlite
+import numpy as np
+from memcore.cadence import Latency
+from memcore.packer import Packer
+from memnova.dissect import Dissect
 from memnova import const
 
 
 class Cubicle(object):
     """Cubicle"""
 
+    # 聚合表统计字段，每个字段维护 min / max / sum 三列，均值由 sum / samples 得出
+    mem_rollup_fields: tuple = (
+        "pss", "rss", "uss", "swap", "summary_java_heap", "summary_native_heap", "summary_graphics"
+    )
+    io_rollup_fields: tuple = (
+        "swap", "rchar", "wchar", "syscr", "syscw", "read_bytes", "write_bytes"
+    )
+
+    # 进程明细字段（MB），按进程拆分的内存通道样本
+    proc_fields: tuple = (
+        "pss", "rss", "uss", "swap", "java_heap", "native_heap", "graphics"
+    )
+
+    # 堆快照触发记录字段，与采集端写入日志的负载一致
+    heap_fields: tuple = (
+        "timestamp", "pid", "process", "slope", "r2", "span", "pss", "remote", "local", "size", "status"
+    )
+
+    # 堆快照解析汇总字段，与 `Hprof.parse` 的 summary 键一致（heaps 以 JSON 存储）
+    hprof_fields: tuple = (
+        "objects", "shallow", "classes", "roots", "refs", "strings", "string_shallow", "string_chars",
+        "bitmaps", "bitmap_shallow", "bitmap_bytes", "elapsed"
+    )
+
+    # 观测开销汇总字段，与 `Overhead.summary` 的键一致
+    overhead_fields: tuple = (
+        "probes", "cpu_ms", "per_probe", "shell_ms", "system_server_ms", "adbd_ms", "target_ms", "overhead", "throttled"
+    )
+
+    # 字典编码的字符串字段：物理表存储 `<字段>_id`，同名视图还原原始列
+    mem_keys: tuple = ("data_dir", "label", "pid", "activity", "mode")
+    io_keys: tuple = ("data_dir", "label")
+    gfx_keys: tuple = ("data_dir", "label")
+
+    # 每个连接的字符串 -> id 缓存与写入目标表
+    __strings: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    __sinks: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    # 统一的毫秒时间戳表达式，兼容旧版库中以 TEXT（YYYY-MM-DD HH:MM:SS）存储的时间戳
+    epoch_ms: str = (
+        "CASE WHEN typeof(timestamp) = 'text' AND timestamp GLOB '*-*' "
+        "THEN CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000 "
+        "ELSE CAST(timestamp AS INTEGER) END"
+    )
+
+    @staticmethod
+    async def readable_view(db: "aiosqlite.Connection", table: str) -> typing.Any:
+        """
+        为采样表创建可读视图 `<table>_view`，附加本地时间列 moment（YYYY-MM-DD HH:MM:SS.SSS）。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        table : str
+            采样表名称。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE VIEW IF NOT EXISTS {table}_view AS
+            SELECT
+                strftime('%Y-%m-%d %H:%M:%f', ({Cubicle.epoch_ms}) / 1000.0, 'unixepoch', 'localtime') AS moment,
+                *
+            FROM {table}''')
+        return await db.commit()
+
+    @staticmethod
+    def columnize(names: list[str], rows: list[tuple]) -> dict[str, "np.ndarray"]:
+        """
+        将一批查询结果转换为列字典；数值列转为浮点/整数数组（NULL 记为 NaN），其余保留为 object 数组。
+        """
+        columns = {}
+        for name, values in zip(names, zip(*rows)):
+            if (column := np.array(values)).dtype.kind == "O":
+                try:
+                    column = np.array(values, dtype=np.float64)
+                except (TypeError, ValueError):
+                    column = np.array(values, dtype=object)
+            columns[name] = column
+        return columns
+
+    @staticmethod
+    async def stream(
+        db: "aiosqlite.Connection", sql: str, params: tuple, chunk: int = 4096
+    ) -> typing.AsyncIterator[dict[str, "np.ndarray"]]:
+        """
+        逐批读取查询结果并以列字典形式产出，单批最多 chunk 行，内存占用与结果集大小无关。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        sql : str
+            查询语句。
+
+        params : tuple
+            查询参数。
+
+        chunk : int, optional
+            单批行数，默认 4096。
+
+        Yields
+        ------
+        dict of str to np.ndarray
+            列名到 numpy 数组的字典。
+        """
+        async with db.execute(sql, params) as cursor:
+            names = [d[0] for d in cursor.description]
+            while rows := await cursor.fetchmany(chunk):
+                yield Cubicle.columnize(names, rows)
+
     @staticmethod
     async def initialize_tables(
         db: "aiosqlite.Connection",
@@ -27,7 +148,7 @@ class Cubicle(object):
         payload: dict
     ) -> typing.Any:
         """
-        初始化四类数据表并写入联合元信息的首条记录。
+        初始化四类数据表及聚合表，并写入联合元信息的首条记录。
 
         Parameters
         ----------
@@ -51,8 +172,14 @@ class Cubicle(object):
         Any
             插入联合表后的执行结果（通常为 None，取决于执行器行为）。
         """
+        # 新库启用增量回收，压缩历史任务后可按页释放空间（已有表的旧库不受影响）
+        await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
         await asyncio.gather(
-            Cubicle.joint_table(db), Cubicle.mem_table(db), Cubicle.gfx_table(db), Cubicle.io_table(db)
+            Cubicle.joint_table(db), Cubicle.mem_table(db), Cubicle.gfx_table(db), Cubicle.io_table(db),
+            Cubicle.mem_rollup_table(db), Cubicle.io_rollup_table(db), Cubicle.cadence_table(db),
+            Cubicle.smaps_table(db), Cubicle.host_table(db), Cubicle.tick_table(db), Cubicle.overhead_table(db),
+            Cubicle.proc_table(db), Cubicle.heap_table(db), Cubicle.hprof_table(db), Cubicle.maps_table(db),
+            Cubicle.events_table(db)
         )
         return await Cubicle.insert_joint(db, data_dir, title, timestamp, payload)
 
@@ -166,6 +293,168 @@ class Cubicle(object):
         async with db.execute(sql, (data_dir,)) as cursor:
             return await cursor.fetchall()
 
+    # Notes: ======================== STRINGS ========================
+
+    @staticmethod
+    async def string_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建字符串字典表，重复出现的字符串（任务目录、标签、Activity、前后台、进程映射）只存一份。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.STRING_TABLE} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            value TEXT UNIQUE)''')
+        return await db.commit()
+
+    @staticmethod
+    async def legacy(db: "aiosqlite.Connection", table: str) -> bool:
+        """
+        判断是否为旧版库：同名物理表已存在时沿用原表结构，不做字典编码。
+        """
+        async with db.execute(
+            "SELECT type FROM sqlite_master WHERE name = ?", (table,)
+        ) as cursor:
+            return (row := await cursor.fetchone()) is not None and row[0] == "table"
+
+    @staticmethod
+    async def encoded_view(db: "aiosqlite.Connection", table: str, keys: tuple) -> typing.Any:
+        """
+        为字典编码的物理表 `<table>_store` 创建同名兼容视图，列名与列顺序与旧版物理表一致。
+
+        视图附带 INSTEAD OF 触发器，按旧表结构执行的 INSERT / UPDATE / DELETE 会自动转换为编码写入，
+        查询、导出、压缩等既有语句无需改动；采样热路径则通过 `sink` 直接写入物理表。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        table : str
+            视图名称（即旧版物理表名）。
+
+        keys : tuple of str
+            字典编码的字段名，物理表中对应列为 `<字段>_id`。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        store, pool = f"{table}_store", const.STRING_TABLE
+
+        async with db.execute(f"PRAGMA table_info({store})") as cursor:
+            names = [
+                name[:-3] if name.endswith("_id") and name[:-3] in keys else name
+                for _, name, *_ in await cursor.fetchall() if name != "id"
+            ]
+
+        joins = " ".join(
+            f"{'JOIN' if k == 'data_dir' else 'LEFT JOIN'} {pool} AS k_{k} ON k_{k}.id = s.{k}_id" for k in keys
+        )
+        await db.execute(f'''CREATE VIEW IF NOT EXISTS {table} AS
+            SELECT s.id, {", ".join(f"k_{n}.value AS {n}" if n in keys else f"s.{n}" for n in names)}
+            FROM {store} AS s {joins}''')
+
+        columns = ", ".join(f"{n}_id" if n in keys else n for n in names)
+        values = ", ".join(f"(SELECT id FROM {pool} WHERE value = NEW.{n})" if n in keys else f"NEW.{n}" for n in names)
+        intern = " UNION ALL ".join(f"SELECT NEW.{k} AS value" for k in keys)
+
+        await db.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_insert INSTEAD OF INSERT ON {table}
+            BEGIN
+                INSERT OR IGNORE INTO {pool} (value)
+                    SELECT value FROM ({intern}) WHERE value IS NOT NULL;
+                INSERT INTO {store} (id, {columns}) VALUES (NEW.id, {values});
+            END''')
+        await db.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_update INSTEAD OF UPDATE ON {table}
+            BEGIN
+                INSERT OR IGNORE INTO {pool} (value)
+                    SELECT value FROM ({intern}) WHERE value IS NOT NULL;
+                UPDATE {store} SET ({columns}) = ({values}) WHERE id = OLD.id;
+            END''')
+        await db.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_delete INSTEAD OF DELETE ON {table}
+            BEGIN
+                DELETE FROM {store} WHERE id = OLD.id;
+            END''')
+        await db.execute(f"CREATE INDEX IF NOT EXISTS {store}_data_dir ON {store} (data_dir_id)")
+        return await db.commit()
+
+    @staticmethod
+    async def intern(db: "aiosqlite.Connection", *values: typing.Any) -> list[typing.Optional[int]]:
+        """
+        将字符串转换为字典 id（不存在时写入），None 保持为 None；结果按连接缓存。
+        """
+        cache = Cubicle.__strings.setdefault(db, {})
+        for value in dict.fromkeys(v for v in values if v is not None and v not in cache):
+            await db.execute(
+                f"INSERT OR IGNORE INTO {const.STRING_TABLE} (value) VALUES (?)", (value,)
+            )
+            async with db.execute(
+                f"SELECT id FROM {const.STRING_TABLE} WHERE value = ?", (value,)
+            ) as cursor:
+                cache[value], *_ = await cursor.fetchone()
+        return [None if v is None else cache[v] for v in values]
+
+    @staticmethod
+    def forget(db: "aiosqlite.Connection") -> None:
+        """
+        丢弃连接的字符串字典缓存，事务回滚后缓存中的 id 可能已不存在，之后按需重新查询。
+        """
+        Cubicle.__strings.pop(db, None)
+
+    @staticmethod
+    async def sink(db: "aiosqlite.Connection", table: str) -> tuple[str, bool]:
+        """
+        返回采样写入的目标表与是否字典编码：新版库写入 `<table>_store`，旧版库写入原表。
+        """
+        sinks = Cubicle.__sinks.setdefault(db, {})
+        if table not in sinks:
+            sinks[table] = (table, False) if await Cubicle.legacy(db, table) else (f"{table}_store", True)
+        return sinks[table]
+
+    # Notes: ======================== SHARDS ========================
+
+    @staticmethod
+    async def federate(db: "aiosqlite.Connection", schemas: list[str]) -> typing.Any:
+        """
+        为已 ATTACH 的分片建立同名临时联合视图（UNION ALL），报告阶段的查询语句无需改动。
+
+        列以首个包含该表的分片为准，其余分片缺失的列补 NULL，以兼容不同版本的分片库。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            已 ATTACH 全部分片的连接。
+
+        schemas : list of str
+            分片的 schema 名称。
+
+        Returns
+        -------
+        Any
+            执行结果。
+        """
+        tables = (
+            const.JOINT_DATA_TABLE, const.MEM_DATA_TABLE, const.IO_DATA_TABLE, const.GFX_DATA_TABLE,
+            const.MEM_ROLLUP_TABLE, const.IO_ROLLUP_TABLE, const.CADENCE_TABLE, const.SMAPS_TABLE, const.HOST_TABLE,
+            const.TICK_TABLE, const.OVERHEAD_TABLE, const.PROC_TABLE, const.HEAP_TABLE,
+            const.HPROF_TABLE, const.HPROF_CLASSES, const.HPROF_DOMINATORS, const.MAPS_TABLE,
+            const.EVENTS_TABLE
+        )
+        for table in tables:
+            layouts = []
+            for schema in schemas:
+                async with db.execute(f"PRAGMA {schema}.table_info({table})") as cursor:
+                    if names := [row[1] for row in await cursor.fetchall()]:
+                        layouts.append((schema, names))
+            if not layouts:
+                continue
+
+            _, columns = layouts[0]
+            selects = " UNION ALL ".join(
+                f"SELECT {', '.join(c if c in names else f'NULL AS {c}' for c in columns)} FROM {schema}.{table}"
+                for schema, names in layouts
+            )
+            await db.execute(f"CREATE TEMP VIEW IF NOT EXISTS {table} AS {selects}")
+
     # Notes: ======================== MEM ========================
 
     @staticmethod
@@ -183,15 +472,19 @@ class Cubicle(object):
         Any
             执行结果（提交成功后通常为 None）。
         """
-        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.MEM_DATA_TABLE} (
+        if await Cubicle.legacy(db, const.MEM_DATA_TABLE):
+            return await Cubicle.readable_view(db, const.MEM_DATA_TABLE)
+
+        await Cubicle.string_table(db)
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.MEM_DATA_TABLE}_store (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            data_dir TEXT,
-            label TEXT,
-            timestamp TEXT,
-            pid INTEGER,
+            data_dir_id INTEGER,
+            label_id INTEGER,
+            timestamp INTEGER,
+            pid_id INTEGER,
             adj INTEGER,
-            activity TEXT,
-            mode TEXT,
+            activity_id INTEGER,
+            mode_id INTEGER,
             summary_java_heap REAL,
             summary_native_heap REAL,
             summary_graphics REAL,
@@ -217,14 +510,16 @@ class Cubicle(object):
             egl_mtrack REAL,
             gl_mtrack REAL,
             unknown REAL)''')
-        return await db.commit()
+        await Cubicle.encoded_view(db, const.MEM_DATA_TABLE, Cubicle.mem_keys)
+        return await Cubicle.readable_view(db, const.MEM_DATA_TABLE)
 
     @staticmethod
     async def insert_mem(
         db: "aiosqlite.Connection",
         data_dir: str,
         label: str,
-        payload: dict
+        payload: dict,
+        commit: bool = True
     ) -> typing.Any:
         """
         插入一条内存采样记录（包含标注与明细分区）。
@@ -243,19 +538,27 @@ class Cubicle(object):
         payload : dict
             结构化内存数据，包含 mark/summary/meminfo 子字典。
 
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
         Returns
         -------
         Any
             执行结果（提交成功后通常为 None）。
         """
-        await db.execute(f'''INSERT INTO {const.MEM_DATA_TABLE} (
-            data_dir,
-            label,
+        target, encoded = await Cubicle.sink(db, const.MEM_DATA_TABLE)
+        keys = (data_dir, label, payload["mark"]["pid"], payload["mark"]["act"], payload["mark"]["mode"])
+        data_dir_key, label_key, pid_key, act_key, mode_key = await Cubicle.intern(db, *keys) if encoded else keys
+        suffix = "_id" if encoded else ""
+
+        cursor = await db.execute(f'''INSERT INTO {target} (
+            data_dir{suffix},
+            label{suffix},
             timestamp,
-            pid,
+            pid{suffix},
             adj,
-            activity,
-            mode,
+            activity{suffix},
+            mode{suffix},
             summary_java_heap,
             summary_native_heap,
             summary_graphics,
@@ -279,14 +582,14 @@ class Cubicle(object):
             other_mmap,
             gl_mtrack,
             unknown) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', (
-                data_dir,
-                label,
+                data_dir_key,
+                label_key,
 
                 payload["mark"]["tms"],
-                payload["mark"]["pid"],
+                pid_key,
                 payload["mark"]["adj"],
-                payload["mark"]["act"],
-                payload["mark"]["mode"],
+                act_key,
+                mode_key,
 
                 payload["summary"]["Java Heap"],
                 payload["summary"]["Native Heap"],
@@ -314,7 +617,8 @@ class Cubicle(object):
                 payload["meminfo"]["Unknown"]
             )
         )
-        return await db.commit()
+        await Cubicle.insert_mem_rollup(db, cursor.lastrowid)
+        return await db.commit() if commit else None
 
     @staticmethod
     async def query_mem(db: "aiosqlite.Connection", data_dir: str) -> list[dict]:
@@ -332,11 +636,11 @@ class Cubicle(object):
         Returns
         -------
         list of dict
-            每条记录包含 timestamp、adj、activity、mode、summary_*、pss/rss/uss/swap 等。
+            每条记录包含 timestamp（Unix 毫秒）、adj、activity、mode、summary_*、pss/rss/uss/swap 等。
         """
         sql = f"""
             SELECT
-                timestamp,
+                {Cubicle.epoch_ms} AS timestamp,
                 adj,
                 activity,
                 mode,
@@ -351,10 +655,53 @@ class Cubicle(object):
             WHERE data_dir = ? AND pss != ''
             ORDER BY timestamp ASC
         """
-        db.row_factory = aiosqlite.Row
         async with db.execute(sql, (data_dir,)) as cursor:
+            names = [d[0] for d in cursor.description]
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+            return [dict(zip(names, row)) for row in rows]
+
+    @staticmethod
+    async def stream_mem(
+        db: "aiosqlite.Connection", data_dir: str, chunk: int = 4096
+    ) -> typing.AsyncIterator[dict[str, "np.ndarray"]]:
+        """
+        按 data_dir 流式查询内存采样核心字段，按时间升序逐批产出列字典。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        chunk : int, optional
+            单批行数，默认 4096。
+
+        Yields
+        ------
+        dict of str to np.ndarray
+            字段与 `query_mem` 一致，每列为 numpy 数组。
+        """
+        sql = f"""
+            SELECT
+                {Cubicle.epoch_ms} AS timestamp,
+                adj,
+                activity,
+                mode,
+                summary_java_heap,
+                summary_native_heap,
+                summary_graphics,
+                pss,
+                rss,
+                uss,
+                swap
+            FROM {const.MEM_DATA_TABLE}
+            WHERE data_dir = ? AND pss != ''
+            ORDER BY timestamp ASC
+        """
+        async for batch in Cubicle.stream(db, sql, (data_dir,), chunk):
+            yield batch
 
     # Notes: ======================== GFX ========================
 
@@ -373,26 +720,30 @@ class Cubicle(object):
         Any
             执行结果（提交成功后通常为 None）。
         """
-        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.GFX_DATA_TABLE} (
+        if await Cubicle.legacy(db, const.GFX_DATA_TABLE):
+            return None
+
+        await Cubicle.string_table(db)
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.GFX_DATA_TABLE}_store (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            data_dir TEXT,
-            label TEXT,
-            timestamp TEXT,
+            data_dir_id INTEGER,
+            label_id INTEGER,
+            timestamp INTEGER,
             metadata TEXT,
-            raw_frames TEXT,
-            vsync_sys TEXT,
-            vsync_app TEXT,
-            roll_ranges TEXT,
-            drag_ranges TEXT,
-            jank_ranges TEXT)''')
-        return await db.commit()
+            raw_frames BLOB,
+            vsync_sys BLOB,
+            vsync_app BLOB,
+            roll_ranges BLOB,
+            drag_ranges BLOB,
+            jank_ranges BLOB)''')
+        return await Cubicle.encoded_view(db, const.GFX_DATA_TABLE, Cubicle.gfx_keys)
 
     @staticmethod
     async def insert_gfx(
         db: "aiosqlite.Connection",
         data_dir: str,
         label: str,
-        timestamp: str,
+        timestamp: int,
         payload: dict
     ) -> typing.Any:
         """
@@ -409,20 +760,24 @@ class Cubicle(object):
         label : str
             任务或应用标签。
 
-        timestamp : str
-            采样时间（YYYY-MM-DD HH:MM:SS）。
+        timestamp : int
+            采样时间（Unix 毫秒时间戳）。
 
         payload : dict
-            已序列化为 JSON 的字段：metadata/raw_frames/vsync_sys/vsync_app/roll/drag/jank。
+            metadata 为 JSON 文本；raw_frames/vsync_sys/vsync_app/roll/drag/jank 为 `Packer` 列式数据块。
 
         Returns
         -------
         Any
             执行结果（提交成功后通常为 None）。
         """
-        await db.execute(f'''INSERT INTO {const.GFX_DATA_TABLE} (
-            data_dir,
-            label,
+        target, encoded = await Cubicle.sink(db, const.GFX_DATA_TABLE)
+        data_dir_key, label_key = await Cubicle.intern(db, data_dir, label) if encoded else (data_dir, label)
+        suffix = "_id" if encoded else ""
+
+        await db.execute(f'''INSERT INTO {target} (
+            data_dir{suffix},
+            label{suffix},
             timestamp,
             metadata,
             raw_frames,
@@ -431,8 +786,8 @@ class Cubicle(object):
             roll_ranges,
             drag_ranges,
             jank_ranges) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', (
-                data_dir,
-                label,
+                data_dir_key,
+                label_key,
                 timestamp,
                 payload["metadata"],
                 payload["raw_frames"],
@@ -445,10 +800,19 @@ class Cubicle(object):
         )
         return await db.commit()
 
+    @staticmethod
+    def decode_columns(value: typing.Any) -> dict:
+        """
+        将图形字段解码为列字典，兼容列式数据块与旧版 JSON 文本。
+        """
+        if Packer.is_packed(value):
+            return Packer.unpack(value)
+        return Packer.from_records(json.loads(value)) if value else {}
+
     @staticmethod
     async def query_gfx(db: "aiosqlite.Connection", data_dir: str) -> list[dict]:
         """
-        按 data_dir 查询图形时序数据，并将 JSON 字段反序列化为 Python 对象。
+        按 data_dir 查询图形时序数据，并将帧数据字段解码为列字典。
 
         Parameters
         ----------
@@ -461,7 +825,8 @@ class Cubicle(object):
         Returns
         -------
         list of dict
-            每条包含 metadata、raw_frames、vsync_sys、vsync_app、roll_ranges、drag_ranges、jank_ranges。
+            每条包含 metadata（dict）以及 raw_frames、vsync_sys、vsync_app、roll_ranges、drag_ranges、
+            jank_ranges（列名到 numpy 数组的字典）。
         """
         sql = f"""
             SELECT
@@ -474,22 +839,65 @@ class Cubicle(object):
                 jank_ranges
             FROM {const.GFX_DATA_TABLE}
             WHERE data_dir = ?
+            ORDER BY id
         """
         async with db.execute(sql, (data_dir,)) as cursor:
             rows = await cursor.fetchall()
             return [
                 {
                     "metadata": json.loads(md),
-                    "raw_frames": json.loads(rf),
-                    "vsync_sys": json.loads(vs),
-                    "vsync_app": json.loads(va),
-                    "roll_ranges": json.loads(rr),
-                    "drag_ranges": json.loads(dr),
-                    "jank_ranges": json.loads(jr),
+                    "raw_frames": Cubicle.decode_columns(rf),
+                    "vsync_sys": Cubicle.decode_columns(vs),
+                    "vsync_app": Cubicle.decode_columns(va),
+                    "roll_ranges": Cubicle.decode_columns(rr),
+                    "drag_ranges": Cubicle.decode_columns(dr),
+                    "jank_ranges": Cubicle.decode_columns(jr),
                 }
                 for md, rf, vs, va, rr, dr, jr in rows
             ]
 
+    @staticmethod
+    async def stream_gfx(db: "aiosqlite.Connection", data_dir: str) -> typing.AsyncIterator[dict]:
+        """
+        按 data_dir 流式查询图形时序数据，每次仅解码并产出一个片段。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Yields
+        ------
+        dict
+            结构与 `query_gfx` 的单个元素一致。
+        """
+        sql = f"""
+            SELECT
+                metadata,
+                raw_frames,
+                vsync_sys,
+                vsync_app,
+                roll_ranges,
+                drag_ranges,
+                jank_ranges
+            FROM {const.GFX_DATA_TABLE}
+            WHERE data_dir = ?
+        """
+        async with db.execute(sql, (data_dir,)) as cursor:
+            async for md, rf, vs, va, rr, dr, jr in cursor:
+                yield {
+                    "metadata": json.loads(md),
+                    "raw_frames": Cubicle.decode_columns(rf),
+                    "vsync_sys": Cubicle.decode_columns(vs),
+                    "vsync_app": Cubicle.decode_columns(va),
+                    "roll_ranges": Cubicle.decode_columns(rr),
+                    "drag_ranges": Cubicle.decode_columns(dr),
+                    "jank_ranges": Cubicle.decode_columns(jr),
+                }
+
     # Notes: ======================== I/O ========================
 
     @staticmethod
@@ -507,11 +915,15 @@ class Cubicle(object):
         Any
             执行结果（提交成功后通常为 None）。
         """
-        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.IO_DATA_TABLE} (
+        if await Cubicle.legacy(db, const.IO_DATA_TABLE):
+            return await Cubicle.readable_view(db, const.IO_DATA_TABLE)
+
+        await Cubicle.string_table(db)
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.IO_DATA_TABLE}_store (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            data_dir TEXT,
-            label TEXT,
-            timestamp TEXT,
+            data_dir_id INTEGER,
+            label_id INTEGER,
+            timestamp INTEGER,
             swap REAL,
             rchar INTEGER,
             wchar INTEGER,
@@ -520,15 +932,17 @@ class Cubicle(object):
             read_bytes INTEGER,
             write_bytes INTEGER,
             cancelled_write_bytes INTEGER)''')
-        return await db.commit()
+        await Cubicle.encoded_view(db, const.IO_DATA_TABLE, Cubicle.io_keys)
+        return await Cubicle.readable_view(db, const.IO_DATA_TABLE)
 
     @staticmethod
     async def insert_io(
         db: "aiosqlite.Connection",
         data_dir: str,
         label: str,
-        timestamp: str,
-        payload: dict
+        timestamp: int,
+        payload: dict,
+        commit: bool = True
     ) -> typing.Any:
         """
         插入一条 I/O 采样记录。
@@ -544,20 +958,27 @@ class Cubicle(object):
         label : str
             任务或应用标签。
 
-        timestamp : str
-            采样时间（YYYY-MM-DD HH:MM:SS）。
+        timestamp : int
+            采样时间（Unix 毫秒时间戳）。
 
         payload : dict
             I/O 指标字典：swap、rchar、wchar、syscr、syscw、read_bytes、write_bytes、cancelled_write_bytes。
 
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
         Returns
         -------
         Any
             执行结果（提交成功后通常为 None）。
         """
-        await db.execute(f'''INSERT INTO {const.IO_DATA_TABLE} (
-            data_dir,
-            label,
+        target, encoded = await Cubicle.sink(db, const.IO_DATA_TABLE)
+        data_dir_key, label_key = await Cubicle.intern(db, data_dir, label) if encoded else (data_dir, label)
+        suffix = "_id" if encoded else ""
+
+        cursor = await db.execute(f'''INSERT INTO {target} (
+            data_dir{suffix},
+            label{suffix},
             timestamp,
             swap,
             rchar,
@@ -567,8 +988,8 @@ class Cubicle(object):
             read_bytes,
             write_bytes,
             cancelled_write_bytes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', (
-                data_dir,
-                label,
+                data_dir_key,
+                label_key,
                 timestamp,
                 payload["swap"],
                 payload["rchar"],
@@ -580,7 +1001,8 @@ class Cubicle(object):
                 payload["cancelled_write_bytes"]
             )
         )
-        return await db.commit()
+        await Cubicle.insert_io_rollup(db, cursor.lastrowid)
+        return await db.commit() if commit else None
 
     @staticmethod
     async def query_io(db: "aiosqlite.Connection", data_dir: str) -> list[dict]:
@@ -598,11 +1020,11 @@ class Cubicle(object):
         Returns
         -------
         list of dict
-            每条记录包含 timestamp、swap、rchar、wchar、syscr、syscw、read_bytes、write_bytes。
+            每条记录包含 timestamp（Unix 毫秒）、swap、rchar、wchar、syscr、syscw、read_bytes、write_bytes。
         """
         sql = f"""
             SELECT
-                timestamp,
+                {Cubicle.epoch_ms} AS timestamp,
                 swap,
                 rchar,
                 wchar,
@@ -614,10 +1036,1611 @@ class Cubicle(object):
             WHERE data_dir = ?
             ORDER BY timestamp ASC
         """
-        db.row_factory = aiosqlite.Row
         async with db.execute(sql, (data_dir,)) as cursor:
+            names = [d[0] for d in cursor.description]
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+            return [dict(zip(names, row)) for row in rows]
+
+    @staticmethod
+    async def stream_io(
+        db: "aiosqlite.Connection", data_dir: str, chunk: int = 4096
+    ) -> typing.AsyncIterator[dict[str, "np.ndarray"]]:
+        """
+        按 data_dir 流式查询 I/O 序列数据，按时间升序逐批产出列字典。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        chunk : int, optional
+            单批行数，默认 4096。
+
+        Yields
+        ------
+        dict of str to np.ndarray
+            字段与 `query_io` 一致，每列为 numpy 数组。
+        """
+        sql = f"""
+            SELECT
+                {Cubicle.epoch_ms} AS timestamp,
+                swap,
+                rchar,
+                wchar,
+                syscr,
+                syscw,
+                read_bytes,
+                write_bytes
+            FROM {const.IO_DATA_TABLE}
+            WHERE data_dir = ?
+            ORDER BY timestamp ASC
+        """
+        async for batch in Cubicle.stream(db, sql, (data_dir,), chunk):
+            yield batch
+
+    # Notes: ======================== CADENCE ========================
+
+    @staticmethod
+    async def cadence_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建采样节奏表，每个样本一行，记录轮次编号、计划时间与实际时间（Unix 毫秒）以及该样本选用的采样周期（毫秒）。
+
+        轮次编号即调度截止时间序号，编号空缺对应被跳过的截止时间；固定速率时采样周期恒定，
+        自适应模式下为估计器在该样本之后选用的周期，即该样本代表的时长，评分时作为权重。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.CADENCE_TABLE} (
+            data_dir TEXT,
+            tick INTEGER,
+            scheduled INTEGER,
+            timestamp INTEGER,
+            interval INTEGER,
+            PRIMARY KEY (data_dir, tick))''')
+
+        # 早期节奏表没有采样周期列
+        async with db.execute(f"PRAGMA table_info({const.CADENCE_TABLE})") as cursor:
+            if "interval" not in [row[1] for row in await cursor.fetchall()]:
+                await db.execute(f"ALTER TABLE {const.CADENCE_TABLE} ADD COLUMN interval INTEGER")
+        return await db.commit()
+
+    @staticmethod
+    async def insert_cadence(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        tick: int,
+        scheduled: int,
+        timestamp: int,
+        interval: typing.Optional[int] = None,
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        插入一个样本的计划时间与实际时间，重放时同一轮次覆盖写入。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        tick : int
+            轮次编号。
+
+        scheduled : int
+            计划时间（Unix 毫秒时间戳）。
+
+        timestamp : int
+            实际采样时间（Unix 毫秒时间戳），与同一样本的内存、I/O 记录一致。
+
+        interval : int, optional
+            该样本选用的采样周期（毫秒）。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(
+            f'''INSERT OR REPLACE INTO {const.CADENCE_TABLE} (data_dir, tick, scheduled, timestamp, interval)
+            VALUES (?, ?, ?, ?, ?)''', (data_dir, tick, scheduled, timestamp, interval)
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_period(db: "aiosqlite.Connection", data_dir: str) -> typing.Optional[float]:
+        """
+        由节奏表推算任务的计划采样周期（毫秒），旧版库或无节奏记录时返回 None。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Returns
+        -------
+        Optional[float]
+            计划采样周期（毫秒），或 None。
+        """
+        try:
+            async with db.execute(
+                f"""SELECT (MAX(scheduled) - MIN(scheduled)) * 1.0 / NULLIF(MAX(tick) - MIN(tick), 0)
+                FROM {const.CADENCE_TABLE} WHERE data_dir = ?""", (data_dir,)
+            ) as cursor:
+                period, *_ = await cursor.fetchone()
+        except aiosqlite.OperationalError:
+            return None
+        return period or None
+
+    @staticmethod
+    async def query_intervals(db: "aiosqlite.Connection", data_dir: str) -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        读取自适应采样任务各样本的 (实际时间, 采样周期)，按时间升序；固定速率或旧版库返回两个空数组。
+
+        只保存两列整数数组，长时间任务也仅占用数 MB，评分时按时间戳二分查找为每批样本取权重。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (timestamp, interval)，单位均为毫秒。
+        """
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        try:
+            async with db.execute(
+                f"SELECT COUNT(DISTINCT interval) FROM {const.CADENCE_TABLE} WHERE data_dir = ?", (data_dir,)
+            ) as cursor:
+                variants, *_ = await cursor.fetchone()
+        except aiosqlite.OperationalError:
+            return empty
+        if variants < 2:
+            return empty
+
+        async with db.execute(
+            f"""SELECT timestamp, interval FROM {const.CADENCE_TABLE}
+            WHERE data_dir = ? AND interval IS NOT NULL ORDER BY timestamp""", (data_dir,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return tuple(np.array(column, dtype=np.int64) for column in zip(*rows)) if rows else empty
+
+    # Notes: ======================== TICK ========================
+
+    @staticmethod
+    async def tick_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建单轮耗时分解表，内存通道每个样本一行，各阶段耗时（毫秒）见 `Latency.stages`。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.TICK_TABLE} (
+            data_dir TEXT,
+            tick INTEGER,
+            timestamp INTEGER,
+            {", ".join(f"{stage} REAL" for stage in Latency.stages)},
+            PRIMARY KEY (data_dir, tick))''')
+        return await db.commit()
+
+    @staticmethod
+    async def insert_tick_stats(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        timestamp: int,
+        payload: dict,
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        插入一轮的耗时分解，重放时同一轮次覆盖写入；未经过的阶段记为 NULL。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        timestamp : int
+            样本采样时间（Unix 毫秒时间戳），与同一样本的内存记录一致。
+
+        payload : dict
+            `Latency.record` 的结果，附带 tick（轮次编号）。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(
+            f'''INSERT OR REPLACE INTO {const.TICK_TABLE} (data_dir, tick, timestamp, {", ".join(Latency.stages)})
+            VALUES ({", ".join("?" * (len(Latency.stages) + 3))})''',
+            (data_dir, payload["tick"], timestamp, *(payload.get(stage) for stage in Latency.stages))
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_tick_stats(db: "aiosqlite.Connection", data_dir: str) -> dict[str, "np.ndarray"]:
+        """
+        读取单轮耗时分解的列字典（按轮次升序），旧版库或无记录时返回空字典。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            tick、timestamp 与各阶段耗时的列字典，NULL 为 NaN。
+        """
+        names = ["tick", "timestamp", *Latency.stages]
+        try:
+            async with db.execute(
+                f"SELECT {', '.join(names)} FROM {const.TICK_TABLE} WHERE data_dir = ? ORDER BY tick", (data_dir,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        except aiosqlite.OperationalError:
+            return {}
+        return Cubicle.columnize(names, rows) if rows else {}
+
+    # Notes: ======================== PROC ========================
+
+    @staticmethod
+    async def proc_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建进程明细表，内存通道每个样本中应用的每个进程（主进程与 `package:*` 子进程）各一行，
+        与 mem_data 中的合计值同一时间戳。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.PROC_TABLE} (
+            data_dir TEXT,
+            timestamp INTEGER,
+            pid TEXT,
+            process TEXT,
+            {", ".join(f"{c} REAL" for c in Cubicle.proc_fields)})''')
+        await db.execute(
+            f"CREATE INDEX IF NOT EXISTS {const.PROC_TABLE}_data_dir ON {const.PROC_TABLE} (data_dir, timestamp)"
+        )
+        return await db.commit()
+
+    @staticmethod
+    async def insert_procs(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        timestamp: int,
+        payload: list[dict],
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        插入一个样本的各进程明细。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        timestamp : int
+            样本采样时间（Unix 毫秒时间戳），与同一样本的内存记录一致。
+
+        payload : list of dict
+            每个进程一项，包含 pid、process 与 `Cubicle.proc_fields` 各字段。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        columns = Cubicle.proc_fields
+        await db.executemany(
+            f'''INSERT INTO {const.PROC_TABLE} (data_dir, timestamp, pid, process, {", ".join(columns)})
+            VALUES ({", ".join("?" * (len(columns) + 4))})''',
+            [
+                (data_dir, timestamp, proc["pid"], proc["process"], *(proc.get(c, 0.0) for c in columns))
+                for proc in payload
+            ]
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_procs(db: "aiosqlite.Connection", data_dir: str, points: int) -> dict[str, "np.ndarray"]:
+        """
+        读取按进程拆分的内存序列，超过 points 个时间点时按等宽时间桶对每个进程取均值（时间戳为桶中点）；
+        同名进程重启后 PID 变化仍归为一条序列。旧版库或无记录时返回空字典。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        points : int
+            图表目标点数。
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            timestamp、process 与 `Cubicle.proc_fields` 各字段的列字典，按时间与进程名排序。
+        """
+        columns = Cubicle.proc_fields
+        try:
+            async with db.execute(
+                f"SELECT MIN(timestamp), MAX(timestamp), COUNT(DISTINCT timestamp) FROM {const.PROC_TABLE} WHERE data_dir = ?",
+                (data_dir,)
+            ) as cursor:
+                begin, end, total = await cursor.fetchone()
+        except aiosqlite.OperationalError:
+            return {}
+        if not total:
+            return {}
+
+        span = 1 if total <= points else max((end - begin) // points + 1, 1)
+        sql = f"""SELECT {"timestamp" if span == 1 else "timestamp - timestamp % ? + ? / 2"} AS bucket, process,
+            {", ".join(f"AVG({c}) AS {c}" for c in columns)}
+            FROM (
+                SELECT timestamp, process, {", ".join(f"SUM({c}) AS {c}" for c in columns)}
+                FROM {const.PROC_TABLE} WHERE data_dir = ? GROUP BY timestamp, process
+            )
+            GROUP BY bucket, process ORDER BY bucket, process"""
+        params = (data_dir,) if span == 1 else (span, span, data_dir)
+
+        async with db.execute(sql, params) as cursor:
+            names = ["timestamp", "process", *columns]
+            return Cubicle.columnize(names, await cursor.fetchall())
+
+    # Notes: ======================== MAPS ========================
+
+    @staticmethod
+    async def maps_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建按映射拆分的 smaps 表（MB），增量存储：每个（进程, 映射）只在 Rss、Pss 或 SwapPss 变化时写入一行，
+        首个快照写入全部映射，消失的映射写入一行 0；任意时刻的取值为该时刻及之前的最后一行。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.MAPS_TABLE} (
+            data_dir TEXT,
+            timestamp INTEGER,
+            process TEXT,
+            mapping TEXT,
+            rss REAL,
+            pss REAL,
+            swap REAL)''')
+        await db.execute(
+            f"CREATE INDEX IF NOT EXISTS {const.MAPS_TABLE}_data_dir ON {const.MAPS_TABLE} (data_dir, process, mapping)"
+        )
+        return await db.commit()
+
+    @staticmethod
+    async def insert_maps(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        timestamp: int,
+        payload: list[dict],
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        批量插入一次快照中发生变化的映射。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        timestamp : int
+            采样时间（Unix 毫秒时间戳）。
+
+        payload : list of dict
+            每个变化的映射一项，包含 process、mapping、rss、pss、swap（MB）。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.executemany(
+            f'''INSERT INTO {const.MAPS_TABLE} (data_dir, timestamp, process, mapping, rss, pss, swap)
+            VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            [(data_dir, timestamp, m["process"], m["mapping"], m["rss"], m["pss"], m["swap"]) for m in payload]
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_maps_growth(db: "aiosqlite.Connection", data_dir: str, top: int = 10) -> list[dict]:
+        """
+        统计各映射从首个快照到最后一个快照的 PSS 增长，返回增长最多的映射；旧版库或无记录时返回空列表。
+
+        首个快照之后才出现的映射以 0 为起点。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        top : int, optional
+            返回的映射数量上限。
+
+        Returns
+        -------
+        list of dict
+            [{"process", "mapping", "first", "last", "peak", "growth", "changes"}, ...]，PSS 单位 MB，按增长降序。
+        """
+        try:
+            async with db.execute(
+                f'''WITH ranked AS (
+                    SELECT process, mapping, timestamp, pss,
+                        ROW_NUMBER() OVER (PARTITION BY process, mapping ORDER BY timestamp, rowid) AS head,
+                        ROW_NUMBER() OVER (PARTITION BY process, mapping ORDER BY timestamp DESC, rowid DESC) AS tail
+                    FROM {const.MAPS_TABLE} WHERE data_dir = :data_dir
+                ), origin AS (
+                    SELECT MIN(timestamp) AS begin FROM {const.MAPS_TABLE} WHERE data_dir = :data_dir
+                )
+                SELECT process, mapping,
+                    SUM(CASE WHEN head = 1 AND timestamp = origin.begin THEN pss ELSE 0 END) AS first,
+                    SUM(CASE WHEN tail = 1 THEN pss ELSE 0 END) AS last,
+                    MAX(pss) AS peak,
+                    COUNT(*) AS changes
+                FROM ranked, origin
+                GROUP BY process, mapping
+                ORDER BY last - first DESC
+                LIMIT :top''',
+                {"data_dir": data_dir, "top": top}
+            ) as cursor:
+                rows = await cursor.fetchall()
+        except aiosqlite.OperationalError:
+            return []
+        return [
+            {
+                "process": process, "mapping": mapping, "first": round(first, 3), "last": round(last, 3),
+                "peak": round(peak, 3), "growth": round(last - first, 3), "changes": changes
+            } for process, mapping, first, last, peak, changes in rows if last - first > 0
+        ]
+
+    @staticmethod
+    async def query_maps_series(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        keys: list[tuple[str, str]]
+    ) -> dict[str, "np.ndarray"]:
+        """
+        还原指定映射的 PSS 时间序列：以全部快照时间为轴，各映射沿用最近一次写入的取值，首次写入之前记为 0。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        keys : list of tuple
+            [(process, mapping), ...]，通常取自 `Cubicle.query_maps_growth`。
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            timestamp 列与每个映射一列（键为 `process mapping`），旧版库或无记录时返回空字典。
+        """
+        if not keys:
+            return {}
+        try:
+            async with db.execute(
+                f"SELECT DISTINCT timestamp FROM {const.MAPS_TABLE} WHERE data_dir = ? ORDER BY timestamp", (data_dir,)
+            ) as cursor:
+                timeline = np.array([row[0] for row in await cursor.fetchall()], dtype=np.int64)
+            series = {"timestamp": timeline}
+            for process, mapping in keys:
+                async with db.execute(
+                    f'''SELECT timestamp, pss FROM {const.MAPS_TABLE}
+                    WHERE data_dir = ? AND process = ? AND mapping = ? ORDER BY timestamp, rowid''',
+                    (data_dir, process, mapping)
+                ) as cursor:
+                    rows = await cursor.fetchall()
+                stamps = np.array([r[0] for r in rows], dtype=np.int64)
+                values = np.array([0.0, *(r[1] for r in rows)], dtype=np.float64)
+                # 每个时间点取不晚于它的最后一行，首行之前落在索引 0（即 0.0）
+                series[f"{process} {mapping}"] = values[np.searchsorted(stamps, timeline, side="right")]
+        except aiosqlite.OperationalError:
+            return {}
+        return series
+
+    # Notes: ======================== EVENTS ========================
+
+    @staticmethod
+    async def events_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建日志事件表，每个 GC、低内存查杀、am_kill、am_low_memory 与 onTrimMemory 事件一行（见 `Dissect.logcat_event`）。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.EVENTS_TABLE} (
+            data_dir TEXT,
+            timestamp INTEGER,
+            kind TEXT,
+            pid TEXT,
+            process TEXT,
+            value REAL,
+            pause REAL,
+            message TEXT)''')
+        await db.execute(
+            f"CREATE INDEX IF NOT EXISTS {const.EVENTS_TABLE}_data_dir ON {const.EVENTS_TABLE} (data_dir, timestamp)"
+        )
+        return await db.commit()
+
+    @staticmethod
+    async def insert_events(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        payload: list[dict],
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        批量插入一批日志事件。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        payload : list of dict
+            `Dissect.logcat_event` 的结果列表，各自携带设备时间戳。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        names = ("timestamp", "kind", "pid", "process", "value", "pause", "message")
+        await db.executemany(
+            f'''INSERT INTO {const.EVENTS_TABLE} (data_dir, {", ".join(names)})
+            VALUES ({", ".join("?" * (len(names) + 1))})''',
+            [(data_dir, *(event.get(name) for name in names)) for event in payload]
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_events(db: "aiosqlite.Connection", data_dir: str) -> dict[str, "np.ndarray"]:
+        """
+        读取任务的日志事件（按时间升序），旧版库或无记录时返回空字典。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            timestamp、kind、pid、process、value、pause、message 的列字典。
+        """
+        names = ["timestamp", "kind", "pid", "process", "value", "pause", "message"]
+        try:
+            async with db.execute(
+                f"SELECT {', '.join(names)} FROM {const.EVENTS_TABLE} WHERE data_dir = ? ORDER BY timestamp",
+                (data_dir,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        except aiosqlite.OperationalError:
+            return {}
+        return Cubicle.columnize(names, rows) if rows else {}
+
+    # Notes: ======================== SMAPS ========================
+
+    @staticmethod
+    async def smaps_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建 smaps_rollup 采样表（独立采样通道），每个采样点一行，数值为应用全部进程之和（MB）。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.SMAPS_TABLE} (
+            data_dir TEXT,
+            timestamp INTEGER,
+            processes INTEGER,
+            {", ".join(f"{c.lower()} REAL" for c in Dissect.smaps_keys)})''')
+        await db.execute(
+            f"CREATE INDEX IF NOT EXISTS {const.SMAPS_TABLE}_data_dir ON {const.SMAPS_TABLE} (data_dir, timestamp)"
+        )
+        return await db.commit()
+
+    @staticmethod
+    async def insert_smaps(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        timestamp: int,
+        payload: dict,
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        插入一条 smaps_rollup 采样记录。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        timestamp : int
+            采样时间（Unix 毫秒时间戳）。
+
+        payload : dict
+            `Dissect.smaps_fields` 的各进程求和结果，附带 processes（进程数）。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        columns = [c.lower() for c in Dissect.smaps_keys]
+        await db.execute(
+            f'''INSERT INTO {const.SMAPS_TABLE} (data_dir, timestamp, processes, {", ".join(columns)})
+            VALUES ({", ".join("?" * (len(columns) + 3))})''',
+            (data_dir, timestamp, payload.get("processes", 1), *(payload.get(c, 0.0) for c in columns))
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_smaps(db: "aiosqlite.Connection", data_dir: str, points: int) -> dict[str, "np.ndarray"]:
+        """
+        读取 smaps_rollup 序列，超过 points 个点时按等宽时间桶取均值（时间戳为桶中点），
+        与内存明细或聚合序列共用时间轴叠加展示；旧版库或未启用该通道时返回空字典。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        points : int
+            图表目标点数。
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            timestamp 与各 smaps 字段的列字典。
+        """
+        columns = [c.lower() for c in Dissect.smaps_keys]
+        try:
+            async with db.execute(
+                f"SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM {const.SMAPS_TABLE} WHERE data_dir = ?",
+                (data_dir,)
+            ) as cursor:
+                begin, end, total = await cursor.fetchone()
+        except aiosqlite.OperationalError:
+            return {}
+        if not total:
+            return {}
+
+        if total <= points:
+            sql = f"""SELECT timestamp, {", ".join(columns)} FROM {const.SMAPS_TABLE}
+                WHERE data_dir = ? ORDER BY timestamp"""
+            params = (data_dir,)
+        else:
+            span = max((end - begin) // points + 1, 1)
+            sql = f"""SELECT timestamp - timestamp % ? + ? / 2 AS bucket, {", ".join(f"AVG({c}) AS {c}" for c in columns)}
+                FROM {const.SMAPS_TABLE} WHERE data_dir = ? GROUP BY bucket ORDER BY bucket"""
+            params = (span, span, data_dir)
+
+        async with db.execute(sql, params) as cursor:
+            names = ["timestamp", *columns]
+            return Cubicle.columnize(names, await cursor.fetchall())
+
+    # Notes: ======================== HOST ========================
+
+    @staticmethod
+    async def host_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建宿主进程自监控表，浸泡模式下每个监控周期一行，记录 Memrix 自身的常驻内存（MB）与事件循环任务数。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.HOST_TABLE} (
+            data_dir TEXT,
+            timestamp INTEGER,
+            rss REAL,
+            tasks INTEGER)''')
+        return await db.commit()
+
+    @staticmethod
+    async def insert_host(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        timestamp: int,
+        payload: dict,
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        插入一条宿主进程自监控记录。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        timestamp : int
+            采样时间（Unix 毫秒时间戳）。
+
+        payload : dict
+            `Sentinel.sample` 的结果，包含 rss 与 tasks。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(
+            f"INSERT INTO {const.HOST_TABLE} (data_dir, timestamp, rss, tasks) VALUES (?, ?, ?, ?)",
+            (data_dir, timestamp, payload["rss"], payload["tasks"])
+        )
+        return await db.commit() if commit else None
+
+    # Notes: ======================== HEAP ========================
+
+    @staticmethod
+    async def heap_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建堆快照触发表，在线泄漏检测每次触发一行，记录判定依据（斜率 MB/min、拟合优度、窗口秒数、PSS MB）
+        与快照的设备路径、本地路径、大小和状态（triggered / pulled / failed）。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.HEAP_TABLE} (
+            data_dir TEXT,
+            tick INTEGER,
+            timestamp INTEGER,
+            pid TEXT,
+            process TEXT,
+            slope REAL,
+            r2 REAL,
+            span REAL,
+            pss REAL,
+            remote TEXT,
+            local TEXT,
+            size INTEGER,
+            status TEXT,
+            PRIMARY KEY (data_dir, tick))''')
+        return await db.commit()
+
+    @staticmethod
+    async def insert_heap_dump(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        payload: dict,
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        写入一次堆快照触发记录，同一轮次的后续记录（拉取完成或失败）覆盖写入。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        payload : dict
+            包含 tick 与 `Cubicle.heap_fields` 各字段。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        names = Cubicle.heap_fields
+        await db.execute(
+            f'''INSERT OR REPLACE INTO {const.HEAP_TABLE} (data_dir, tick, {", ".join(names)})
+            VALUES ({", ".join("?" * (len(names) + 2))})''',
+            (data_dir, payload["tick"], *(payload.get(name) for name in names))
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_heap_dumps(db: "aiosqlite.Connection", data_dir: str) -> list[dict]:
+        """
+        读取任务的堆快照触发记录（按轮次升序），旧版库或无记录时返回空列表。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Returns
+        -------
+        list of dict
+            每次触发一项，包含 tick 与 `Cubicle.heap_fields` 各字段。
+        """
+        names = ["tick", *Cubicle.heap_fields]
+        try:
+            async with db.execute(
+                f"SELECT {', '.join(names)} FROM {const.HEAP_TABLE} WHERE data_dir = ? ORDER BY tick", (data_dir,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        except aiosqlite.OperationalError:
+            return []
+        return [dict(zip(names, row)) for row in rows]
+
+    # Notes: ======================== HPROF ========================
+
+    @staticmethod
+    async def hprof_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建堆快照解析结果表：汇总表每个快照一行，类直方图表每个（快照, 堆, 类）一行，
+        支配者表每个快照保留前 N 行。同一任务的两个快照以 tick 区分，差异直接由类直方图表自连接得出。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        columns = ",\n            ".join(
+            f"{name} {'REAL' if name == 'elapsed' else 'INTEGER'}" for name in Cubicle.hprof_fields
+        )
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.HPROF_TABLE} (
+            data_dir TEXT,
+            tick INTEGER,
+            {columns},
+            heaps TEXT,
+            PRIMARY KEY (data_dir, tick))''')
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.HPROF_CLASSES} (
+            data_dir TEXT,
+            tick INTEGER,
+            heap TEXT,
+            class TEXT,
+            instances INTEGER,
+            shallow INTEGER,
+            PRIMARY KEY (data_dir, tick, heap, class))''')
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.HPROF_DOMINATORS} (
+            data_dir TEXT,
+            tick INTEGER,
+            rank INTEGER,
+            object TEXT,
+            class TEXT,
+            retained INTEGER,
+            members INTEGER,
+            PRIMARY KEY (data_dir, tick, rank))''')
+        return await db.commit()
+
+    @staticmethod
+    async def insert_hprof(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        payload: dict,
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        写入一个堆快照的解析结果，重复写入同一轮次时覆盖。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        payload : dict
+            包含 tick 与 `Hprof.parse` 的 summary、classes、dominators。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        tick, summary, names = payload["tick"], payload["summary"], Cubicle.hprof_fields
+        await db.execute(
+            f'''INSERT OR REPLACE INTO {const.HPROF_TABLE} (data_dir, tick, {", ".join(names)}, heaps)
+            VALUES ({", ".join("?" * (len(names) + 3))})''',
+            (data_dir, tick, *(summary.get(name) for name in names), json.dumps(summary.get("heaps", {})))
+        )
+        await db.execute(f"DELETE FROM {const.HPROF_CLASSES} WHERE data_dir = ? AND tick = ?", (data_dir, tick))
+        await db.executemany(
+            f'''INSERT INTO {const.HPROF_CLASSES} (data_dir, tick, heap, class, instances, shallow)
+            VALUES (?, ?, ?, ?, ?, ?)''',
+            [(data_dir, tick, r["heap"], r["class"], r["instances"], r["shallow"]) for r in payload["classes"]]
+        )
+        await db.execute(f"DELETE FROM {const.HPROF_DOMINATORS} WHERE data_dir = ? AND tick = ?", (data_dir, tick))
+        await db.executemany(
+            f'''INSERT INTO {const.HPROF_DOMINATORS} (data_dir, tick, rank, object, class, retained, members)
+            VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            [
+                (data_dir, tick, r["rank"], r["object"], r["class"], r["retained"], r["members"])
+                for r in payload["dominators"]
+            ]
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_hprof(db: "aiosqlite.Connection", data_dir: str) -> list[dict]:
+        """
+        读取任务的堆快照解析汇总（按轮次升序），每项附带该快照的支配者估计；旧版库或无记录时返回空列表。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Returns
+        -------
+        list of dict
+            每个快照一项，包含 tick、`Cubicle.hprof_fields` 各字段、heaps 与 dominators。
+        """
+        names = ["tick", *Cubicle.hprof_fields, "heaps"]
+        try:
+            async with db.execute(
+                f"SELECT {', '.join(names)} FROM {const.HPROF_TABLE} WHERE data_dir = ? ORDER BY tick", (data_dir,)
+            ) as cursor:
+                summaries = [dict(zip(names, row)) for row in await cursor.fetchall()]
+            async with db.execute(
+                f'''SELECT tick, rank, object, class, retained, members FROM {const.HPROF_DOMINATORS}
+                WHERE data_dir = ? ORDER BY tick, rank''', (data_dir,)
+            ) as cursor:
+                dominators = await cursor.fetchall()
+        except aiosqlite.OperationalError:
+            return []
+
+        for summary in summaries:
+            summary["heaps"] = json.loads(summary["heaps"]) if summary["heaps"] else {}
+            summary["dominators"] = [
+                dict(zip(("rank", "object", "class", "retained", "members"), row[1:]))
+                for row in dominators if row[0] == summary["tick"]
+            ]
+        return summaries
+
+    @staticmethod
+    async def query_hprof_diff(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        before: int,
+        after: int,
+        top: int = 20
+    ) -> list[dict]:
+        """
+        对比同一任务的两个堆快照，返回浅大小增长最多的类，无需重新解析快照文件。
+
+        类直方图按 (堆, 类) 分组后求差，只在一侧出现的类按 0 计；各堆合并统计。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        before : int
+            基准快照轮次。
+
+        after : int
+            对比快照轮次。
+
+        top : int, optional
+            返回的类数量上限。
+
+        Returns
+        -------
+        list of dict
+            [{"class", "instances", "shallow", "instances_delta", "shallow_delta"}, ...]，按浅大小增量降序，
+            instances 与 shallow 为对比快照中的值。
+        """
+        try:
+            async with db.execute(
+                f'''SELECT
+                    class,
+                    SUM(CASE WHEN tick = :after THEN instances ELSE 0 END) AS instances,
+                    SUM(CASE WHEN tick = :after THEN shallow ELSE 0 END) AS shallow,
+                    SUM(CASE WHEN tick = :after THEN instances ELSE -instances END) AS instances_delta,
+                    SUM(CASE WHEN tick = :after THEN shallow ELSE -shallow END) AS shallow_delta
+                FROM {const.HPROF_CLASSES}
+                WHERE data_dir = :data_dir AND tick IN (:before, :after)
+                GROUP BY class
+                HAVING shallow_delta > 0
+                ORDER BY shallow_delta DESC
+                LIMIT :top''',
+                {"data_dir": data_dir, "before": before, "after": after, "top": top}
+            ) as cursor:
+                rows = await cursor.fetchall()
+        except aiosqlite.OperationalError:
+            return []
+        return [
+            dict(zip(("class", "instances", "shallow", "instances_delta", "shallow_delta"), row)) for row in rows
+        ]
+
+    # Notes: ======================== OVERHEAD ========================
+
+    @staticmethod
+    async def overhead_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建观测开销表，每个任务的每个采集通道一行，记录采集本身在设备端消耗的 CPU 时间（ms）与占比（%）。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.OVERHEAD_TABLE} (
+            data_dir TEXT,
+            lane TEXT,
+            probes INTEGER,
+            cpu_ms REAL,
+            per_probe REAL,
+            shell_ms REAL,
+            system_server_ms REAL,
+            adbd_ms REAL,
+            target_ms REAL,
+            overhead REAL,
+            throttled INTEGER,
+            PRIMARY KEY (data_dir, lane))''')
+        return await db.commit()
+
+    @staticmethod
+    async def insert_overhead(
+        db: "aiosqlite.Connection",
+        data_dir: str,
+        payload: dict,
+        commit: bool = True
+    ) -> typing.Any:
+        """
+        写入各通道的观测开销汇总，重放时同一通道覆盖写入。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        payload : dict
+            `Overhead.summary` 的结果，lane -> 汇总字典。
+
+        commit : bool, optional
+            是否立即提交；批量写入时置为 False，由调用方统一提交。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        names = Cubicle.overhead_fields
+        await db.executemany(
+            f'''INSERT OR REPLACE INTO {const.OVERHEAD_TABLE} (data_dir, lane, {", ".join(names)})
+            VALUES ({", ".join("?" * (len(names) + 2))})''',
+            [(data_dir, lane, *(stats.get(name, 0) for name in names)) for lane, stats in payload.items()]
+        )
+        return await db.commit() if commit else None
+
+    @staticmethod
+    async def query_overhead(db: "aiosqlite.Connection", data_dir: str) -> dict[str, dict]:
+        """
+        读取各通道的观测开销汇总，旧版库或未启用计量时返回空字典。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Returns
+        -------
+        dict of str to dict
+            lane -> 汇总字典，字段同 `Overhead.summary`。
+        """
+        names = Cubicle.overhead_fields
+        try:
+            async with db.execute(
+                f"SELECT lane, {', '.join(names)} FROM {const.OVERHEAD_TABLE} WHERE data_dir = ? ORDER BY lane",
+                (data_dir,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        except aiosqlite.OperationalError:
+            return {}
+        return {lane: dict(zip(names, values)) for lane, *values in rows}
+
+    # Notes: ======================== ROLLUP ========================
+
+    @staticmethod
+    async def rollup_table(
+        db: "aiosqlite.Connection", table: str, fields: tuple, keys: tuple = (), lasts: tuple = ()
+    ) -> typing.Any:
+        """
+        创建时间桶聚合表，若不存在则新建。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        table : str
+            聚合表名称。
+
+        fields : tuple
+            数值统计字段，每个字段生成 `<field>_min`、`<field>_max`、`<field>_sum` 三列。
+
+        keys : tuple, optional
+            除 data_dir、span、bucket 外的附加分组键（TEXT）。
+
+        lasts : tuple, optional
+            保留桶内最后一次取值的附加字段（TEXT）。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        columns = ",\n            ".join(
+            [f"{k} TEXT" for k in keys + lasts] +
+            [f"{f}_{agg} REAL" for f in fields for agg in ("min", "max", "sum")]
+        )
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {table} (
+            data_dir TEXT,
+            span INTEGER,
+            bucket INTEGER,
+            samples INTEGER,
+            {columns},
+            PRIMARY KEY (data_dir, span, bucket{"".join(f", {k}" for k in keys)}))''')
+        return await db.commit()
+
+    @staticmethod
+    def rollup_sql(table: str, fields: tuple, keys: tuple = (), lasts: tuple = ()) -> str:
+        """
+        生成聚合表的 UPSERT 语句，单条样本写入时同步累加所在时间桶的 min / max / sum / samples。
+        """
+        names = ["data_dir", "span", "bucket", "samples", *keys, *lasts] + [
+            f"{f}_{agg}" for f in fields for agg in ("min", "max", "sum")
+        ]
+        updates = ["samples = samples + 1"] + [f"{k} = excluded.{k}" for k in lasts] + [
+            f"{f}_min = min({f}_min, excluded.{f}_min), "
+            f"{f}_max = max({f}_max, excluded.{f}_max), "
+            f"{f}_sum = {f}_sum + excluded.{f}_sum" for f in fields
+        ]
+        return f'''INSERT INTO {table} ({", ".join(names)})
+            VALUES ({", ".join("?" * len(names))})
+            ON CONFLICT (data_dir, span, bucket{"".join(f", {k}" for k in keys)})
+            DO UPDATE SET {", ".join(updates)}'''
+
+    @staticmethod
+    async def mem_rollup_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建内存聚合表，按 (data_dir, span, bucket, mode) 分桶。
+        """
+        return await Cubicle.rollup_table(
+            db, const.MEM_ROLLUP_TABLE, Cubicle.mem_rollup_fields, ("mode",), ("activity",)
+        )
+
+    @staticmethod
+    async def io_rollup_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建 I/O 聚合表，按 (data_dir, span, bucket) 分桶；swap 为水位值，其余字段为相邻样本的增量。
+        """
+        return await Cubicle.rollup_table(
+            db, const.IO_ROLLUP_TABLE, Cubicle.io_rollup_fields
+        )
+
+    @staticmethod
+    async def insert_mem_rollup(db: "aiosqlite.Connection", row_id: int) -> typing.Any:
+        """
+        将指定内存明细行累加进各级时间桶，与明细写入处于同一事务。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        row_id : int
+            刚写入的内存明细行 id。
+
+        Returns
+        -------
+        Any
+            执行结果。
+        """
+        fields = Cubicle.mem_rollup_fields
+        async with db.execute(
+            f"SELECT data_dir, timestamp, mode, activity, {', '.join(fields)} "
+            f"FROM {const.MEM_DATA_TABLE} WHERE id = ?", (row_id,)
+        ) as cursor:
+            if not (row := await cursor.fetchone()):
+                return None
+
+        data_dir, timestamp, mode, activity, *values = row
+        if not isinstance(timestamp, int) or not all(isinstance(v, (int, float)) for v in values):
+            return None
+
+        stats = [x for v in values for x in (v, v, v)]
+        return await db.executemany(
+            Cubicle.rollup_sql(const.MEM_ROLLUP_TABLE, fields, ("mode",), ("activity",)), [
+                (data_dir, span, timestamp - timestamp % span, 1, mode, activity, *stats)
+                for span in const.ROLLUP_SPANS
+            ]
+        )
+
+    @staticmethod
+    async def insert_io_rollup(db: "aiosqlite.Connection", row_id: int) -> typing.Any:
+        """
+        以同一 data_dir 下的前一行为基准计算 I/O 增量（负值归零），并累加进各级时间桶。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        row_id : int
+            刚写入的 I/O 明细行 id。
+
+        Returns
+        -------
+        Any
+            执行结果。
+        """
+        fields = Cubicle.io_rollup_fields
+        select = f"SELECT data_dir, timestamp, {', '.join(fields)} FROM {const.IO_DATA_TABLE}"
+
+        async with db.execute(f"{select} WHERE id = ?", (row_id,)) as cursor:
+            if not (row := await cursor.fetchone()):
+                return None
+        data_dir, timestamp, swap, *counters = row
+
+        async with db.execute(
+            f"{select} WHERE data_dir = ? AND id < ? ORDER BY id DESC LIMIT 1", (data_dir, row_id)
+        ) as cursor:
+            prev = await cursor.fetchone()
+
+        if not isinstance(timestamp, int):
+            return None
+
+        deltas = [
+            max((c or 0) - (p or 0), 0) for c, p in zip(counters, prev[3:])
+        ] if prev else [0] * len(counters)
+
+        stats = [x for v in (swap or 0, *deltas) for x in (v, v, v)]
+        return await db.executemany(
+            Cubicle.rollup_sql(const.IO_ROLLUP_TABLE, fields), [
+                (data_dir, span, timestamp - timestamp % span, 1, *stats)
+                for span in const.ROLLUP_SPANS
+            ]
+        )
+
+    @staticmethod
+    async def rebuild_rollup(db: "aiosqlite.Connection", data_dir: str) -> typing.Any:
+        """
+        由明细数据整体重建指定 data_dir 的各级聚合，用于批量导入或明细变更之后。
+
+        与逐条写入的结果一致：内存桶的 activity 取桶内最后一次取值；I/O 增量以前一行为基准并将负值归零，首行增量为 0。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        Returns
+        -------
+        Any
+            执行结果（提交成功后通常为 None）。
+        """
+        mem_fields, io_fields = Cubicle.mem_rollup_fields, Cubicle.io_rollup_fields
+        counters = io_fields[1:]
+
+        for table in (const.MEM_ROLLUP_TABLE, const.IO_ROLLUP_TABLE):
+            await db.execute(f"DELETE FROM {table} WHERE data_dir = ?", (data_dir,))
+
+        mem_stats = ", ".join(f"MIN({f}), MAX({f}), SUM({f})" for f in mem_fields)
+        io_stats = ", ".join(f"MIN({f}), MAX({f}), SUM({f})" for f in io_fields)
+        deltas = ", ".join(
+            f"CASE WHEN LAG(id) OVER w IS NULL THEN 0 "
+            f"ELSE MAX(COALESCE({f}, 0) - COALESCE(LAG({f}) OVER w, 0), 0) END AS {f}" for f in counters
+        )
+
+        for span in const.ROLLUP_SPANS:
+            await db.execute(f'''INSERT INTO {const.MEM_ROLLUP_TABLE} (
+                data_dir, span, bucket, samples, mode, activity,
+                {", ".join(f"{f}_{agg}" for f in mem_fields for agg in ("min", "max", "sum"))})
+                SELECT data_dir, ?, bucket, COUNT(*), mode, MAX(last_activity), {mem_stats}
+                FROM (
+                    SELECT *, timestamp - timestamp % ? AS bucket, LAST_VALUE(activity) OVER (
+                        PARTITION BY timestamp - timestamp % ?, mode ORDER BY timestamp, id
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                    ) AS last_activity
+                    FROM {const.MEM_DATA_TABLE}
+                    WHERE data_dir = ? AND typeof(timestamp) = 'integer'
+                )
+                GROUP BY bucket, mode''', (span, span, span, data_dir)
+            )
+            await db.execute(f'''INSERT INTO {const.IO_ROLLUP_TABLE} (
+                data_dir, span, bucket, samples,
+                {", ".join(f"{f}_{agg}" for f in io_fields for agg in ("min", "max", "sum"))})
+                SELECT data_dir, ?, timestamp - timestamp % ? AS bucket, COUNT(*), {io_stats}
+                FROM (
+                    SELECT data_dir, timestamp, COALESCE(swap, 0) AS swap, {deltas}
+                    FROM {const.IO_DATA_TABLE}
+                    WHERE data_dir = ?
+                    WINDOW w AS (ORDER BY id)
+                )
+                WHERE typeof(timestamp) = 'integer'
+                GROUP BY bucket''', (span, span, data_dir)
+            )
+
+        return await db.commit()
+
+    @staticmethod
+    async def rollup_span(
+        db: "aiosqlite.Connection", table: str, rollup: str, data_dir: str, points: int
+    ) -> typing.Optional[int]:
+        """
+        根据目标点数选择聚合粒度：明细行数不超过 points 时返回 None（直接读明细），
+        否则返回桶数不超过 points 的最细粒度；旧版库无聚合表时同样返回 None。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        table : str
+            明细表名称。
+
+        rollup : str
+            聚合表名称。
+
+        data_dir : str
+            任务数据目录名。
+
+        points : int
+            图表目标点数。
+
+        Returns
+        -------
+        Optional[int]
+            选中的聚合粒度（毫秒），或 None。
+        """
+        async with db.execute(f"SELECT COUNT(*) FROM {table} WHERE data_dir = ?", (data_dir,)) as cursor:
+            total, *_ = await cursor.fetchone()
+        if total <= points:
+            return None
+
+        try:
+            async with db.execute(
+                f"SELECT span, COUNT(DISTINCT bucket) FROM {rollup} WHERE data_dir = ? GROUP BY span ORDER BY span",
+                (data_dir,)
+            ) as cursor:
+                spans = await cursor.fetchall()
+        except aiosqlite.OperationalError:
+            return None
+
+        for span, buckets in spans:
+            if buckets <= points:
+                return span
+        return spans[-1][0] if spans else None
+
+    @staticmethod
+    async def query_mem_rollup(db: "aiosqlite.Connection", data_dir: str, span: int) -> dict[str, "np.ndarray"]:
+        """
+        按指定粒度读取内存聚合数据，字段与 `stream_mem` 一致（取桶内均值），并附加 pss_min / pss_max / samples。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        span : int
+            聚合粒度（毫秒）。
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            列名到 numpy 数组的字典，timestamp 为桶中点。
+        """
+        averages = ",\n                ".join(
+            f"{f}_sum / samples AS {f}" for f in Cubicle.mem_rollup_fields
+        )
+        sql = f"""
+            SELECT
+                bucket + span / 2 AS timestamp,
+                NULL AS adj,
+                activity,
+                mode,
+                {averages},
+                pss_min,
+                pss_max,
+                samples
+            FROM {const.MEM_ROLLUP_TABLE}
+            WHERE data_dir = ? AND span = ?
+            ORDER BY bucket ASC, mode ASC
+        """
+        return Packer.concat([batch async for batch in Cubicle.stream(db, sql, (data_dir, span))])
+
+    @staticmethod
+    async def query_io_rollup(db: "aiosqlite.Connection", data_dir: str, span: int) -> dict[str, "np.ndarray"]:
+        """
+        按指定粒度读取 I/O 聚合数据，增量列累加还原为累计计数，与 `stream_io` 的字段语义一致。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        data_dir : str
+            任务数据目录名。
+
+        span : int
+            聚合粒度（毫秒）。
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            列名到 numpy 数组的字典，timestamp 为桶中点，swap 为桶内均值。
+        """
+        counters = ",\n                ".join(
+            f"{f}_sum AS {f}" for f in Cubicle.io_rollup_fields[1:]
+        )
+        sql = f"""
+            SELECT
+                bucket + span / 2 AS timestamp,
+                swap_sum / samples AS swap,
+                {counters}
+            FROM {const.IO_ROLLUP_TABLE}
+            WHERE data_dir = ? AND span = ?
+            ORDER BY bucket ASC
+        """
+        columns = Packer.concat([batch async for batch in Cubicle.stream(db, sql, (data_dir, span))])
+        for f in Cubicle.io_rollup_fields[1:]:
+            if f in columns:
+                columns[f] = np.cumsum(columns[f])
+        return columns
 
 
 if __name__ == '__main__':
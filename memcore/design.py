@@ -224,6 +224,98 @@ class Design(object):
 
         Design.console.print(tree)
 
+    @staticmethod
+    def show_catalog(entries: list[dict]) -> None:
+        """
+        以表格形式显示全局目录检索结果。
+        """
+        if not entries:
+            return Design.Doc.wrn(f"No matching runs in catalog ...")
+
+        table = Table(
+            title=f"[bold #5FD7FF]{const.APP_DESC} Catalog",
+            header_style=f"bold #87AFFF", title_justify="center", show_header=True, show_lines=False
+        )
+        for column in ["任务", "分组", "应用", "设备", "开始", "时长", "样本", "评分"]:
+            table.add_column(column, justify="left", no_wrap=True)
+
+        for entry in entries:
+            started, stopped = entry.get("started"), entry.get("stopped")
+            begin = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started / 1000)) if started else "-"
+            elapsed = f"{(stopped - started) / 60000:.1f} m" if started and stopped else "-"
+            device = " ".join(str(v) for v in (entry.get("model"), entry.get("serialno")) if v) or "-"
+            scores = " ".join(
+                f"{k}:{v.get('grade') or v.get('level') or v.get('trend')}"
+                for k, v in entry.get("scores", {}).items() if isinstance(v, dict)
+            ) or "-"
+            table.add_row(
+                f"[bold #EEEEEE]{entry['data_dir']}", f"{entry.get('group_dir') or '-'}",
+                f"{entry.get('package') or '-'}", device, begin, elapsed,
+                f"{entry.get('samples') or 0}", scores
+            )
+
+        Design.console.print(table)
+
+    @staticmethod
+    def show_replay(rows: list[dict]) -> None:
+        """
+        以表格形式显示原始采集存档的重放解析结果。
+        """
+        if not rows:
+            return Design.Doc.wrn(f"No records in archive ...")
+
+        table = Table(
+            title=f"[bold #5FD7FF]{const.APP_DESC} Replay",
+            header_style=f"bold #87AFFF", title_justify="center", show_header=True, show_lines=False
+        )
+        for column in ["轮次", "时间", "进程", "类型", "原始", "解析"]:
+            table.add_column(column, justify="left", no_wrap=True)
+
+        for row in rows:
+            if row["kind"] == "io":
+                parsed = " ".join(f"{k}={v}" for k, v in row["fields"].items() if k in ("rchar", "wchar"))
+            elif row["kind"] == "smaps":
+                parsed = " ".join(f"{k}={v}" for k, v in row["fields"].items() if k in ("pss", "rss"))
+            else:
+                meminfo_map, summary_map = row["fields"]
+                parsed = " ".join(
+                    f"{k}={v}" for k, v in (summary_map | meminfo_map).items() if k in ("TOTAL PSS", "TOTAL USS")
+                )
+            begin = time.strftime("%H:%M:%S", time.localtime(row["tms"] / 1000))
+            table.add_row(
+                f"[bold #EEEEEE]{row['tick']}", begin, row["pid"], row["kind"], f"{row['size']} B",
+                parsed or "[bold #FF5F5F]unparsed"
+            )
+
+        Design.console.print(table)
+
+    @staticmethod
+    def show_compaction(reports: list[dict], dry: bool) -> None:
+        """
+        以表格形式显示压缩结果，试运行时显示预计可回收空间。
+        """
+        if not reports:
+            return Design.Doc.wrn(f"Nothing to compact ...")
+
+        table = Table(
+            title=f"[bold #5FD7FF]{const.APP_DESC} Compaction{' (dry run)' if dry else ''}",
+            header_style=f"bold #87AFFF", title_justify="center", show_header=True, show_lines=False
+        )
+        for column in ["分组", "任务", "内存行", "IO 行", "帧数据", "数据库", "追踪"]:
+            table.add_column(column, justify="left", no_wrap=True)
+
+        mb: typing.Callable[[int], str] = lambda x: f"{x / 1048576:.2f} MB"
+        for report in reports:
+            table.add_row(
+                f"[bold #EEEEEE]{report['group']}", f"{report['tasks']}",
+                f"-{report['mem_rows']}", f"-{report['io_rows']}", f"{report['gfx_tasks']}",
+                mb(report["db_bytes"]), mb(report["trace_bytes"])
+            )
+
+        total = sum(r["db_bytes"] + r["trace_bytes"] for r in reports)
+        Design.console.print(table)
+        Design.Doc.log(f"{'Reclaimable' if dry else 'Reclaimed'}: {mb(total)}")
+
     @staticmethod
     async def compile_animation() -> None:
         """
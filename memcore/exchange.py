@@ -0,0 +1,319 @@
+#  _____          _
+# | ____|_  _____| |__   __ _ _ __   __ _  ___
+# |  _| \ \/ / __| '_ \ / _` | '_ \ / _` |/ _ \
+# | |___ >  < (__| | | | (_| | | | | (_| |  __/
+# |_____/_/\_\___|_| |_|\__,_|_| |_|\__, |\___|
+#                                   |___/
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import json
+import typing
+import asyncio
+import aiosqlite
+import numpy as np
+from pathlib import Path
+from engine.tinker import MemrixError
+from memcore.cubicle import Cubicle
+from memcore.packer import Packer
+from memcore.pool import Pool
+from memnova import const
+
+
+class Exchange(object):
+    """
+    会话数据的列式交换格式，支持 Parquet 与 Arrow IPC。
+
+    导出目录结构按表与 data_dir 分区（Hive 风格），可直接被 pyarrow.dataset / DuckDB / Spark 扫描：
+
+    - `manifest.json`：分组、场景、类型、任务列表与 team 配置。
+    - `<table>/data_dir=<name>/part-0.<ext>`：joint_data、mem_data、io_data、各通道的附属表（见 `flat_tables`）
+      以及 gfx_meta、gfx_<field>。
+
+    数值列保留原始类型，timestamp 列为 `timestamp[ms]`，字符串列为字典编码；
+    图形帧数据按片段展开为行并附加 segment 列。
+    """
+
+    # 按 data_dir 分区的明细表，新增通道的数据表需同时加入此处与 `ingest` 的建表列表，否则导出后丢失
+    flat_tables: tuple = (
+        const.JOINT_DATA_TABLE, const.MEM_DATA_TABLE, const.IO_DATA_TABLE,
+        const.CADENCE_TABLE, const.SMAPS_TABLE, const.HOST_TABLE, const.TICK_TABLE,
+        const.OVERHEAD_TABLE, const.PROC_TABLE, const.HEAP_TABLE,
+        const.HPROF_TABLE, const.HPROF_CLASSES, const.HPROF_DOMINATORS, const.MAPS_TABLE,
+        const.EVENTS_TABLE
+    )
+
+    # 有自增 id 的表按写入顺序导出，其余按轮次或时间排序
+    serial_tables: tuple = (const.JOINT_DATA_TABLE, const.MEM_DATA_TABLE, const.IO_DATA_TABLE)
+
+    gfx_fields: tuple = ("raw_frames", "vsync_sys", "vsync_app", "roll_ranges", "drag_ranges", "jank_ranges")
+
+    @staticmethod
+    def arrow() -> tuple:
+        """
+        延迟导入 pyarrow，返回 (pyarrow, pyarrow.parquet, pyarrow.ipc)。
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            import pyarrow.ipc as ipc
+        except ImportError as e:
+            raise MemrixError(f"Parquet / Arrow exchange requires pyarrow: {e}")
+        return pa, pq, ipc
+
+    @staticmethod
+    def suffix(arrow_ipc: bool) -> str:
+        return "arrow" if arrow_ipc else "parquet"
+
+    @staticmethod
+    def to_table(columns: dict[str, "np.ndarray"]) -> typing.Any:
+        """
+        将列字典转换为 Arrow 表：字符串列字典编码，timestamp 列转为毫秒时间戳，NaN 记为 null。
+        """
+        pa, *_ = Exchange.arrow()
+
+        arrays = {}
+        for name, column in columns.items():
+            if column.dtype.kind in "OUS":
+                arrays[name] = pa.array(column.astype(object), type=pa.string(), from_pandas=True).dictionary_encode()
+            elif name == "timestamp":
+                arrays[name] = pa.array(column, from_pandas=True).cast(pa.int64()).cast(pa.timestamp("ms"))
+            else:
+                arrays[name] = pa.array(column, from_pandas=True)
+        return pa.table(arrays)
+
+    @staticmethod
+    def write(table: typing.Any, path: "Path", arrow_ipc: bool) -> "Path":
+        """
+        写出单个分区文件，写出前统一各批次的字典。
+        """
+        pa, pq, ipc = Exchange.arrow()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = table.unify_dictionaries()
+        if arrow_ipc:
+            with pa.OSFile(str(path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            pq.write_table(table, str(path), compression="zstd")
+        return path
+
+    @staticmethod
+    def read(path: "Path") -> typing.Any:
+        """
+        读取单个分区文件，按扩展名区分 Parquet 与 Arrow IPC。
+        """
+        pa, pq, ipc = Exchange.arrow()
+
+        if path.suffix == ".arrow":
+            with pa.memory_map(str(path), "r") as source:
+                return ipc.open_file(source).read_all()
+        return pq.read_table(str(path))
+
+    @staticmethod
+    def partition(root: "Path", table: str, data_dir: str, ext: str) -> "Path":
+        return root / table / f"data_dir={data_dir}" / f"part-0.{ext}"
+
+    @staticmethod
+    async def columns_of(db: "aiosqlite.Connection", table: str) -> list[str]:
+        """
+        返回表的业务字段（不含自增 id 与分区键 data_dir）。
+        """
+        async with db.execute(f"PRAGMA table_info({table})") as cursor:
+            return [row[1] for row in await cursor.fetchall() if row[1] not in ("id", "data_dir")]
+
+    @staticmethod
+    async def export(
+        db_files: list[str], out_dir: str, data_dirs: list[str], manifest: dict, arrow_ipc: bool = False
+    ) -> "Path":
+        """
+        将指定任务导出为分区列式文件。
+
+        Parameters
+        ----------
+        db_files : list of str
+            源数据库分片路径（以只读方式打开并联合查询）。
+
+        out_dir : str
+            导出根目录。
+
+        data_dirs : list of str
+            需要导出的任务目录名。
+
+        manifest : dict
+            分组描述信息（group_dir、scene、kind、team 等），写入 manifest.json。
+
+        arrow_ipc : bool, optional
+            为 True 时写出 Arrow IPC 文件，否则写出 Parquet（zstd 压缩）。
+
+        Returns
+        -------
+        Path
+            导出根目录。
+        """
+        Exchange.arrow()
+
+        root, ext = Path(out_dir), Exchange.suffix(arrow_ipc)
+        loop = asyncio.get_running_loop()
+
+        async with Pool(db_files, 1) as pool, pool.lease() as db:
+            for data_dir in data_dirs:
+
+                # ==== 明细表 ====
+                for table in Exchange.flat_tables:
+                    names = await Exchange.columns_of(db, table)
+                    select = ", ".join(
+                        f"{Cubicle.epoch_ms} AS timestamp" if n == "timestamp" and table != const.JOINT_DATA_TABLE else n
+                        for n in names
+                    )
+                    order = "id" if table in Exchange.serial_tables else ", ".join(
+                        n for n in ("tick", "timestamp") if n in names
+                    )
+                    sql = f"SELECT {select} FROM {table} WHERE data_dir = ?{f' ORDER BY {order}' if order else ''}"
+                    if columns := Packer.concat([b async for b in Cubicle.stream(db, sql, (data_dir,))]):
+                        await loop.run_in_executor(
+                            None, Exchange.write, Exchange.to_table(columns),
+                            Exchange.partition(root, table, data_dir, ext), arrow_ipc
+                        )
+
+                # ==== 图形片段 ====
+                meta, parts = [], {field: [] for field in Exchange.gfx_fields}
+                async with db.execute(
+                    f"""SELECT label, {Cubicle.epoch_ms} AS timestamp, metadata, {", ".join(Exchange.gfx_fields)}
+                    FROM {const.GFX_DATA_TABLE} WHERE data_dir = ? ORDER BY id""", (data_dir,)
+                ) as cursor:
+                    async for segment, (label, timestamp, metadata, *blobs) in aiter_enumerate(cursor):
+                        meta.append({"segment": segment, "label": label, "timestamp": timestamp, "metadata": metadata})
+                        for field, blob in zip(Exchange.gfx_fields, blobs):
+                            if columns := Cubicle.decode_columns(blob):
+                                size = len(next(iter(columns.values())))
+                                parts[field].append({"segment": np.full(size, segment, dtype=np.int64), **columns})
+
+                if meta:
+                    await loop.run_in_executor(
+                        None, Exchange.write, Exchange.to_table(Packer.from_records(meta)),
+                        Exchange.partition(root, "gfx_meta", data_dir, ext), arrow_ipc
+                    )
+                for field, chunks in parts.items():
+                    if columns := Packer.concat(chunks):
+                        await loop.run_in_executor(
+                            None, Exchange.write, Exchange.to_table(columns),
+                            Exchange.partition(root, f"gfx_{field}", data_dir, ext), arrow_ipc
+                        )
+
+        manifest = {**manifest, "data_dirs": data_dirs, "format": ext, "version": const.APP_VERSION}
+        (root / "manifest.json").write_text(
+            json.dumps(manifest, ensure_ascii=False, indent=2, default=str), encoding=const.CHARSET
+        )
+        return root
+
+    @staticmethod
+    def plain(table: typing.Any) -> typing.Any:
+        """
+        将 Arrow 表中的时间戳列还原为 Unix 毫秒整数，字典列还原为普通字符串。
+        """
+        pa, *_ = Exchange.arrow()
+
+        for i, field in enumerate(table.schema):
+            if pa.types.is_timestamp(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(pa.int64()))
+            elif pa.types.is_dictionary(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+        return table
+
+    @staticmethod
+    async def ingest(src_dir: str, db_file: str) -> dict:
+        """
+        将导出目录重新写入 `Cubicle` 数据库，同名 data_dir 的旧数据会被替换，写入后重建聚合表。
+
+        Parameters
+        ----------
+        src_dir : str
+            导出根目录（包含 manifest.json）。
+
+        db_file : str
+            目标数据库路径。
+
+        Returns
+        -------
+        dict
+            导出时写入的 manifest。
+        """
+        Exchange.arrow()
+
+        root = Path(src_dir)
+        if not (manifest_file := root / "manifest.json").is_file():
+            raise MemrixError(f"Missing manifest: {manifest_file}")
+        manifest = json.loads(manifest_file.read_text(encoding=const.CHARSET))
+        ext, loop = manifest.get("format", "parquet"), asyncio.get_running_loop()
+
+        async with aiosqlite.connect(db_file) as db:
+            await asyncio.gather(
+                Cubicle.joint_table(db), Cubicle.mem_table(db), Cubicle.gfx_table(db), Cubicle.io_table(db),
+                Cubicle.mem_rollup_table(db), Cubicle.io_rollup_table(db),
+                Cubicle.cadence_table(db), Cubicle.smaps_table(db), Cubicle.host_table(db), Cubicle.tick_table(db),
+                Cubicle.overhead_table(db), Cubicle.proc_table(db), Cubicle.heap_table(db), Cubicle.hprof_table(db),
+                Cubicle.maps_table(db), Cubicle.events_table(db)
+            )
+
+            for data_dir in manifest.get("data_dirs", []):
+
+                # ==== 明细表 ====
+                for table in Exchange.flat_tables + (const.GFX_DATA_TABLE,):
+                    await db.execute(f"DELETE FROM {table} WHERE data_dir = ?", (data_dir,))
+
+                for table in Exchange.flat_tables:
+                    if not (path := Exchange.partition(root, table, data_dir, ext)).is_file():
+                        continue
+                    arrow_table = Exchange.plain(await loop.run_in_executor(None, Exchange.read, path))
+                    targets = await Exchange.columns_of(db, table)
+                    names = [n for n in arrow_table.column_names if n in targets]
+
+                    sql = f"""INSERT INTO {table} (data_dir, {", ".join(names)})
+                        VALUES (?, {", ".join("?" * len(names))})"""
+                    for batch in arrow_table.select(names).to_batches(max_chunksize=4096):
+                        await db.executemany(
+                            sql, [(data_dir, *row) for row in zip(*(c.to_pylist() for c in batch.columns))]
+                        )
+
+                # ==== 图形片段 ====
+                if (path := Exchange.partition(root, "gfx_meta", data_dir, ext)).is_file():
+                    meta = Exchange.plain(await loop.run_in_executor(None, Exchange.read, path)).to_pylist()
+
+                    segments = {field: {} for field in Exchange.gfx_fields}
+                    for field in Exchange.gfx_fields:
+                        if (path := Exchange.partition(root, f"gfx_{field}", data_dir, ext)).is_file():
+                            rows = Exchange.plain(await loop.run_in_executor(None, Exchange.read, path)).to_pylist()
+                            for row in rows:
+                                segments[field].setdefault(row.pop("segment"), []).append(row)
+
+                    for item in sorted(meta, key=lambda x: x["segment"]):
+                        await Cubicle.insert_gfx(db, data_dir, item["label"], item["timestamp"], {
+                            "metadata": item["metadata"],
+                            **{
+                                field: Packer.pack(segments[field].get(item["segment"], []))
+                                for field in Exchange.gfx_fields
+                            }
+                        })
+
+                await Cubicle.rebuild_rollup(db, data_dir)
+
+            await db.commit()
+
+        return manifest
+
+
+async def aiter_enumerate(iterable: typing.AsyncIterable) -> typing.AsyncIterator[tuple[int, typing.Any]]:
+    """
+    异步可迭代对象的 enumerate。
+    """
+    index = 0
+    async for item in iterable:
+        yield index, item
+        index += 1
+
+
+if __name__ == '__main__':
+    pass
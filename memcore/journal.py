@@ -0,0 +1,512 @@
+#      _                              _
+#     | | ___  _   _ _ __ _ __   __ _| |
+#  _  | |/ _ \| | | | '__| '_ \ / _` | |
+# | |_| | (_) | |_| | |  | | | | (_| | |
+#  \___/ \___/ \__,_|_|  |_| |_|\__,_|_|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import os
+import mmap
+import json
+import zlib
+import struct
+import typing
+import asyncio
+import aiosqlite
+from pathlib import Path
+from loguru import logger
+from engine.tinker import MemrixError
+from memcore.cubicle import Cubicle
+from memnova import const
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class Journal(object):
+    """
+    采样热路径的追加式日志，每个任务一个文件（`<data_dir>.mxj`），与数据库位于同一目录。
+
+    文件格式：
+
+    - 文件头：magic(4s) + version(H)
+    - 记录：length(I) + crc32(I) + JSON 负载，负载为 {"t": 时间戳, "l": 标签, "mem": {...}, "io": {...}, "c": [轮次, 计划时间, 采样周期], "s": {...}, "h": {...}, "k": {...}, "o": {...}, "p": [...], "w": {...}}
+
+    采样循环只追加记录并刷新到操作系统缓冲区即视为确认，进程被终止也不会丢失；
+    后台加载器按偏移批量写入 SQLite，偏移与数据在同一事务中提交，因此重放不会重复写入。
+    尾部不完整或校验失败的记录视为未确认写入，读取时在此截止。
+
+    写入方在 `open` 时对日志加排他锁并持有到 `close`（进程退出时由系统释放），`replay` 跳过仍被持有的日志，
+    同一分组下其他进程正在写入的日志不会被当作遗留日志加载并删除。
+
+    指定 `rotate` 时，日志全部入库且超过该大小后原地截断为新分段，长时间运行时文件大小有界。
+    """
+
+    __head = struct.Struct("<4sH")
+    __frame = struct.Struct("<II")
+
+    # Windows 的字节区间锁为强制锁，锁定远超文件末尾的一个字节，不影响读写日志内容
+    __lock_at = 1 << 40
+
+    # 关闭时最后一次加载未能读完日志的重试次数，用尽后保留日志留待重放
+    retries: int = 3
+
+    def __init__(self, journal_file: typing.Union[str, "Path"], rotate: int = 0):
+        self.journal_file = Path(journal_file)
+        self.data_dir = self.journal_file.stem
+        self.rotate = rotate
+        self.appended, self.segments = 0, 0
+        self.__sink: typing.Optional[typing.BinaryIO] = None
+
+    def open(self) -> "Journal":
+        """
+        以追加方式打开日志文件，新文件写入文件头。
+        """
+        self.__sink = open(self.journal_file, "ab", buffering=1 << 16)
+        if not Journal.acquire(self.__sink):
+            self.__sink.close()
+            raise MemrixError(f"Journal in use by another process: {self.journal_file}")
+        if self.__sink.tell() == 0:
+            self.__sink.write(Journal.__head.pack(const.JOURNAL_MAGIC, const.JOURNAL_VERSION))
+            self.__sink.flush()
+        return self
+
+    def append(
+        self,
+        timestamp: int,
+        label: str,
+        mem: typing.Optional[dict],
+        io: typing.Optional[dict],
+        cadence: typing.Optional[tuple] = None,
+        smaps: typing.Optional[dict] = None,
+        host: typing.Optional[dict] = None,
+        ticks: typing.Optional[dict] = None,
+        overhead: typing.Optional[dict] = None,
+        procs: typing.Optional[list] = None,
+        heap: typing.Optional[dict] = None,
+        hprof: typing.Optional[dict] = None,
+        maps: typing.Optional[list] = None,
+        events: typing.Optional[list] = None
+    ) -> None:
+        """
+        追加一条采样记录并刷新到操作系统缓冲区。
+
+        Parameters
+        ----------
+        timestamp : int
+            采样时间（Unix 毫秒时间戳）。
+
+        label : str
+            任务或应用标签。
+
+        mem : dict, optional
+            `Cubicle.insert_mem` 所需的内存负载。
+
+        io : dict, optional
+            `Cubicle.insert_io` 所需的 I/O 负载。
+
+        cadence : tuple, optional
+            (轮次编号, 计划时间 Unix 毫秒, 采样周期毫秒)，写入 `Cubicle.insert_cadence`。
+
+        smaps : dict, optional
+            `Cubicle.insert_smaps` 所需的 smaps_rollup 负载。
+
+        host : dict, optional
+            `Cubicle.insert_host` 所需的宿主进程自监控负载。
+
+        ticks : dict, optional
+            `Cubicle.insert_tick_stats` 所需的单轮耗时分解。
+
+        overhead : dict, optional
+            `Cubicle.insert_overhead` 所需的各通道观测开销汇总。
+
+        procs : list, optional
+            `Cubicle.insert_procs` 所需的各进程明细。
+
+        heap : dict, optional
+            `Cubicle.insert_heap_dump` 所需的堆快照触发记录。
+
+        hprof : dict, optional
+            `Cubicle.insert_hprof` 所需的堆快照解析结果。
+
+        maps : list, optional
+            `Cubicle.insert_maps` 所需的变化映射。
+
+        events : list, optional
+            `Cubicle.insert_events` 所需的一批日志事件。
+        """
+        body = json.dumps(
+            {"t": timestamp, "l": label, "mem": mem, "io": io, "c": cadence, "s": smaps, "h": host, "k": ticks,
+             "o": overhead, "p": procs, "w": heap, "x": hprof, "m": maps, "e": events},
+            ensure_ascii=False, separators=(",", ":")
+        ).encode(const.CHARSET)
+        self.__sink.write(Journal.__frame.pack(len(body), zlib.crc32(body)) + body)
+        self.__sink.flush()
+        self.appended += 1
+
+    @staticmethod
+    def acquire(handle: typing.BinaryIO) -> bool:
+        """
+        对打开的日志文件加非阻塞排他锁，关闭文件时释放；已被其他进程持有时返回 False。
+        """
+        fd = handle.fileno()
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                position = os.lseek(fd, 0, os.SEEK_CUR)
+                os.lseek(fd, Journal.__lock_at, os.SEEK_SET)
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                finally:
+                    os.lseek(fd, position, os.SEEK_SET)
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def held(journal_file: typing.Union[str, "Path"]) -> bool:
+        """
+        日志是否仍被写入方持有（尝试加锁后立即释放）。
+        """
+        try:
+            with open(journal_file, "rb") as handle:
+                return not Journal.acquire(handle)
+        except FileNotFoundError:
+            return False
+
+    def sync(self) -> None:
+        """
+        将已刷新的记录落盘。
+        """
+        if self.__sink and not self.__sink.closed:
+            os.fsync(self.__sink.fileno())
+
+    def close(self) -> None:
+        if self.__sink and not self.__sink.closed:
+            self.sync()
+            self.__sink.close()
+
+    async def roll(self, db: "aiosqlite.Connection") -> bool:
+        """
+        已入库部分超过分段大小时，原地截断为新分段，仅保留尚未入库的尾部记录，并将加载偏移归零。
+
+        读取尾部、截断与重写之间没有让出事件循环，采样循环不会在其间追加；偏移归零提交前进程被终止时，
+        读取到的偏移大于新分段长度，`scan` 按分段已轮换处理，从文件头重新读取，尾部记录不会丢失或重复。
+
+        Returns
+        -------
+        bool
+            是否发生轮换。
+        """
+        if not self.rotate or not self.__sink or self.__sink.closed:
+            return False
+
+        async with db.execute(
+            f"SELECT offset FROM {const.JOURNAL_TABLE} WHERE data_dir = ?", (self.data_dir,)
+        ) as cursor:
+            offset = row[0] if (row := await cursor.fetchone()) else 0
+
+        if offset < self.rotate or (end := self.__sink.tell()) < offset:
+            return False
+
+        with open(self.journal_file, "rb") as f:
+            f.seek(offset)
+            tail = f.read(end - offset)
+
+        self.__sink.truncate(0)
+        self.__sink.write(Journal.__head.pack(const.JOURNAL_MAGIC, const.JOURNAL_VERSION) + tail)
+        self.__sink.flush()
+        self.segments += 1
+
+        await db.execute(f"UPDATE {const.JOURNAL_TABLE} SET offset = 0 WHERE data_dir = ?", (self.data_dir,))
+        await db.commit()
+        # 释放连接缓存的页，长时间运行时宿主内存不随入库量增长
+        await db.execute("PRAGMA shrink_memory")
+        logger.info(f"Journal rotated at {offset} B, segment {self.segments} -> {self.data_dir}")
+        return True
+
+    @staticmethod
+    def scan(journal_file: typing.Union[str, "Path"], offset: int) -> tuple[list[dict], list[int]]:
+        """
+        从偏移处读取完整记录，返回 (记录列表, 每条记录之后的偏移)。
+
+        Parameters
+        ----------
+        journal_file : str or Path
+            日志文件路径。
+
+        offset : int
+            起始偏移，0 表示从文件头之后开始。
+
+        Returns
+        -------
+        tuple
+            记录列表与各记录结束处的偏移，加载进度只推进到已写入数据库的记录之后。
+        """
+        head, frame = Journal.__head, Journal.__frame
+        records, ends, offset = [], [], max(offset, head.size)
+
+        with open(journal_file, "rb") as f:
+            # 偏移超出文件长度说明分段已轮换而偏移尚未归零
+            if (size := os.fstat(f.fileno()).st_size) < offset:
+                offset = head.size
+            if size <= offset:
+                return records, ends
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as buffer:
+                magic, version = head.unpack_from(buffer, 0)
+                if magic != const.JOURNAL_MAGIC or version != const.JOURNAL_VERSION:
+                    logger.warning(f"Unknown journal format: {journal_file}")
+                    return records, ends
+
+                while offset + frame.size <= size:
+                    length, crc = frame.unpack_from(buffer, offset)
+                    if (end := offset + frame.size + length) > size:
+                        break
+                    if zlib.crc32(body := buffer[offset + frame.size:end]) != crc:
+                        logger.warning(f"Journal checksum mismatch at {offset}: {journal_file}")
+                        break
+                    records.append(json.loads(body))
+                    ends.append(offset := end)
+
+        return records, ends
+
+    @staticmethod
+    async def state_table(db: "aiosqlite.Connection") -> typing.Any:
+        """
+        创建日志加载进度表，记录每个任务已写入数据库的偏移与样本数。
+        """
+        await db.execute(f'''CREATE TABLE IF NOT EXISTS {const.JOURNAL_TABLE} (
+            data_dir TEXT PRIMARY KEY,
+            offset INTEGER,
+            loaded INTEGER,
+            stopped INTEGER)''')
+        return await db.commit()
+
+    @staticmethod
+    async def load(db: "aiosqlite.Connection", journal_file: typing.Union[str, "Path"]) -> int:
+        """
+        将日志中尚未加载的记录批量写入数据库，数据与加载进度在同一事务中提交。
+
+        每条记录的各表写入包在一个 SAVEPOINT 中：记录格式有误时回滚该记录已写入的部分并跳过；
+        数据库错误时回滚该记录并停止本批，进度只推进到最后一条完整写入的记录之后，下次加载从该记录重试。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        journal_file : str or Path
+            日志文件路径。
+
+        Returns
+        -------
+        int
+            本次写入的记录数。
+        """
+        data_dir = Path(journal_file).stem
+
+        async with db.execute(
+            f"SELECT offset FROM {const.JOURNAL_TABLE} WHERE data_dir = ?", (data_dir,)
+        ) as cursor:
+            offset = row[0] if (row := await cursor.fetchone()) else 0
+
+        records, ends = await asyncio.to_thread(Journal.scan, journal_file, offset)
+        if not records:
+            return 0
+
+        # 显式开启外层事务，记录级 SAVEPOINT 释放时不会单独提交
+        if not db.in_transaction:
+            await db.execute("BEGIN")
+
+        loaded, stopped = 0, None
+        for record, end in zip(records, ends):
+            await db.execute("SAVEPOINT record")
+            try:
+                if record["mem"]:
+                    await Cubicle.insert_mem(db, data_dir, record["l"], record["mem"], commit=False)
+                if record["io"]:
+                    await Cubicle.insert_io(db, data_dir, record["l"], record["t"], record["io"], commit=False)
+                if cadence := record.get("c"):
+                    tick, scheduled, *interval = cadence
+                    await Cubicle.insert_cadence(db, data_dir, tick, scheduled, record["t"], *interval, commit=False)
+                if smaps := record.get("s"):
+                    await Cubicle.insert_smaps(db, data_dir, record["t"], smaps, commit=False)
+                if host := record.get("h"):
+                    await Cubicle.insert_host(db, data_dir, record["t"], host, commit=False)
+                if ticks := record.get("k"):
+                    await Cubicle.insert_tick_stats(db, data_dir, record["t"], ticks, commit=False)
+                if procs := record.get("p"):
+                    await Cubicle.insert_procs(db, data_dir, record["t"], procs, commit=False)
+                if heap := record.get("w"):
+                    await Cubicle.insert_heap_dump(db, data_dir, heap, commit=False)
+                if maps := record.get("m"):
+                    await Cubicle.insert_maps(db, data_dir, record["t"], maps, commit=False)
+                if events := record.get("e"):
+                    await Cubicle.insert_events(db, data_dir, events, commit=False)
+                if hprof := record.get("x"):
+                    await Cubicle.insert_hprof(db, data_dir, hprof, commit=False)
+                if overhead := record.get("o"):
+                    await Cubicle.insert_overhead(db, data_dir, overhead, commit=False)
+            except (TypeError, KeyError, ValueError) as e:
+                logger.info(f"Journal skipped: {e}")
+                if not await Journal.revert(db):
+                    await db.rollback()
+                    return 0
+            except aiosqlite.Error as e:
+                logger.warning(f"Journal load stopped at {offset}, retry later: {e}")
+                # 外层事务已被数据库终止时，本批全部未写入，进度保持不变
+                if not await Journal.revert(db):
+                    await db.rollback()
+                    return 0
+                await db.execute("RELEASE record")
+                break
+            await db.execute("RELEASE record")
+            offset, loaded, stopped = end, loaded + 1, record.get("t", stopped)
+
+        if not loaded:
+            await db.rollback()
+            return 0
+
+        await db.execute(f'''INSERT INTO {const.JOURNAL_TABLE} (data_dir, offset, loaded, stopped)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (data_dir) DO UPDATE SET
+            offset = excluded.offset,
+            loaded = loaded + excluded.loaded,
+            stopped = excluded.stopped''', (data_dir, offset, loaded, stopped)
+        )
+        await db.commit()
+        return loaded
+
+    @staticmethod
+    async def revert(db: "aiosqlite.Connection") -> bool:
+        """
+        回滚到当前记录的 SAVEPOINT，并清空连接的字符串字典缓存（缓存可能指向已撤销的行）；外层事务已不存在时返回 False。
+        """
+        Cubicle.forget(db)
+        try:
+            await db.execute("ROLLBACK TO record")
+        except aiosqlite.Error:
+            return False
+        return True
+
+    async def loader(self, db: "aiosqlite.Connection", close_event: "asyncio.Event", interval: float = 1.0) -> int:
+        """
+        后台加载器：周期性落盘并批量写入数据库（按需轮换分段），关闭事件触发后完成最后一次加载并删除日志文件。
+
+        最后一次加载在持有文件锁时进行，数据库错误导致未能读完时按间隔重试有限次；仍未读完则保留日志与加载进度，
+        由下次 `replay` 从中断处继续，已确认的样本不会随日志一起删除。
+
+        Returns
+        -------
+        int
+            累计写入的记录数。
+        """
+        await Journal.state_table(db)
+
+        total = 0
+        while not close_event.is_set():
+            try:
+                await asyncio.wait_for(close_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.to_thread(self.sync)
+            total += await Journal.load(db, self.journal_file)
+            await self.roll(db)
+
+        await asyncio.to_thread(self.sync)
+        for attempt in range(Journal.retries):
+            total += await Journal.load(db, self.journal_file)
+            if drained := await Journal.drained(db, self.journal_file):
+                break
+            await asyncio.sleep(interval * (attempt + 1))
+
+        self.close()
+        if drained:
+            await Journal.finish(db, self.journal_file)
+            logger.info(f"Journal loaded {total} records -> {self.data_dir}")
+        else:
+            logger.warning(f"Journal loaded {total} records, remainder kept for replay -> {self.journal_file}")
+        return total
+
+    @staticmethod
+    async def drained(db: "aiosqlite.Connection", journal_file: typing.Union[str, "Path"]) -> bool:
+        """
+        加载进度之后是否已没有完整记录；末尾被截断或校验失败的半条记录不计，写入方崩溃时不会使日志永远保留。
+        """
+        async with db.execute(
+            f"SELECT offset FROM {const.JOURNAL_TABLE} WHERE data_dir = ?", (Path(journal_file).stem,)
+        ) as cursor:
+            offset = row[0] if (row := await cursor.fetchone()) else 0
+
+        records, _ = await asyncio.to_thread(Journal.scan, journal_file, offset)
+        return not records
+
+    @staticmethod
+    async def finish(db: "aiosqlite.Connection", journal_file: typing.Union[str, "Path"]) -> typing.Any:
+        """
+        日志全部写入后删除日志文件与加载进度。
+        """
+        Path(journal_file).unlink(missing_ok=True)
+        await db.execute(f"DELETE FROM {const.JOURNAL_TABLE} WHERE data_dir = ?", (Path(journal_file).stem,))
+        return await db.commit()
+
+    @staticmethod
+    async def replay(db: "aiosqlite.Connection", journal_dir: typing.Union[str, "Path"]) -> dict[str, tuple]:
+        """
+        重放目录下属于当前数据库的遗留日志（上次运行异常退出时未完成加载），全部读完后删除日志文件。
+
+        Parameters
+        ----------
+        db : aiosqlite.Connection
+            异步数据库连接。
+
+        journal_dir : str or Path
+            日志所在目录（分组报告目录）。
+
+        Returns
+        -------
+        dict
+            data_dir -> (累计样本数, 最后一条记录的时间戳)，供目录登记补写结束信息。
+        """
+        if not (journals := sorted(Path(journal_dir).glob(f"*{const.JOURNAL_SUFFIX}"))):
+            return {}
+
+        # 同一分组下可能有多个设备分片，只重放登记在当前分片中的任务
+        async with db.execute(f"SELECT data_dir FROM {const.JOINT_DATA_TABLE}") as cursor:
+            owned = {row[0] for row in await cursor.fetchall()}
+        if not (journals := [j for j in journals if j.stem in owned]):
+            return {}
+
+        await Journal.state_table(db)
+
+        replayed = {}
+        for journal_file in journals:
+            # 其他进程或设备仍在写入的日志不是遗留日志，由其自身的加载器入库
+            if Journal.held(journal_file):
+                logger.info(f"Journal in use, replay skipped -> {journal_file.stem}")
+                continue
+            count = await Journal.load(db, journal_file)
+            async with db.execute(
+                f"SELECT loaded, stopped FROM {const.JOURNAL_TABLE} WHERE data_dir = ?", (journal_file.stem,)
+            ) as cursor:
+                if row := await cursor.fetchone():
+                    replayed[journal_file.stem] = tuple(row)
+            # 本次未能读完的日志连同加载进度一起保留，下次重放从中断处继续
+            if not await Journal.drained(db, journal_file):
+                logger.warning(f"Journal replayed {count} records, remainder kept -> {journal_file.stem}")
+                continue
+            await Journal.finish(db, journal_file)
+            logger.info(f"Journal replayed {count} records -> {journal_file.stem}")
+
+        return replayed
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,219 @@
+#  ____            _
+# |  _ \ __ _  ___| | _____ _ __
+# | |_) / _` |/ __| |/ / _ \ '__|
+# |  __/ (_| | (__|   <  __/ |
+# |_|   \__,_|\___|_|\_\___|_|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import struct
+import typing
+import numpy as np
+from memnova import const
+
+
+class Packer(object):
+    """
+    列式二进制编解码器，将记录列表压缩为按字段连续存储的小端数组块。
+
+    数据块布局（全部小端）：
+
+    - 头部：`<4sHHI` -> MAGIC、版本号、列数、行数。
+    - 列头：`<HBBI` -> 列名长度、列类型、列标志、负载长度，随后为 UTF-8 列名并按 8 字节对齐。
+    - 负载：数值列为连续数组；字符串列为字典表（词条数、偏移表、UTF-8 正文）加 `int32` 编码数组。
+
+    解码时数值列通过 `numpy.frombuffer` 直接引用原始缓冲区，不产生拷贝。
+    """
+
+    KIND_F8, KIND_I8, KIND_B1, KIND_STR = 0, 1, 2, 3
+
+    FLAG_NULLABLE = 0x01
+
+    __head = struct.Struct("<4sHHI")
+    __column = struct.Struct("<HBBI")
+
+    __dtypes = {
+        KIND_F8: np.dtype("<f8"), KIND_I8: np.dtype("<i8"), KIND_B1: np.dtype("|b1")
+    }
+
+    @staticmethod
+    def __align(size: int) -> int:
+        return (8 - size % 8) % 8
+
+    @staticmethod
+    def __classify(values: list) -> tuple[int, int]:
+        """
+        推断单列的存储类型与可空标志。
+        """
+        nullable = Packer.FLAG_NULLABLE if any(v is None for v in values) else 0
+        present = [v for v in values if v is not None]
+
+        if present and all(isinstance(v, str) for v in present):
+            return Packer.KIND_STR, nullable
+        if present and all(isinstance(v, bool) for v in present) and not nullable:
+            return Packer.KIND_B1, 0
+        if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present) and not nullable:
+            return Packer.KIND_I8, 0
+        return Packer.KIND_F8, nullable
+
+    @staticmethod
+    def __encode(values: list, kind: int) -> bytes:
+        """
+        将单列数据编码为负载字节。
+        """
+        if kind != Packer.KIND_STR:
+            if kind == Packer.KIND_F8:
+                values = [np.nan if v is None else v for v in values]
+            return np.asarray(values, dtype=Packer.__dtypes[kind]).tobytes()
+
+        # ==== 字符串驻留 ====
+        vocab, codes = {}, []
+        for v in values:
+            codes.append(-1 if v is None else vocab.setdefault(v, len(vocab)))
+
+        words = [w.encode(const.CHARSET) for w in vocab]
+        offsets = np.cumsum([0] + [len(w) for w in words], dtype="<u4")
+        text = b"".join(words)
+        text += b"\x00" * Packer.__align(4 + offsets.nbytes + len(text))
+
+        return b"".join([
+            struct.pack("<I", len(words)), offsets.tobytes(), text, np.asarray(codes, dtype="<i4").tobytes()
+        ])
+
+    @staticmethod
+    def is_packed(value: typing.Any) -> bool:
+        """
+        判断字段值是否为列式二进制数据块。
+        """
+        return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:4]) == const.PACK_MAGIC
+
+    @staticmethod
+    def pack(records: list[dict]) -> bytes:
+        """
+        将记录列表编码为列式二进制数据块。
+
+        Parameters
+        ----------
+        records : list of dict
+            字段结构一致的记录列表，字段值支持 bool、int、float、str 与 None。
+
+        Returns
+        -------
+        bytes
+            可直接写入 BLOB 字段的数据块。
+        """
+        names = list(dict.fromkeys(k for r in records for k in r))
+
+        chunks = [Packer.__head.pack(const.PACK_MAGIC, const.PACK_VERSION, len(names), len(records))]
+        for name in names:
+            values = [r.get(name) for r in records]
+            kind, flags = Packer.__classify(values)
+            payload, label = Packer.__encode(values, kind), name.encode(const.CHARSET)
+            payload += b"\x00" * Packer.__align(len(payload))
+            chunks += [
+                Packer.__column.pack(len(label), kind, flags, len(payload)),
+                label + b"\x00" * Packer.__align(Packer.__column.size + len(label)),
+                payload
+            ]
+
+        return b"".join(chunks)
+
+    @staticmethod
+    def unpack(blob: typing.Union[bytes, memoryview]) -> dict[str, "np.ndarray"]:
+        """
+        将列式二进制数据块解码为列字典。
+
+        Parameters
+        ----------
+        blob : bytes or memoryview
+            由 `pack` 生成的数据块。
+
+        Returns
+        -------
+        dict of str to numpy.ndarray
+            数值列为只读的零拷贝视图；字符串列为 object 数组，可空位置为 None；
+            可空浮点列以 NaN 表示缺失值。
+        """
+        magic, _, n_cols, n_rows = Packer.__head.unpack_from(blob, 0)
+        if magic != const.PACK_MAGIC:
+            raise ValueError(f"Unexpected pack magic: {magic!r}")
+
+        columns, offset = {}, Packer.__head.size
+        for _ in range(n_cols):
+            size, kind, flags, length = Packer.__column.unpack_from(blob, offset)
+            offset += Packer.__column.size
+            name = bytes(blob[offset:offset + size]).decode(const.CHARSET)
+            offset += size + Packer.__align(Packer.__column.size + size)
+
+            if kind == Packer.KIND_STR:
+                (n_words,) = struct.unpack_from("<I", blob, offset)
+                bounds = np.frombuffer(blob, dtype="<u4", count=n_words + 1, offset=offset + 4)
+                start = offset + 4 + bounds.nbytes
+                text = bytes(blob[start:start + int(bounds[-1])])
+                vocab = np.array(
+                    [text[a:b].decode(const.CHARSET) for a, b in zip(bounds[:-1], bounds[1:])] + [None],
+                    dtype=object
+                )
+                start += int(bounds[-1]) + Packer.__align(4 + bounds.nbytes + int(bounds[-1]))
+                codes = np.frombuffer(blob, dtype="<i4", count=n_rows, offset=start)
+                columns[name] = vocab[codes]
+            else:
+                columns[name] = np.frombuffer(blob, dtype=Packer.__dtypes[kind], count=n_rows, offset=offset)
+
+            offset += length
+
+        return columns
+
+    @staticmethod
+    def from_records(records: list[dict]) -> dict[str, "np.ndarray"]:
+        """
+        将记录列表转换为与 `unpack` 输出一致的列字典，用于兼容旧版 JSON 数据。
+        """
+        return Packer.unpack(Packer.pack(records)) if records else {}
+
+    @staticmethod
+    def concat(parts: list[dict[str, "np.ndarray"]]) -> dict[str, "np.ndarray"]:
+        """
+        纵向拼接多个列字典，忽略空块。
+
+        某些块缺少的列按类型补齐：字符串列补 None，数值列补 NaN（整型列随之提升为浮点），
+        `to_records` 会将其还原为 None。
+        """
+        if not (parts := [p for p in parts if p and len(next(iter(p.values())))]):
+            return {}
+
+        names, columns = list(dict.fromkeys(k for p in parts for k in p)), {}
+        for k in names:
+            present = [p[k] for p in parts if k in p]
+            if len(present) == len(parts):
+                columns[k] = np.concatenate(present)
+                continue
+            kind = np.result_type(*present)
+            dtype, fill = (object, None) if kind == object else (np.result_type(kind, np.float64), np.nan)
+            columns[k] = np.concatenate(
+                [p[k] if k in p else np.full(len(next(iter(p.values()))), fill, dtype=dtype) for p in parts]
+            ).astype(dtype, copy=False)
+        return columns
+
+    @staticmethod
+    def to_records(columns: dict[str, "np.ndarray"]) -> list[dict]:
+        """
+        将列字典还原为记录列表，可空浮点列中的 NaN 还原为 None。
+        """
+        if not columns:
+            return []
+
+        names, values = list(columns), []
+        for column in columns.values():
+            items = column.tolist()
+            if column.dtype.kind == "f" and np.isnan(column).any():
+                items = [None if v != v else v for v in items]
+            values.append(items)
+
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+
+if __name__ == '__main__':
+    pass
@@ -28,6 +28,11 @@ class Parser(object):
         \033[1;35m{const.APP_NAME}\033[0m --storm --focus <com.example.app> --imply <device.serial>
         \033[1;35m{const.APP_NAME}\033[0m --sleek --focus <com.example.app> --imply <device.serial>
         \033[1;35m{const.APP_NAME}\033[0m --forge <file.name>
+        \033[1;35m{const.APP_NAME}\033[0m --index [keyword] --focus <com.example.app> --imply <device.serial>
+        \033[1;35m{const.APP_NAME}\033[0m --export <file.name> [--arrow]
+        \033[1;35m{const.APP_NAME}\033[0m --ingest <export.dir> --scene <file.name>
+        \033[1;35m{const.APP_NAME}\033[0m --shrink [--dry]
+        \033[1;35m{const.APP_NAME}\033[0m --replay <file.name>
         \033[1;35m{const.APP_NAME}\033[0m --align
         """
         self.__parse_engine = argparse.ArgumentParser(
@@ -82,6 +87,59 @@ class Parser(object):
 
             ''')
         )
+        major_group.add_argument(
+            "--index", nargs="?", const="", type=str,
+            help=textwrap.dedent(f'''\
+                \033[1;34m^*星轨索引*^\033[0m
+                -------------------------
+                - 检索全局目录中的历史任务，按开始时间倒序列出。
+                - 可选关键字模糊匹配任务、分组、应用、标签、标题、机型与序列号。
+                - 可与 --focus / --imply / --scene 组合，精确筛选应用、设备与场景。
+
+            ''')
+        )
+        major_group.add_argument(
+            "--export",
+            type=lambda x: re.sub(r"[^a-zA-Z0-9_\-.\u4e00-\u9fff]", "", x),
+            help=textwrap.dedent(f'''\
+                \033[1;34m^*星尘封存*^\033[0m
+                -------------------------
+                - 将分组或单个任务导出为按表与任务分区的列式文件（默认 Parquet）。
+                - 导出目录可直接被 pyarrow / pandas / DuckDB 读取，也可通过 --ingest 重新导入。
+
+            ''')
+        )
+        major_group.add_argument(
+            "--ingest", type=str,
+            help=textwrap.dedent(f'''\
+                \033[1;34m^*星尘归航*^\033[0m
+                -------------------------
+                - 将 --export 导出的目录重新导入为分组，并重建聚合表与全局目录登记。
+                - 可与 --scene 组合，指定导入后的分组名称。
+
+            ''')
+        )
+        major_group.add_argument(
+            "--shrink", action="store_true",
+            help=textwrap.dedent(f'''\
+                \033[1;34m^*星核坍缩*^\033[0m
+                -------------------------
+                - 按 retain 策略压缩历史任务：近期任务保留全分辨率，过期任务降采样并丢弃原始帧。
+                - 追踪目录按策略压缩或删除，数据库增量回收空间。
+                - 可与 --dry 组合，仅统计可回收空间而不做任何修改。
+
+            ''')
+        )
+        major_group.add_argument(
+            "--replay", type=str,
+            help=textwrap.dedent(f'''\
+                \033[1;34m^*星痕回溯*^\033[0m
+                -------------------------
+                - 将任务的原始采集存档逐轮解压，并重新送入解析器，用于排查解析问题。
+                - 参数可以是任务目录名，也可以是存档文件路径（.mxz）。
+
+            ''')
+        )
         major_group.add_argument(
             "--align", action="store_true",
             help=textwrap.dedent(f'''\
@@ -169,6 +227,24 @@ class Parser(object):
 
             ''')
         )
+        minor_group.add_argument(
+            "--dry", action="store_true",
+            help=textwrap.dedent(f'''\
+                \033[1;36m^*虚空推演*^\033[0m
+                -------------------------
+                - 配合 --shrink 使用，试运行压缩流程并报告可回收空间。
+
+            ''')
+        )
+        minor_group.add_argument(
+            "--arrow", action="store_true",
+            help=textwrap.dedent(f'''\
+                \033[1;36m^*光谱切片*^\033[0m
+                -------------------------
+                - 配合 --export 使用，输出 Arrow IPC 文件代替 Parquet，适合内存映射读取。
+
+            ''')
+        )
 
         # Workflow: ======================== 参数兼容 ========================
 
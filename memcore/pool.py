@@ -0,0 +1,109 @@
+#  ____             _
+# |  _ \ ___   ___ | |
+# | |_) / _ \ / _ \| |
+# |  __/ (_) | (_) | |
+# |_|   \___/ \___/|_|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import typing
+import asyncio
+import aiosqlite
+import contextlib
+from pathlib import Path
+from engine.tinker import MemrixError
+from memcore.cubicle import Cubicle
+
+
+class Pool(object):
+    """
+    只读 SQLite 连接池，用于报告阶段的并行查询。
+
+    每个连接均以 `mode=ro&cache=private` 打开，互不共享页缓存，也不会修改数据库；
+    连接在各自的 aiosqlite 线程上执行，多个任务的查询可以真正并行，而不是排队在单一连接上。
+
+    传入多个分片文件时，每个连接以内存库为主库 ATTACH 全部分片，并通过 `Cubicle.federate`
+    建立同名联合视图，查询语句无需感知分片；按 data_dir 过滤的条件会下推到各分片的索引。
+
+    Parameters
+    ----------
+    db_file : str or list of str
+        数据库文件路径，或同一分组下的分片文件列表。
+
+    size : int
+        连接数量，通常与进程池大小一致。
+    """
+
+    # SQLite 默认允许 ATTACH 的数据库数量
+    attach_limit: int = 10
+
+    def __init__(self, db_file: typing.Union[str, list[str]], size: int):
+        self.db_files = [db_file] if isinstance(db_file, str) else list(db_file)
+        self.size = max(size, 1)
+        self.__idle: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self.__conns: list["aiosqlite.Connection"] = []
+
+    @staticmethod
+    def readonly(db_file: str) -> str:
+        return f"{Path(db_file).resolve().as_uri()}?mode=ro&cache=private"
+
+    async def connect(self) -> "aiosqlite.Connection":
+        """
+        打开一个只读连接；多分片时 ATTACH 全部分片并建立联合视图。
+        """
+        if len(self.db_files) == 1:
+            return await aiosqlite.connect(Pool.readonly(self.db_files[0]), uri=True)
+
+        conn = await aiosqlite.connect("file::memory:?cache=private", uri=True)
+        try:
+            schemas = []
+            for index, db_file in enumerate(self.db_files):
+                await conn.execute(f"ATTACH DATABASE ? AS shard_{index}", (Pool.readonly(db_file),))
+                schemas.append(f"shard_{index}")
+            await Cubicle.federate(conn, schemas)
+        except Exception:
+            await conn.close()
+            raise
+        return conn
+
+    async def __aenter__(self) -> "Pool":
+        if not self.db_files:
+            raise MemrixError(f"No database shards to open ...")
+        if len(self.db_files) > Pool.attach_limit:
+            raise MemrixError(f"Too many shards to federate: {len(self.db_files)} > {Pool.attach_limit}")
+
+        try:
+            for _ in range(self.size):
+                self.__conns.append(conn := await self.connect())
+                self.__idle.put_nowait(conn)
+        except Exception:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        关闭全部连接。
+        """
+        await asyncio.gather(*(conn.close() for conn in self.__conns), return_exceptions=True)
+        self.__conns.clear()
+
+    @contextlib.asynccontextmanager
+    async def lease(self) -> typing.AsyncIterator["aiosqlite.Connection"]:
+        """
+        借出一个空闲连接，退出上下文后自动归还；无空闲连接时等待。
+        """
+        conn = await self.__idle.get()
+        try:
+            yield conn
+        finally:
+            self.__idle.put_nowait(conn)
+
+
+if __name__ == '__main__':
+    pass
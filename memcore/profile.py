@@ -13,6 +13,7 @@ import yaml
 import typing
 from engine.tinker import FileAssist
 from memcore.parser import Parser
+from memnova import const
 
 
 class Align(object):
@@ -23,6 +24,10 @@ class Align(object):
             "app_label": "应用名称",
             "mem_speed": 0.5,
             "gfx_speed": 30.0,
+            "mem_format": "checkin",
+            "mem_adaptive": False,
+            "mem_speed_min": 0.5,
+            "mem_speed_max": 5.0,
         },
         "mem": {
             "base": {
@@ -180,6 +185,40 @@ class Align(object):
                     }
                 ]
             }
+        },
+        "lanes": {
+            "io": 0.0,
+            "smaps": 0.0,
+            "maps": 0.0
+        },
+        "retain": {
+            "keep_days": 30,
+            "span": 60000,
+            "drop_frames": True,
+            "traces": "compress"
+        },
+        "soak": {
+            "enabled": False,
+            "monitor": 30.0,
+            "rotate_mb": 64,
+            "keep_logs": 8
+        },
+        "observer": {
+            "enabled": False,
+            "budget": 0.0
+        },
+        "warden": {
+            "enabled": False,
+            "window": 300.0,
+            "slope": 1.0,
+            "r2": 0.8,
+            "sustain": 120.0,
+            "cooldown": 1800.0,
+            "dumps": 3
+        },
+        "events": {
+            "enabled": False,
+            "flush": 2.0
         }
     }
 
@@ -204,6 +243,95 @@ class Align(object):
     def gfx_speed(self):
         return self.aligns["common"]["gfx_speed"]
 
+    @property
+    def mem_format(self):
+        return self.aligns["common"]["mem_format"]
+
+    @property
+    def mem_adaptive(self):
+        return self.aligns["common"]["mem_adaptive"]
+
+    @property
+    def mem_speed_min(self):
+        return self.aligns["common"]["mem_speed_min"]
+
+    @property
+    def mem_speed_max(self):
+        return self.aligns["common"]["mem_speed_max"]
+
+    @property
+    def lanes(self) -> dict:
+        lanes = self.aligns.get("lanes", {}) or {}
+        # 完整 smaps 需要遍历目标进程全部映射，周期下限放宽到 1 秒
+        return {
+            lane: min(60.0, max(period, 1.0 if lane == "maps" else 0.05))
+            for lane in ("io", "smaps", "maps") if (period := Parser.parse_decimal(lanes.get(lane, 0))) > 0
+        }
+
+    @property
+    def retain(self) -> dict:
+        retain = self.aligns.get("retain", {}) or {}
+        span = int(Parser.parse_decimal(retain.get("span", const.ROLLUP_SPANS[1])))
+        traces = str(retain.get("traces", "compress")).strip().lower()
+        # 无法解析的保留天数回退为默认值，避免归零后把全部任务判为过期
+        try:
+            keep_days = max(float(retain.get("keep_days", 30)), 0.0)
+        except (TypeError, ValueError):
+            keep_days = 30.0
+        # 聚合粒度对齐到不小于配置值的可用粒度
+        return {
+            "keep_days": keep_days,
+            "span": next((s for s in const.ROLLUP_SPANS if s >= span), const.ROLLUP_SPANS[-1]),
+            "drop_frames": self.flag(retain.get("drop_frames", True)),
+            "traces": traces if traces in ("compress", "delete", "keep") else "compress"
+        }
+
+    @property
+    def soak(self) -> dict:
+        soak = self.aligns.get("soak", {}) or {}
+        return {
+            "enabled": self.flag(soak.get("enabled", False)),
+            "monitor": min(600.0, max(Parser.parse_decimal(soak.get("monitor", 30.0)), 5.0)),
+            "rotate_mb": min(1024, max(int(Parser.parse_decimal(soak.get("rotate_mb", 64))), 8)),
+            "keep_logs": max(int(Parser.parse_decimal(soak.get("keep_logs", 8))), 1)
+        }
+
+    @property
+    def observer(self) -> dict:
+        observer = self.aligns.get("observer", {}) or {}
+        return {
+            "enabled": self.flag(observer.get("enabled", False)),
+            "budget": min(50.0, max(Parser.parse_decimal(observer.get("budget", 0.0)), 0.0))
+        }
+
+    @property
+    def warden(self) -> dict:
+        warden = self.aligns.get("warden", {}) or {}
+        return {
+            "enabled": self.flag(warden.get("enabled", False)),
+            "window": min(3600.0, max(Parser.parse_decimal(warden.get("window", 300.0)), 30.0)),
+            "slope": max(Parser.parse_decimal(warden.get("slope", 1.0)), 0.01),
+            "r2": min(1.0, max(Parser.parse_decimal(warden.get("r2", 0.8)), 0.0)),
+            "sustain": min(3600.0, max(Parser.parse_decimal(warden.get("sustain", 120.0)), 0.0)),
+            "cooldown": max(Parser.parse_decimal(warden.get("cooldown", 1800.0)), 60.0),
+            "dumps": min(20, max(int(Parser.parse_decimal(warden.get("dumps", 3))), 1))
+        }
+
+    @property
+    def events(self) -> dict:
+        events = self.aligns.get("events", {}) or {}
+        return {
+            "enabled": self.flag(events.get("enabled", False)),
+            "flush": min(30.0, max(Parser.parse_decimal(events.get("flush", 2.0)), 0.5))
+        }
+
+    @staticmethod
+    def flag(value: typing.Any) -> bool:
+        """
+        将配置中的开关值转换为布尔值，字符串 true / yes / on / 1 视为开启。
+        """
+        return value if isinstance(value, bool) else str(value).strip().lower() in ("true", "yes", "on", "1")
+
     # ✅ ==== headline 字符 ====
     def get_headline(self, section: str, subfield: str = None) -> str:
         primary_key = "headline"
@@ -250,6 +378,25 @@ class Align(object):
         limit = min(60.0, max(Parser.parse_decimal(value), 5.0))
         self.aligns["common"]["gfx_speed"] = limit
 
+    @mem_format.setter
+    def mem_format(self, value: typing.Any):
+        fmt = str(value).strip().lower()
+        self.aligns["common"]["mem_format"] = fmt if fmt in ("checkin", "text") else "checkin"
+
+    @mem_adaptive.setter
+    def mem_adaptive(self, value: typing.Any):
+        self.aligns["common"]["mem_adaptive"] = self.flag(value)
+
+    @mem_speed_min.setter
+    def mem_speed_min(self, value: typing.Any):
+        limit = min(10.0, max(Parser.parse_decimal(value), 0.1))
+        self.aligns["common"]["mem_speed_min"] = limit
+
+    @mem_speed_max.setter
+    def mem_speed_max(self, value: typing.Any):
+        limit = min(60.0, max(Parser.parse_decimal(value), 0.1))
+        self.aligns["common"]["mem_speed_max"] = limit
+
     async def load_align(self) -> None:
         try:
             user_align = await FileAssist.read_yaml(self.align_file)
@@ -257,6 +404,10 @@ class Align(object):
             self.app_label = user_align.get("common", {}).get("app_label", self.app_label)
             self.mem_speed = user_align.get("common", {}).get("mem_speed", self.mem_speed)
             self.gfx_speed = user_align.get("common", {}).get("gfx_speed", self.gfx_speed)
+            self.mem_format = user_align.get("common", {}).get("mem_format", self.mem_format)
+            self.mem_adaptive = user_align.get("common", {}).get("mem_adaptive", self.mem_adaptive)
+            self.mem_speed_min = user_align.get("common", {}).get("mem_speed_min", self.mem_speed_min)
+            self.mem_speed_max = user_align.get("common", {}).get("mem_speed_max", self.mem_speed_max)
 
             for section in list(self.aligns.keys())[1:]:
                 if section in user_align:
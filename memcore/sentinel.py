@@ -0,0 +1,260 @@
+#  ____             _   _            _
+# / ___|  ___ _ __ | |_(_)_ __   ___| |
+# \___ \ / _ \ '_ \| __| | '_ \ / _ \ |
+#  ___) |  __/ | | | |_| | | | |  __/ |
+# |____/ \___|_| |_|\__|_|_| |_|\___|_|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import os
+import sys
+import typing
+import asyncio
+from memnova.dissect import Dissect
+
+
+class Sentinel(object):
+    """
+    宿主进程自监控，长时间浸泡采样时周期记录 Memrix 自身的常驻内存与事件循环任务数。
+
+    统计量均为增量累加（首末值、峰值与最小二乘增长斜率），内存占用恒定；
+    斜率以 MB/h 表示，浸泡任务结束时接近 0 说明宿主内存平稳，没有随运行时长累积。
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.rss_first: typing.Optional[float] = None
+        self.rss_last, self.rss_peak, self.tasks_last, self.tasks_peak = 0.0, 0.0, 0, 0
+        # 最小二乘累加量：Σt, Σr, Σt², Σtr（t 为自首个样本起的小时数）
+        self.origin: typing.Optional[int] = None
+        self.sum_t, self.sum_r, self.sum_tt, self.sum_tr = 0.0, 0.0, 0.0, 0.0
+
+    @staticmethod
+    def rss() -> float:
+        """
+        读取当前进程的常驻内存（MB）；macOS 无法读取当前值，退化为峰值。
+        """
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm", "rb") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1048576
+
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)
+                ]
+
+            counters = Counters(cb=ctypes.sizeof(Counters))
+            ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+            )
+            return counters.WorkingSetSize / 1048576
+
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1048576
+
+    def sample(self, timestamp: int) -> dict:
+        """
+        采集一次宿主进程状态并累加统计量，须在事件循环中调用。
+
+        Parameters
+        ----------
+        timestamp : int
+            采样时间（Unix 毫秒时间戳）。
+
+        Returns
+        -------
+        dict
+            {"rss": 常驻内存 MB, "tasks": 事件循环中未完成的任务数}，即 `Cubicle.insert_host` 的负载。
+        """
+        rss, tasks = round(self.rss(), 2), len(asyncio.all_tasks())
+
+        self.origin = timestamp if self.origin is None else self.origin
+        t = (timestamp - self.origin) / 3_600_000
+        self.samples += 1
+        self.sum_t += t
+        self.sum_r += rss
+        self.sum_tt += t * t
+        self.sum_tr += t * rss
+
+        self.rss_first = rss if self.rss_first is None else self.rss_first
+        self.rss_last, self.rss_peak = rss, max(self.rss_peak, rss)
+        self.tasks_last, self.tasks_peak = tasks, max(self.tasks_peak, tasks)
+        return {"rss": rss, "tasks": tasks}
+
+    def summary(self) -> dict:
+        """
+        汇总宿主进程的内存与任务数统计。
+
+        Returns
+        -------
+        dict
+            - samples    : 样本数。
+            - rss_first  : 首个样本的常驻内存（MB）。
+            - rss_last   : 最后一个样本的常驻内存（MB）。
+            - rss_peak   : 常驻内存峰值（MB）。
+            - rss_slope  : 常驻内存的最小二乘增长斜率（MB/h）。
+            - tasks_last : 最后一个样本的任务数。
+            - tasks_peak : 任务数峰值。
+        """
+        n = self.samples
+        denominator = n * self.sum_tt - self.sum_t * self.sum_t
+        return {
+            "samples": n,
+            "rss_first": self.rss_first or 0.0,
+            "rss_last": self.rss_last,
+            "rss_peak": self.rss_peak,
+            "rss_slope": round((n * self.sum_tr - self.sum_t * self.sum_r) / denominator, 3) if denominator > 0 else 0.0,
+            "tasks_last": self.tasks_last,
+            "tasks_peak": self.tasks_peak
+        }
+
+
+class Overhead(object):
+    """
+    观测开销计量，统计采集本身在设备端消耗的 CPU 时间并按采集通道汇总。
+
+    每次探测命令前后各取一次 CPU 快照（见 `Device.meter`），同一次 shell 调用内完成，不增加 adb 往返：
+
+    - shell 自身（含 dumpsys、cat 等已回收子进程）的耗时全部计入采集开销；
+    - system_server、adbd 与目标进程的耗时扣除基线后计入，基线为同一通道相邻两次探测间隙内的 EWMA 占用率；
+      各 pid 以已计入的最高 jiffies 为水位，并发探测的重叠区间不会重复计入。
+
+    开销百分比为计入的 CPU 时间占通道运行期间设备全部 CPU 容量（/proc/stat 汇总行）的比例；
+    近期占比以 EWMA 跟踪，超过预算时由采样循环拉长该通道周期。
+    """
+
+    roles = ("shell", "system_server", "adbd", "target")
+
+    def __init__(self, observers: dict[str, str], budget: float = 0.0, hz: int = 100, alpha: float = 0.2):
+        self.observers, self.budget, self.hz, self.alpha = observers, budget, hz, alpha
+        self.lanes: dict[str, dict] = {}
+        self.__baseline: dict[str, float] = {}
+        self.__marks: dict[str, int] = {}
+
+    def settle(self, lane: str, raw: bytes) -> bytes:
+        """
+        剥离原始输出中的 CPU 快照并计入对应通道，返回原命令的输出。
+
+        Parameters
+        ----------
+        lane : str
+            采集通道名称（mem、io、smaps）。
+
+        raw : bytes
+            `Device.meter` 包围的原始字节输出。
+
+        Returns
+        -------
+        bytes
+            去除快照段后的原始输出。
+        """
+        payload, snapshots = Dissect.bracket(raw)
+        if len(snapshots) == 2:
+            self.measure(lane, *snapshots)
+        return payload
+
+    def measure(self, lane: str, before: dict, after: dict) -> None:
+        """
+        计入一次探测前后快照之间的开销。
+        """
+        if (span := after["total"] - before["total"]) <= 0:
+            return None
+
+        stats = self.lanes.setdefault(lane, {
+            "probes": 0, "throttled": 0, "first": before["total"], "last": after["total"],
+            "previous": None, "recent": None, **{role: 0.0 for role in Overhead.roles}
+        })
+
+        # 相邻两次探测之间的间隙作为基线窗口
+        if (previous := stats["previous"]) and (gap := before["total"] - previous["total"]) > 0:
+            for pid, jiffies in before["procs"].items():
+                if pid in previous["procs"]:
+                    rate = max(0.0, (jiffies - previous["procs"][pid]) / gap)
+                    base = self.__baseline.get(pid)
+                    self.__baseline[pid] = rate if base is None else base + self.alpha * (rate - base)
+
+        cost = {role: 0.0 for role in Overhead.roles}
+        cost["shell"] = max(0, after["shell"] - before["shell"])
+        for pid, jiffies in after["procs"].items():
+            if (start := before["procs"].get(pid)) is None:
+                continue
+            excess = jiffies - start - self.__baseline.get(pid, 0.0) * span
+            fresh = jiffies - max(start, self.__marks.get(pid, start))
+            self.__marks[pid] = max(self.__marks.get(pid, jiffies), jiffies)
+            cost[self.observers.get(pid, "target")] += max(0.0, min(excess, fresh))
+
+        spent = sum(cost.values())
+        for role, value in cost.items():
+            stats[role] += value
+        stats["probes"] += 1
+        stats["first"], stats["last"] = min(stats["first"], before["total"]), max(stats["last"], after["total"])
+
+        # 近期占比：本次开销 / 自上次探测开始以来的设备 CPU 容量
+        if previous and (cycle := after["total"] - previous["start"]) > 0:
+            share = spent / cycle
+            stats["recent"] = share if stats["recent"] is None else stats["recent"] + self.alpha * (share - stats["recent"])
+        stats["previous"] = {**after, "start": before["total"]}
+
+    def over_budget(self, lane: str) -> bool:
+        """
+        判断通道近期开销是否超出预算；超出时计数并重置近期估计，待新周期下重新累积后再判断。
+        """
+        if self.budget <= 0 or not (stats := self.lanes.get(lane)) or stats["recent"] is None:
+            return False
+        if stats["recent"] * 100 <= self.budget:
+            return False
+        stats["throttled"] += 1
+        stats["recent"] = None
+        return True
+
+    def panel(self) -> str:
+        """
+        生成实时面板摘要，如 `mem 0.84% · io 0.12%`。
+        """
+        return " · ".join(
+            f"{lane} {stats['recent'] * 100:.2f}%" for lane, stats in self.lanes.items() if stats["recent"] is not None
+        ) or "*"
+
+    def summary(self) -> dict:
+        """
+        汇总各通道的观测开销。
+
+        Returns
+        -------
+        dict
+            lane -> 字典：
+            - probes     : 计量的探测次数。
+            - cpu_ms     : 计入的 CPU 时间合计（ms）。
+            - per_probe  : 单次探测平均 CPU 时间（ms）。
+            - shell_ms / system_server_ms / adbd_ms / target_ms : 按进程角色拆分的 CPU 时间（ms）。
+            - overhead   : 占通道运行期间设备 CPU 容量的百分比。
+            - throttled  : 因超出预算而拉长周期的次数。
+        """
+        scale = 1000 / self.hz
+        result = {}
+        for lane, stats in self.lanes.items():
+            spent = sum(stats[role] for role in Overhead.roles)
+            capacity = stats["last"] - stats["first"]
+            result[lane] = {
+                "probes": stats["probes"],
+                "cpu_ms": round(spent * scale, 2),
+                "per_probe": round(spent * scale / stats["probes"], 2) if stats["probes"] else 0.0,
+                **{f"{role}_ms": round(stats[role] * scale, 2) for role in Overhead.roles},
+                "overhead": round(spent / capacity * 100, 4) if capacity > 0 else 0.0,
+                "throttled": stats["throttled"]
+            }
+        return result
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,165 @@
+# __        __            _
+# \ \      / /_ _ _ __ __| | ___ _ __
+#  \ \ /\ / / _` | '__/ _` |/ _ \ '_ \
+#   \ V  V / (_| | | | (_| |  __/ | | |
+#    \_/\_/ \__,_|_|  \__,_|\___|_| |_|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import typing
+from collections import deque
+
+
+class Warden(object):
+    """
+    采集期间的在线泄漏检测器，在 PSS 持续增长的当下触发堆快照，而不是等到 `--forge` 评分后才得出结论。
+
+    以最近 `window` 秒的样本做最小二乘回归，窗口两端增删样本时只更新累加量（Σt, Σy, Σt², Σty, Σy²），
+    每个样本 O(1)；前后台切换时 PSS 往往阶跃变化，窗口清空重新累积。
+
+    - 可疑：窗口覆盖足够时长，斜率不低于 `slope`（MB/min）且拟合优度不低于 `r2`；
+    - 触发：连续可疑超过 `sustain` 秒；触发后进入 `cooldown` 冷却期，整个任务最多触发 `dumps` 次。
+
+    Parameters
+    ----------
+    window : float
+        回归窗口（秒）。
+
+    slope : float
+        判定增长的最小斜率（MB/min）。
+
+    r2 : float
+        判定增长的最小拟合优度。
+
+    sustain : float
+        可疑状态需持续的时长（秒）。
+
+    cooldown : float
+        两次触发之间的最短间隔（秒）。
+
+    dumps : int
+        单个任务的最多触发次数。
+
+    minimum : int, optional
+        参与判定所需的最少样本数，默认 8。
+    """
+
+    def __init__(
+        self,
+        window: float,
+        slope: float,
+        r2: float,
+        sustain: float,
+        cooldown: float,
+        dumps: int,
+        minimum: int = 8
+    ):
+        self.window, self.slope, self.r2 = window * 1000, slope, r2
+        self.sustain, self.cooldown, self.dumps, self.minimum = sustain * 1000, cooldown * 1000, dumps, minimum
+
+        self.samples: deque[tuple[float, float, int]] = deque()
+        self.origin: typing.Optional[int] = None
+        self.mode: typing.Optional[str] = None
+        self.sum_t, self.sum_y, self.sum_tt, self.sum_ty, self.sum_yy = 0.0, 0.0, 0.0, 0.0, 0.0
+
+        self.suspect: typing.Optional[int] = None
+        self.fired: list[int] = []
+        self.resets, self.suspects = 0, 0
+
+    def __reset(self, timestamp: int) -> None:
+        self.samples.clear()
+        self.origin = timestamp
+        self.sum_t, self.sum_y, self.sum_tt, self.sum_ty, self.sum_yy = 0.0, 0.0, 0.0, 0.0, 0.0
+        self.suspect = None
+
+    def __shift(self, t: float, y: float, sign: int) -> None:
+        self.sum_t += sign * t
+        self.sum_y += sign * y
+        self.sum_tt += sign * t * t
+        self.sum_ty += sign * t * y
+        self.sum_yy += sign * y * y
+
+    def fit(self) -> tuple[float, float]:
+        """
+        当前窗口的回归斜率（MB/min）与拟合优度，样本不足或序列恒定时为 (0.0, 0.0)。
+        """
+        n = len(self.samples)
+        sxx = n * self.sum_tt - self.sum_t * self.sum_t
+        sxy = n * self.sum_ty - self.sum_t * self.sum_y
+        syy = n * self.sum_yy - self.sum_y * self.sum_y
+        if n < 2 or sxx <= 0:
+            return 0.0, 0.0
+        return sxy / sxx, (sxy * sxy / (sxx * syy) if syy > 0 else 0.0)
+
+    def feed(self, timestamp: int, pss: float, mode: str) -> typing.Optional[dict]:
+        """
+        输入一个样本，满足触发条件时返回判定依据，否则返回 None。
+
+        Parameters
+        ----------
+        timestamp : int
+            实际采样时间（Unix 毫秒）。
+
+        pss : float
+            样本 PSS（MB）。
+
+        mode : str
+            前后台状态（FG / BG）。
+
+        Returns
+        -------
+        dict or None
+            {"slope": MB/min, "r2", "span": 窗口时长秒, "samples", "pss"}。
+        """
+        if self.origin is None or mode != self.mode or (self.samples and timestamp <= self.samples[-1][2]):
+            self.resets += self.origin is not None
+            self.mode = mode
+            self.__reset(timestamp)
+
+        # 时间以分钟计并相对窗口起点，累加量保持在较小量级
+        t = (timestamp - self.origin) / 60000
+        self.samples.append((t, pss, timestamp))
+        self.__shift(t, pss, 1)
+        while self.samples and timestamp - self.samples[0][2] > self.window:
+            old_t, old_y, _ = self.samples.popleft()
+            self.__shift(old_t, old_y, -1)
+
+        span = timestamp - self.samples[0][2]
+        slope, r2 = self.fit()
+        if len(self.samples) < self.minimum or span < self.window * 0.8 or slope < self.slope or r2 < self.r2:
+            self.suspect = None
+            return None
+
+        if self.suspect is None:
+            self.suspect = timestamp
+            self.suspects += 1
+        if timestamp - self.suspect < self.sustain:
+            return None
+        if len(self.fired) >= self.dumps or (self.fired and timestamp - self.fired[-1] < self.cooldown):
+            return None
+
+        self.fired.append(timestamp)
+        self.suspect = None
+        return {
+            "slope": round(slope, 4), "r2": round(r2, 4), "span": round(span / 1000, 1),
+            "samples": len(self.samples), "pss": round(pss, 3)
+        }
+
+    def summary(self) -> dict:
+        """
+        汇总检测统计：进入可疑状态的次数、触发次数、窗口重置次数与当前窗口的斜率。
+        """
+        slope, r2 = self.fit()
+        return {
+            "suspects": self.suspects,
+            "fired": len(self.fired),
+            "resets": self.resets,
+            "slope": round(slope, 4),
+            "r2": round(r2, 4)
+        }
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,383 @@
+#   ____                                 _
+#  / ___|___  _ __ ___  _ __   __ _  ___| |_ ___  _ __
+# | |   / _ \| '_ ` _ \| '_ \ / _` |/ __| __/ _ \| '__|
+# | |__| (_) | | | | | | |_) | (_| | (__| || (_) | |
+#  \____\___/|_| |_| |_| .__/ \__,_|\___|\__\___/|_|
+#                      |_|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import json
+import time
+import shutil
+import typing
+import asyncio
+import aiosqlite
+from pathlib import Path
+from loguru import logger
+from memcore.cubicle import Cubicle
+from memcore.packer import Packer
+from memnova.orbis import Orbis
+from memnova.reporter import Reporter
+from memnova import const
+
+
+class Compactor(object):
+    """
+    按保留策略压缩历史分组：近期任务保留全分辨率，过期任务执行以下操作：
+
+    - mem_data 按聚合粒度降采样为桶内均值（activity 等取桶内最后一次取值），并删除更细粒度的聚合。
+    - io_data 每个桶仅保留最后一行（累计计数器在桶边界的取值），增量聚合保持不变。
+    - gfx_data 删除原始帧与 VSYNC 数据，评分写入片段 metadata，滑动/拖拽/掉帧区间保留。
+    - 追踪目录按策略压缩为 zip 或直接删除。
+
+    所有数据库变更在单个事务中完成；试运行时在事务内统计释放页数后回滚，结果与实际执行一致。
+    """
+
+    # 降采样时取桶内最后一次取值的字段，其余数值字段取均值
+    mem_lasts: tuple = ("label", "pid", "adj", "activity")
+
+    # 丢弃原始帧时清空的图形字段
+    gfx_frames: tuple = ("raw_frames", "vsync_sys", "vsync_app")
+
+    @staticmethod
+    def dir_size(path: "Path") -> int:
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+    @staticmethod
+    async def expired(db: "aiosqlite.Connection", cutoff: int) -> list[str]:
+        """
+        返回开始时间早于 cutoff（Unix 毫秒）的任务目录名。
+        """
+        async with db.execute(
+            f"SELECT data_dir FROM {const.JOINT_DATA_TABLE} WHERE {Cubicle.epoch_ms} < ? ORDER BY data_dir",
+            (cutoff,)
+        ) as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+    @staticmethod
+    async def downsample_mem(db: "aiosqlite.Connection", data_dir: str, span: int) -> int:
+        """
+        将任务的内存明细降采样为每个 (桶, mode) 一行，时间戳取桶中点；返回减少的行数。
+        """
+        async with db.execute(f"PRAGMA table_info({const.MEM_DATA_TABLE})") as cursor:
+            names = [row[1] for row in await cursor.fetchall()]
+        fixed = ("id", "data_dir", "timestamp", "mode") + Compactor.mem_lasts
+        values = [n for n in names if n not in fixed]
+
+        async with db.execute(f'''SELECT MAX(id), COUNT(*), COUNT(DISTINCT (({Cubicle.epoch_ms}) / ?) || '|' || mode)
+            FROM {const.MEM_DATA_TABLE} WHERE data_dir = ?''', (span, data_dir)
+        ) as cursor:
+            last_id, total, buckets = await cursor.fetchone()
+        if not total or total == buckets:
+            return 0
+
+        lasts = ", ".join(
+            f"LAST_VALUE({n}) OVER (PARTITION BY bucket, mode ORDER BY ts, id "
+            f"ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) AS last_{n}" for n in Compactor.mem_lasts
+        )
+        await db.execute(f'''INSERT INTO {const.MEM_DATA_TABLE} (
+            data_dir, timestamp, mode, {", ".join(Compactor.mem_lasts)}, {", ".join(values)})
+            SELECT data_dir, bucket + ? / 2, mode,
+                {", ".join(f"MAX(last_{n})" for n in Compactor.mem_lasts)},
+                {", ".join(f"AVG({n})" for n in values)}
+            FROM (
+                SELECT *, {lasts}
+                FROM (
+                    SELECT *, ts - ts % ? AS bucket
+                    FROM (SELECT *, {Cubicle.epoch_ms} AS ts FROM {const.MEM_DATA_TABLE} WHERE data_dir = ? AND id <= ?)
+                )
+            )
+            GROUP BY bucket, mode
+            ORDER BY bucket''', (span, span, data_dir, last_id)
+        )
+        await db.execute(f"DELETE FROM {const.MEM_DATA_TABLE} WHERE data_dir = ? AND id <= ?", (data_dir, last_id))
+        await db.execute(
+            f"DELETE FROM {const.MEM_ROLLUP_TABLE} WHERE data_dir = ? AND span < ?", (data_dir, span)
+        )
+        return total - buckets
+
+    @staticmethod
+    async def downsample_io(db: "aiosqlite.Connection", data_dir: str, span: int) -> int:
+        """
+        I/O 计数器为累计值，每个桶仅保留最后一行即可还原桶间增量；返回减少的行数。
+        """
+        async with db.execute(f"SELECT COUNT(*) FROM {const.IO_DATA_TABLE} WHERE data_dir = ?", (data_dir,)) as cursor:
+            total, *_ = await cursor.fetchone()
+
+        await db.execute(f'''DELETE FROM {const.IO_DATA_TABLE}
+            WHERE data_dir = ? AND id NOT IN (
+                SELECT MAX(id) FROM {const.IO_DATA_TABLE} WHERE data_dir = ?
+                GROUP BY ({Cubicle.epoch_ms}) / ?
+            )''', (data_dir, data_dir, span)
+        )
+        await db.execute(
+            f"DELETE FROM {const.IO_ROLLUP_TABLE} WHERE data_dir = ? AND span < ?", (data_dir, span)
+        )
+        async with db.execute(f"SELECT COUNT(*) FROM {const.IO_DATA_TABLE} WHERE data_dir = ?", (data_dir,)) as cursor:
+            remain, *_ = await cursor.fetchone()
+        return total - remain
+
+    @staticmethod
+    async def downsample_smaps(db: "aiosqlite.Connection", data_dir: str, span: int) -> typing.Any:
+        """
+        smaps_rollup 通道每个桶仅保留最后一行；旧版库无该表时跳过。
+        """
+        try:
+            await db.execute(f'''DELETE FROM {const.SMAPS_TABLE}
+                WHERE data_dir = ? AND rowid NOT IN (
+                    SELECT MAX(rowid) FROM {const.SMAPS_TABLE} WHERE data_dir = ?
+                    GROUP BY timestamp / ?
+                )''', (data_dir, data_dir, span)
+            )
+        except aiosqlite.OperationalError:
+            return None
+
+    @staticmethod
+    async def downsample_procs(db: "aiosqlite.Connection", data_dir: str, span: int) -> typing.Any:
+        """
+        进程明细每个桶内每个进程仅保留最后一行；旧版库无该表时跳过。
+        """
+        try:
+            await db.execute(f'''DELETE FROM {const.PROC_TABLE}
+                WHERE data_dir = ? AND rowid NOT IN (
+                    SELECT MAX(rowid) FROM {const.PROC_TABLE} WHERE data_dir = ?
+                    GROUP BY process, timestamp / ?
+                )''', (data_dir, data_dir, span)
+            )
+        except aiosqlite.OperationalError:
+            return None
+
+    @staticmethod
+    async def downsample_maps(db: "aiosqlite.Connection", data_dir: str, span: int) -> typing.Any:
+        """
+        映射明细为增量记录，每个桶内每个映射仅保留最后一行，各桶末尾的取值不变；
+        另保留每个映射的首行，增长仍以首个快照为起点。旧版库无该表时跳过。
+        """
+        try:
+            await db.execute(f'''DELETE FROM {const.MAPS_TABLE}
+                WHERE data_dir = ? AND rowid NOT IN (
+                    SELECT MAX(rowid) FROM {const.MAPS_TABLE} WHERE data_dir = ?
+                    GROUP BY process, mapping, timestamp / ?
+                    UNION
+                    SELECT MIN(rowid) FROM {const.MAPS_TABLE} WHERE data_dir = ? GROUP BY process, mapping
+                )''', (data_dir, data_dir, span, data_dir)
+            )
+        except aiosqlite.OperationalError:
+            return None
+
+    @staticmethod
+    async def prune_cadence(db: "aiosqlite.Connection", data_dir: str) -> typing.Any:
+        """
+        明细降采样后逐样本的节奏记录不再对应，仅保留首末两轮用于推算计划周期，并清除其采样周期使评分不再加权；
+        旧版库无节奏表时跳过。
+        """
+        try:
+            await db.execute(f'''DELETE FROM {const.CADENCE_TABLE}
+                WHERE data_dir = ? AND tick NOT IN (
+                    SELECT MIN(tick) FROM {const.CADENCE_TABLE} WHERE data_dir = ?
+                    UNION ALL
+                    SELECT MAX(tick) FROM {const.CADENCE_TABLE} WHERE data_dir = ?
+                )''', (data_dir, data_dir, data_dir)
+            )
+            await db.execute(
+                f"UPDATE {const.CADENCE_TABLE} SET interval = NULL WHERE data_dir = ?", (data_dir,)
+            )
+        except aiosqlite.OperationalError:
+            return None
+
+    @staticmethod
+    async def drop_frames(db: "aiosqlite.Connection", data_dir: str) -> typing.Optional[dict]:
+        """
+        计算并保存任务的流畅度评分后清空原始帧与 VSYNC 数据；已清空时返回 None。
+        """
+        async with db.execute(
+            f"SELECT id FROM {const.GFX_DATA_TABLE} WHERE data_dir = ? ORDER BY id", (data_dir,)
+        ) as cursor:
+            ids = [row[0] for row in await cursor.fetchall()]
+        if not ids:
+            return None
+
+        gfx_data = await Cubicle.query_gfx(db, data_dir)
+        if not any(record["raw_frames"] for record in gfx_data):
+            return None
+
+        merged = Reporter.merge_alignment_frames(gfx_data)
+        score = await asyncio.to_thread(
+            Orbis.analyze_gfx_score,
+            merged["raw_frames"], merged["roll_ranges"], merged["drag_ranges"], merged["jank_ranges"], "fps_app"
+        )
+        score = json.loads(json.dumps(score, default=float))
+
+        empty = Packer.pack([])
+        for index, (row_id, record) in enumerate(zip(ids, gfx_data)):
+            metadata = {**record["metadata"], "retained_score": score} if index == 0 else record["metadata"]
+            await db.execute(
+                f'''UPDATE {const.GFX_DATA_TABLE} SET metadata = ?,
+                {", ".join(f"{f} = ?" for f in Compactor.gfx_frames)} WHERE id = ?''',
+                (json.dumps(metadata, ensure_ascii=False), *[empty] * len(Compactor.gfx_frames), row_id)
+            )
+        return score
+
+    @staticmethod
+    async def freed_bytes(db: "aiosqlite.Connection", baseline: int) -> int:
+        async with db.execute("PRAGMA freelist_count") as cursor:
+            freelist, *_ = await cursor.fetchone()
+        async with db.execute("PRAGMA page_size") as cursor:
+            page_size, *_ = await cursor.fetchone()
+        return max(freelist - baseline, 0) * page_size
+
+    @staticmethod
+    async def vacuum(db: "aiosqlite.Connection") -> None:
+        """
+        增量回收空闲页；旧库未启用增量模式时先切换并整体 VACUUM 一次。
+        """
+        async with db.execute("PRAGMA auto_vacuum") as cursor:
+            mode, *_ = await cursor.fetchone()
+        if mode != 2:
+            await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            await db.execute("VACUUM")
+        else:
+            # 逐步执行直至释放全部空闲页（单次 execute 仅释放一页）
+            await db.executescript("PRAGMA incremental_vacuum")
+
+    @staticmethod
+    async def compact_group(assemblage: "Path", policy: dict, cutoff: int, dry: bool) -> typing.Optional[dict]:
+        """
+        压缩单个分组，返回统计结果；分组内无过期任务时返回 None。
+
+        Parameters
+        ----------
+        assemblage : Path
+            分组报告目录（包含各设备分片数据库与 Summary 目录）。
+
+        policy : dict
+            `Align.retain` 规范化后的保留策略。
+
+        cutoff : int
+            过期界限（Unix 毫秒）。
+
+        dry : bool
+            为 True 时仅统计，不修改数据库与追踪目录。
+
+        Returns
+        -------
+        Optional[dict]
+            group、tasks、mem_rows、io_rows、gfx_tasks、db_bytes、trace_bytes。
+        """
+        report = {
+            "group": assemblage.parent.name, "tasks": 0,
+            "mem_rows": 0, "io_rows": 0, "gfx_tasks": 0, "scores": {}, "db_bytes": 0
+        }
+        data_dirs = []
+
+        # 各设备分片独立压缩与回收
+        for db_file in sorted(assemblage.glob(const.SHARD_GLOB)):
+            async with aiosqlite.connect(db_file) as db:
+                try:
+                    expired = await Compactor.expired(db, cutoff)
+                except aiosqlite.OperationalError:
+                    continue
+                if not expired:
+                    continue
+
+                async with db.execute("PRAGMA freelist_count") as cursor:
+                    baseline, *_ = await cursor.fetchone()
+
+                before = report["mem_rows"] + report["io_rows"] + report["gfx_tasks"]
+                await db.execute("BEGIN")
+                try:
+                    for data_dir in expired:
+                        report["mem_rows"] += await Compactor.downsample_mem(db, data_dir, policy["span"])
+                        report["io_rows"] += await Compactor.downsample_io(db, data_dir, policy["span"])
+                        await Compactor.prune_cadence(db, data_dir)
+                        await Compactor.downsample_smaps(db, data_dir, policy["span"])
+                        await Compactor.downsample_procs(db, data_dir, policy["span"])
+                        await Compactor.downsample_maps(db, data_dir, policy["span"])
+                        if policy["drop_frames"] and (score := await Compactor.drop_frames(db, data_dir)):
+                            report["gfx_tasks"] += 1
+                            report["scores"][data_dir] = score
+                    report["db_bytes"] += await Compactor.freed_bytes(db, baseline)
+                except Exception:
+                    await db.rollback()
+                    raise
+
+                if dry or before == report["mem_rows"] + report["io_rows"] + report["gfx_tasks"]:
+                    await db.rollback()
+                else:
+                    await db.commit()
+                    await Compactor.vacuum(db)
+
+            data_dirs += expired
+
+        if not data_dirs:
+            return None
+        report["tasks"] = len(data_dirs)
+        changed = report["mem_rows"] or report["io_rows"] or report["gfx_tasks"]
+
+        # ==== 追踪目录 ====
+        report["trace_bytes"] = 0
+        if policy["traces"] in ("compress", "delete"):
+            for data_dir in data_dirs:
+                if not (traces := assemblage / const.SUMMARY / data_dir / const.TRACES).is_dir():
+                    continue
+                report["trace_bytes"] += (size := Compactor.dir_size(traces))
+                if dry or not size:
+                    continue
+                if policy["traces"] == "compress":
+                    await asyncio.to_thread(shutil.make_archive, str(traces), "zip", str(traces))
+                    report["trace_bytes"] -= (traces.parent / f"{const.TRACES}.zip").stat().st_size
+                await asyncio.to_thread(shutil.rmtree, traces)
+
+        # ==== 原始采集存档（本身已压缩，仅 delete 策略下删除） ====
+        if policy["traces"] == "delete":
+            for data_dir in data_dirs:
+                summary = assemblage / const.SUMMARY / data_dir
+                for file in (summary / f"{data_dir}{suffix}" for suffix in (const.ARCHIVE_SUFFIX, const.ARCHIVE_INDEX)):
+                    if not file.is_file():
+                        continue
+                    report["trace_bytes"] += file.stat().st_size
+                    if not dry:
+                        file.unlink()
+
+        if not changed and not report["trace_bytes"]:
+            return None
+
+        logger.info(f"Compact {report['group']} -> {report}")
+        return report
+
+    @staticmethod
+    async def compact(total_dir: str, policy: dict, dry: bool = False) -> list[dict]:
+        """
+        按保留策略遍历 `Tree` 下的全部分组并压缩过期任务。
+
+        Parameters
+        ----------
+        total_dir : str
+            `Memrix_Library` 目录。
+
+        policy : dict
+            `Align.retain` 规范化后的保留策略：keep_days、span、drop_frames、traces（compress / delete / keep）。
+
+        dry : bool, optional
+            试运行，仅统计可回收空间。
+
+        Returns
+        -------
+        list of dict
+            每个发生变更（或将发生变更）的分组统计。
+        """
+        cutoff = int((time.time() - policy["keep_days"] * 86400) * 1000)
+        logger.info(f"Retain policy: {policy} cutoff={cutoff}")
+
+        reports = []
+        for assemblage in sorted((Path(total_dir) / const.TREE_DIR).glob("*/Report_*")):
+            if report := await Compactor.compact_group(assemblage, policy, cutoff, dry):
+                reports.append(report)
+        return reports
+
+
+if __name__ == '__main__':
+    pass
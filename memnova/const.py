@@ -39,11 +39,43 @@ IMAGES_DIR       = f"{APP_NAME}_images"
 IONICS_DIR       = f"{APP_NAME}_ionics"
 SUMMARY          = r"Summary"
 TRACES           = r"traces"
+EXPORT_DIR       = r"Export"
 DB_FILE          = f"{APP_NAME}_data.db"
+SHARD_FILE       = f"{APP_NAME}_data@{{}}.db"
+SHARD_GLOB       = f"{APP_NAME}_data*.db"
+CATALOG_FILE     = f"{APP_NAME}_catalog.db"
+CATALOG_TABLE    = r"catalog"
 JOINT_DATA_TABLE = r"joint_data"
 MEM_DATA_TABLE   = r"mem_data"
 GFX_DATA_TABLE   = r"gfx_data"
 IO_DATA_TABLE    = r"io_data"
+STRING_TABLE     = r"string_pool"
+MEM_ROLLUP_TABLE = r"mem_rollup"
+IO_ROLLUP_TABLE  = r"io_rollup"
+CADENCE_TABLE    = r"cadence"
+SMAPS_TABLE      = r"smaps_data"
+HOST_TABLE       = r"host_stats"
+TICK_TABLE       = r"tick_stats"
+OVERHEAD_TABLE   = r"overhead"
+PROC_TABLE       = r"proc_data"
+HEAP_TABLE       = r"heap_dumps"
+MAPS_TABLE       = r"maps_data"
+EVENTS_TABLE     = r"mem_events"
+HPROF_TABLE      = r"hprof_summary"
+HPROF_CLASSES    = r"hprof_classes"
+HPROF_DOMINATORS = r"hprof_dominators"
+ROLLUP_SPANS     = (10_000, 60_000, 600_000)
+ROLLUP_POINTS    = 3000
+PACK_MAGIC       = b"MXCP"
+PACK_VERSION     = 1
+JOURNAL_TABLE    = r"journal_state"
+JOURNAL_SUFFIX   = r".mxj"
+JOURNAL_MAGIC    = b"MXJL"
+JOURNAL_VERSION  = 1
+ARCHIVE_SUFFIX   = r".mxz"
+ARCHIVE_INDEX    = r".mxi"
+ARCHIVE_MAGIC    = b"MXRA"
+ARCHIVE_VERSION  = 1
 ALIGN            = f"{APP_NAME}_align.yaml"
 LIC_FILE         = f"{APP_NAME}_signature.lic"
 VOICES           = r"voices"
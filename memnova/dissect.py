@@ -0,0 +1,451 @@
+#  ____  _                   _
+# |  _ \(_)___ ___  ___  ___| |_
+# | | | | / __/ __|/ _ \/ __| __|
+# | |_| | \__ \__ \  __/ (__| |_
+# |____/|_|___/___/\___|\___|\__|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import re
+import typing
+
+
+class Dissect(object):
+    """
+    单遍 `dumpsys meminfo <package>` 解析器，直接在原始字节上工作。
+
+    整段输出只扫描一遍：先用 `bytes.find` 定位 MEMINFO 表、App Summary 与 Objects 三个区段边界，
+    再用同一条预编译的行文法在各区段内逐行匹配 `名称[:] 数值 数值 ...`，
+    不再为每个字段单独编译正则并反复扫描全文。
+
+    表格列名取自分隔线上方的两行表头逐列拼接（如 `Pss Total`、`Private Dirty`、`Heap Alloc`），
+    因此不同 Android 版本的列数差异（有无 Rss、SwapPss 等）均可自适应。
+    """
+
+    meminfo_fields = (
+        "Native Heap", "Dalvik Heap", "Dalvik Other", "Stack", "Ashmem", "Other dev",
+        ".so mmap", ".jar mmap", ".apk mmap", ".ttf mmap", ".dex mmap", ".oat mmap", ".art mmap",
+        "Other mmap", "GL mtrack", "Unknown"
+    )
+    summary_fields = (
+        "Java Heap", "Native Heap", "Graphics", "TOTAL PSS", "TOTAL RSS", "TOTAL SWAP"
+    )
+
+    # 旧版本 App Summary 的合计项名称不同，按顺序回退
+    summary_alias = {
+        "TOTAL PSS": ("TOTAL PSS", "TOTAL"),
+        "TOTAL RSS": ("TOTAL RSS",),
+        "TOTAL SWAP": ("TOTAL SWAP PSS", "TOTAL SWAP (KB)", "TOTAL SWAP"),
+    }
+
+    # 名称由单空格分隔的若干词组成，全部使用占有量词，避免在对齐空白上回溯
+    __row = re.compile(
+        rb"(?<![\w.()/-])([A-Za-z.][\w.()/-]*+(?: [A-Za-z.(][\w.()/-]*+)*+):?[ \t]++(\d++(?:[ \t]++\d++)*+)"
+    )
+    __rule = re.compile(rb"^[ \t]*-{2,}[ \t-]*$", re.M)
+    __vm_rss = re.compile(rb"(?:/proc/(\d+)/status:)?VmRSS:[ \t]*(\d+)")
+
+    # `dumpsys meminfo --checkin` 每行：版本,pid,进程名, 堆 max/alloc/free 各 4 列, 以下 8 组各 4 列
+    # （native、dalvik、other、total），之后为 `分类名,8 个数值` 的重复段
+    checkin_columns = (
+        "Pss Total", "Swappable Pss", "Shared Dirty", "Shared Clean",
+        "Private Dirty", "Private Clean", "Swapped Out", "SwapPss Dirty",
+        "Heap Size", "Heap Alloc", "Heap Free"
+    )
+    checkin_head = 47
+
+    io_bytes = ("rchar", "wchar", "read_bytes", "write_bytes", "cancelled_write_bytes")
+    io_count = ("syscr", "syscw")
+    __io = re.compile(rb"^(\w+):[ \t]*(\d+)", re.M)
+
+    # `/proc/[pid]/smaps_rollup` 中按 kB 计的字段，小写后即 `Cubicle.insert_smaps` 的列名
+    smaps_keys = (
+        "Rss", "Pss", "Pss_Anon", "Pss_File", "Pss_Shmem", "Private_Clean", "Private_Dirty", "Swap", "SwapPss"
+    )
+    __kb = re.compile(rb"^(\w+):[ \t]*(\d+) kB", re.M)
+    # `/proc/[pid]/smaps` 的映射头（地址 权限 偏移 设备 inode [路径]）与其后的 kB 字段
+    __mapping = re.compile(
+        rb"^[0-9a-f]+-[0-9a-f]+ \S+ \S+ \S+ \S+[ \t]*([^\r\n]*)|^(Rss|Pss|SwapPss):[ \t]*(\d+)", re.M
+    )
+    __section = re.compile(rb"^====PID (\d+)====\r?$", re.M)
+
+    # `logcat -v epoch` 行：秒.毫秒 pid tid 级别 标签: 消息
+    __logcat = re.compile(rb"^\s*(\d+)\.(\d{3})\d*\s+(\d+)\s+\d+\s+[VDIWEF]\s+([^:]*?)\s*: (.*?)\r?$")
+    # ART GC 摘要，新版本的 AllocSpace 部分只给出字节数
+    __gc = re.compile(
+        rb"^(.*?)\s*GC freed (?:\d+\()?([\d.]+)([KMG]?B)\)? AllocSpace (?:objects|bytes), "
+        rb"\d+\(([\d.]+)([KMG]?B)\) LOS objects, (\d+)% free, "
+        rb"([\d.]+)([KMG]?B)/([\d.]+)([KMG]?B), paused ([^ ]+) total ([\d.]+)(us|ms|s)"
+    )
+    __lmk = re.compile(rb"Kill(?:ing)? '([^']+)' \((\d+)\).*?(?:oom_score_adj|adj) (-?\d+)(?:.*?to free (\d+) ?kB)?")
+    __trim = re.compile(rb"onTrimMemory\D*(\d+)")
+    __duration = re.compile(rb"([\d.]+)(us|ms|s)")
+    __units = {b"B": 1 / 1048576, b"KB": 1 / 1024, b"MB": 1.0, b"GB": 1024.0}
+    __scales = {b"us": 0.001, b"ms": 1.0, b"s": 1000.0}
+    __cpu = re.compile(rb"====CPU====\r?\n(.*?)====UPC====\r?\n?", re.S)
+
+    @staticmethod
+    def parse(raw: bytes) -> dict:
+        """
+        解析单个进程的 meminfo 原始输出，返回全部分类与列。
+
+        Parameters
+        ----------
+        raw : bytes
+            `dumpsys meminfo <package>` 的原始字节输出。
+
+        Returns
+        -------
+        dict
+            `{"columns": [列名, ...], "table": {分类: (KB, ...)}, "summary": {名称: (KB, ...)}}`；
+            table 各行数值与 columns 按位置对应（无 Heap 列的分类行较短），
+            summary 各项依次为 Pss(KB)、Rss(KB) 两列，合计行中每个标签后仅有一个数值。
+            未找到 MEMINFO 区段时返回空字典。
+        """
+        if (head := raw.find(b"** MEMINFO")) < 0:
+            return {}
+
+        summary_at = raw.find(b"App Summary", head)
+        objects_at = raw.find(b"Objects", summary_at if summary_at >= 0 else head)
+        table_end = summary_at if summary_at >= 0 else objects_at if objects_at >= 0 else len(raw)
+
+        columns, table, summary = [], {}, {}
+
+        if rule := Dissect.__rule.search(raw, head, table_end):
+            # 首行为 `** MEMINFO in pid ...`，其后两行为表头
+            header = raw[head:rule.start()].splitlines()
+            upper, lower = header[-2:] if len(header) >= 3 else (b"", b"")
+            columns = [
+                f"{u.decode()} {l.decode()}" for u, l in zip(upper.split(), lower.split())
+            ]
+            for label, values in Dissect.__row.findall(raw, rule.end(), table_end):
+                table.setdefault(label.decode(), tuple(map(int, values.split())))
+
+        if summary_at >= 0:
+            summary_end = objects_at if objects_at >= 0 else len(raw)
+            for label, values in Dissect.__row.findall(raw, summary_at + len(b"App Summary"), summary_end):
+                summary.setdefault(label.decode(), tuple(map(int, values.split())))
+
+        return {"columns": columns, "table": table, "summary": summary}
+
+    @staticmethod
+    def checkin(raw: bytes, pid: str) -> dict:
+        """
+        解析 `dumpsys meminfo --checkin` 紧凑输出，每个进程一行 CSV，返回与 `Dissect.parse` 同构的结构。
+
+        App Summary 在紧凑格式中不存在，按系统 `Debug.MemoryInfo.getSummary*` 的口径由明细推算；
+        紧凑格式不含 Rss，TOTAL RSS 取同一次调用中追加的各进程 `VmRSS`（`grep -H` 带文件名前缀，无前缀时归属 pid）。
+
+        Parameters
+        ----------
+        raw : bytes
+            紧凑格式原始字节输出，可附带 `VmRSS:` 行。
+
+        pid : str
+            无文件名前缀的 `VmRSS` 所属的主进程 PID。
+
+        Returns
+        -------
+        dict
+            `{pid: {"process": 进程名, "columns": [...], "table": {...}, "summary": {...}}}`；
+            设备不支持紧凑格式时返回空字典。
+        """
+        rss, rows = {}, []
+        for line in raw.splitlines():
+            # `VmRSS` 只出现在 CSV 之后的少数短行中，逐行匹配，避免对整段输出做正则扫描
+            if line[:1].isdigit():
+                rows.append(line)
+            elif b"VmRSS:" in line and (match := Dissect.__vm_rss.search(line)):
+                owner, value = match.groups()
+                rss[(owner or pid.encode()).decode()] = int(value)
+
+        processes = {}
+        for line in rows:
+            fields = line.decode(errors="ignore").rstrip(",").split(",")
+            if len(fields) < Dissect.checkin_head or not (fields[0].isdigit() and fields[1].isdigit()):
+                continue
+
+            # 旧版本无 SwapPss 时对应列为 N/A，合计换出改用 Swapped Out；其余 N/A 记为 0，整行只替换与切分一次
+            swap_at = 7 if fields[Dissect.checkin_head - 1] != "N/A" else 6
+            values = ",".join(fields[3:]).replace("N/A", "0").split(",")
+            head = [*map(int, values[:Dissect.checkin_head - 3])]
+            heap, block = head[:12], head[12:]
+
+            # 按 native、dalvik、other、total 四列拆分
+            native, dalvik, other, total = (tuple(block[k::4]) + tuple(heap[k::4]) for k in range(4))
+
+            # 分类段定长：名称后紧跟固定个数的数值，步长取第二个名称的位置
+            rest = values[Dissect.checkin_head - 3:]
+            stride = next((i for i, token in enumerate(rest[1:], 1) if not token.isdigit()), len(rest)) or 1
+            others = {rest[i]: tuple(map(int, rest[i + 1:i + stride])) for i in range(0, len(rest), stride)}
+
+            table = {"Native Heap": native, "Dalvik Heap": dalvik, **others}
+            # 文本格式中的 Unknown 为 other 合计扣除全部已知分类后的剩余
+            table["Unknown"] = tuple(max(0, o - k) for o, k in zip(other, map(sum, zip(*others.values()))))
+            table["TOTAL"] = total
+
+            private: typing.Callable[[str], int] = lambda name: sum(table.get(name, (0,) * 6)[4:6])
+
+            summary = {
+                "Java Heap": (dalvik[4] + private(".art mmap"),),
+                "Native Heap": (native[4],),
+                "Graphics": (private("Gfx dev") + private("EGL mtrack") + private("GL mtrack"),),
+                "TOTAL PSS": (total[0],),
+                "TOTAL RSS": (rss.get(fields[1], 0),),
+                "TOTAL SWAP PSS": (total[swap_at],),
+            }
+
+            processes[fields[1]] = {
+                "process": fields[2],
+                "columns": list(Dissect.checkin_columns),
+                "table": table,
+                "summary": summary,
+            }
+
+        return processes
+
+    @staticmethod
+    def mem_fields(parsed: dict) -> tuple[dict, dict]:
+        """
+        将解析结果映射为 `Cubicle.insert_mem` 使用的 meminfo / summary 字段，单位 MB。
+
+        Parameters
+        ----------
+        parsed : dict
+            `Dissect.parse` 的返回结果。
+
+        Returns
+        -------
+        tuple of dict
+            `(meminfo_map, summary_map)`，缺失字段记为 0.0；任一区段缺失时对应字典为空。
+        """
+        meminfo_map, summary_map = {}, {}
+
+        if table := parsed.get("table"):
+            for field in Dissect.meminfo_fields:
+                meminfo_map[field] = round(row[0] / 1024, 3) if (row := table.get(field)) else 0.0
+            columns, total = parsed["columns"], table.get("TOTAL", ())
+            uss = sum(
+                total[i] for c in ("Private Dirty", "Private Clean")
+                if c in columns and (i := columns.index(c)) < len(total)
+            )
+            meminfo_map["TOTAL USS"] = round(uss / 1024, 3)
+
+        if summary := parsed.get("summary"):
+            for field in Dissect.summary_fields:
+                values = next((row for n in Dissect.summary_alias.get(field, (field,)) if (row := summary.get(n))), ())
+                summary_map[field] = round(values[0] / 1024, 3) if values else 0.0
+
+        return meminfo_map, summary_map
+
+    @staticmethod
+    def io_fields(raw: bytes) -> dict:
+        """
+        解析 `/proc/[pid]/io` 原始输出，字节类字段转换为 MB，调用次数保持整数。
+
+        Parameters
+        ----------
+        raw : bytes
+            `/proc/[pid]/io` 的原始字节输出。
+
+        Returns
+        -------
+        dict
+            `Cubicle.insert_io` 使用的 I/O 字段，缺失字段记为 0；无任何字段时返回空字典。
+        """
+        if not (values := {k.decode(): int(v) for k, v in Dissect.__io.findall(raw)}):
+            return {}
+
+        return {
+            **{k: round(values.get(k, 0) / 1024 / 1024, 3) for k in Dissect.io_bytes},
+            **{k: values.get(k, 0) for k in Dissect.io_count}
+        }
+
+    @staticmethod
+    def sections(raw: bytes) -> dict[str, bytes]:
+        """
+        按 `====PID <pid>====` 标记拆分批量采集的原始输出，缺少结束标记时视为不完整并返回空字典。
+
+        Parameters
+        ----------
+        raw : bytes
+            `Device.proc_io`、`Device.smaps_rollup` 等批量命令的原始字节输出。
+
+        Returns
+        -------
+        dict
+            pid -> 该进程的原始字节段。
+        """
+        if (end := raw.rfind(b"====EOF====")) < 0:
+            return {}
+
+        marks = [*Dissect.__section.finditer(raw, 0, end)]
+        return {
+            m.group(1).decode(): raw[m.end():marks[i + 1].start() if i + 1 < len(marks) else end]
+            for i, m in enumerate(marks)
+        }
+
+    @staticmethod
+    def smaps_fields(raw: bytes) -> dict:
+        """
+        解析 `/proc/[pid]/smaps_rollup` 原始输出，单位 MB。
+
+        Parameters
+        ----------
+        raw : bytes
+            单个进程的 smaps_rollup 原始字节输出。
+
+        Returns
+        -------
+        dict
+            `Cubicle.insert_smaps` 使用的字段（小写），缺失字段记为 0.0；无 Pss 字段（无权读取）时返回空字典。
+        """
+        if not raw or b"Pss:" not in raw:
+            return {}
+
+        values = {k.decode(): int(v) for k, v in Dissect.__kb.findall(raw)}
+        return {k.lower(): round(values.get(k, 0) / 1024, 3) for k in Dissect.smaps_keys}
+
+    @staticmethod
+    def smaps_mappings(raw: bytes) -> dict[str, tuple[int, int, int]]:
+        """
+        解析 `/proc/[pid]/smaps` 原始输出，按映射名称汇总（同一文件的多个段合并），单位 kB。
+
+        只做一次正则扫描，不逐行解码；匿名映射（无路径）归为 `[anon]`。
+
+        Parameters
+        ----------
+        raw : bytes
+            单个进程的 smaps 原始字节输出（可只含映射头与 Rss、Pss、SwapPss 行）。
+
+        Returns
+        -------
+        dict
+            映射名称 -> (rss, pss, swap_pss)；无 Pss 字段（无权读取）时返回空字典。
+        """
+        if not raw or b"Pss:" not in raw:
+            return {}
+
+        mappings, current = {}, None
+        slots = {b"Rss": 0, b"Pss": 1, b"SwapPss": 2}
+        for name, key, value in Dissect.__mapping.findall(raw):
+            if not key:
+                current = mappings.setdefault(name.strip() or b"[anon]", [0, 0, 0])
+            elif current is not None:
+                current[slots[key]] += int(value)
+        return {name.decode(errors="replace"): tuple(values) for name, values in mappings.items()}
+
+    @staticmethod
+    def logcat_event(line: bytes) -> typing.Optional[dict]:
+        """
+        解析 `Device.logcat` 输出的一行，识别 GC、低内存查杀与内存裁剪事件。
+
+        Parameters
+        ----------
+        line : bytes
+            `logcat -v epoch` 格式的单行原始字节。
+
+        Returns
+        -------
+        dict or None
+            {"timestamp", "kind", "pid", "process", "value", "pause", "message"}，无法识别时返回 None：
+
+            - gc         : value 为释放量（MB，AllocSpace 与 LOS 合计），pause 为暂停时长合计（ms）；
+            - lmk        : lowmemorykiller 查杀，pid 与 process 为被杀进程，value 为释放的内存（MB，缺失时为 0）；
+            - kill       : am_kill 事件，pid 与 process 为被杀进程，value 为 oom_adj；
+            - low_memory : am_low_memory 事件，value 为当时的缓存进程数；
+            - trim       : 应用日志中的 onTrimMemory，value 为裁剪级别。
+        """
+        if not (m := Dissect.__logcat.match(line)):
+            return None
+
+        seconds, millis, pid, tag, message = m.groups()
+        event = {
+            "timestamp": int(seconds) * 1000 + int(millis), "kind": None, "pid": pid.decode(),
+            "process": tag.decode(errors="replace"), "value": 0.0, "pause": None,
+            "message": message[:256].decode(errors="replace")
+        }
+
+        if b"GC freed" in message and (gc := Dissect.__gc.match(message)):
+            units, scales = Dissect.__units, Dissect.__scales
+            freed = float(gc.group(2)) * units.get(gc.group(3), 0) + float(gc.group(4)) * units.get(gc.group(5), 0)
+            pause = sum(float(v) * scales[u] for v, u in Dissect.__duration.findall(gc.group(11)))
+            event.update(kind="gc", value=round(freed, 3), pause=round(pause, 3))
+        elif tag in (b"lowmemorykiller", b"lmkd") and (lmk := Dissect.__lmk.search(message)):
+            event.update(
+                kind="lmk", pid=lmk.group(2).decode(), process=lmk.group(1).decode(errors="replace"),
+                value=round(int(lmk.group(4) or 0) / 1024, 3)
+            )
+        elif tag == b"am_kill":
+            # [user,pid,进程名,oom_adj,原因(,rss)]
+            fields = message.strip(b"[] ").split(b",")
+            if len(fields) < 5 or not fields[1].isdigit():
+                return None
+            event.update(
+                kind="kill", pid=fields[1].decode(), process=fields[2].decode(errors="replace"),
+                value=float(fields[3]) if fields[3].lstrip(b"-").isdigit() else 0.0
+            )
+        elif tag == b"am_low_memory":
+            count = message.strip(b"[] ")
+            event.update(kind="low_memory", value=float(count) if count.isdigit() else 0.0)
+        elif trim := Dissect.__trim.search(message):
+            event.update(kind="trim", value=float(trim.group(1)))
+        else:
+            return None
+        return event
+
+    @staticmethod
+    def bracket(raw: bytes) -> tuple[bytes, list[dict]]:
+        """
+        剥离 `Device.meter` 插入的 CPU 快照段，返回原始输出与快照，下游解析器与存档看到的仍是原命令的输出。
+
+        Parameters
+        ----------
+        raw : bytes
+            带 `====CPU====` / `====UPC====` 快照段的原始字节输出。
+
+        Returns
+        -------
+        tuple
+            `(payload, snapshots)`；snapshots 按出现顺序排列，元素为 `Dissect.cpu_snapshot` 的返回结果。
+        """
+        if not (snapshots := [Dissect.cpu_snapshot(m.group(1)) for m in Dissect.__cpu.finditer(raw)]):
+            return raw, []
+        return Dissect.__cpu.sub(b"", raw), snapshots
+
+    @staticmethod
+    def cpu_snapshot(raw: bytes) -> dict:
+        """
+        解析单个 CPU 快照：/proc/stat 汇总行与若干 /proc/[pid]/stat 行，单位 jiffies（USER_HZ）。
+
+        Parameters
+        ----------
+        raw : bytes
+            快照段原始字节，首行为 `cpu ...` 汇总行，第二行为执行命令的 shell 自身。
+
+        Returns
+        -------
+        dict
+            - total : 全部 CPU 累计时间（user 至 steal 八列之和，guest 已计入 user）。
+            - shell : shell 自身及其已回收子进程的 utime + stime + cutime + cstime。
+            - procs : pid -> utime + stime。
+        """
+        total, shell, procs = 0, None, {}
+        for line in raw.splitlines():
+            if line.startswith(b"cpu "):
+                total = sum(map(int, line.split()[1:9]))
+                continue
+            # comm 可能含空格与括号，以最后一个右括号之后的字段为准
+            if (close := line.rfind(b")")) < 0 or len(rest := line[close + 2:].split()) < 15:
+                continue
+            if shell is None:
+                shell = sum(map(int, rest[11:15]))
+                continue
+            procs[line.split(b" ", 1)[0].decode()] = int(rest[11]) + int(rest[12])
+        return {"total": total, "shell": shell or 0, "procs": procs}
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,428 @@
+#  _   _                  __
+# | | | |_ __  _ __ ___  / _|
+# | |_| | '_ \| '__/ _ \| |_
+# |  _  | |_) | | | (_) |  _|
+# |_| |_| .__/|_|  \___/|_|
+#       |_|
+#
+# ==== Notes: License ====
+# Copyright (c) 2024  Memrix :: 记忆星核
+# This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
+
+import time
+import mmap
+import heapq
+import struct
+import typing
+import numpy as np
+from array import array
+from pathlib import Path
+from loguru import logger
+
+
+class Hprof(object):
+    """
+    HPROF 堆快照流式解析，直接读取 `am dumpheap` 生成的 Android 格式（JAVA PROFILE 1.0.3，无需 hprof-conv），
+    内存映射文件后单遍扫描，产出类直方图、支配者估计以及字符串与 Bitmap 汇总。
+
+    工作集与快照大小无关：
+
+    - 类、字段名与堆名只保留偏移和布局，规模取决于类数量；
+    - 引用关系写入固定大小的哈希表（`buckets` 个槽位），每个槽位记录被引用次数和最后一次引用的来源对象；
+    - 大对象候选以最小堆保留前 `candidates` 个。
+
+    支配者为估计值：从每个大对象出发，沿“唯一引用者”链向上追溯（槽位计数恰为 1 且目标一致），
+    直到遇到多个引用者、GC Root 或深度上限，大对象的浅大小计入链顶对象。
+    哈希冲突只会让计数偏大而中断追溯，结果是保留大小的下界，不会误把对象归到错误的持有者。
+
+    浅大小取类定义的实例大小（缺失时为字段字节数），数组为元素字节数，均不含对象头。
+    """
+
+    # 基本类型编码 -> 字节数（2 为引用，长度取 id size）
+    sizes = {4: 1, 5: 2, 6: 4, 7: 8, 8: 1, 9: 2, 10: 4, 11: 8}
+    arrays = {
+        4: "boolean[]", 5: "char[]", 6: "float[]", 7: "double[]", 8: "byte[]", 9: "short[]", 10: "int[]", 11: "long[]"
+    }
+    # JVM 签名中的基本类型描述符
+    descriptors = {
+        "Z": "boolean", "C": "char", "F": "float", "D": "double", "B": "byte", "S": "short", "I": "int", "J": "long"
+    }
+
+    # GC Root 子记录 -> 除对象 id 外的附加字节数（ROOT_JNI_GLOBAL 附加一个 id，单独处理）
+    roots = {
+        0xFF: 0, 0x02: 8, 0x03: 8, 0x04: 4, 0x05: 0, 0x06: 4, 0x07: 0, 0x08: 8,
+        0x89: 0, 0x8A: 0, 0x8B: 0, 0x8C: 0, 0x8D: 0, 0x8E: 8, 0x90: 0
+    }
+
+    # 需要额外读取 int 字段的类：字符串长度与 Bitmap 宽高
+    probes = {"java.lang.String": ("count",), "android.graphics.Bitmap": ("mWidth", "mHeight")}
+
+    __record = struct.Struct(">BII")
+
+    def __init__(
+        self,
+        hprof_file: typing.Union[str, "Path"],
+        top: int = 20,
+        candidates: int = 1000,
+        buckets: int = 1 << 20,
+        depth: int = 32
+    ):
+        self.hprof_file = Path(hprof_file)
+        self.top, self.candidates, self.depth = top, candidates, depth
+        self.buckets = 1 << max(10, (buckets - 1).bit_length())
+        self.shift = 64 - self.buckets.bit_length() + 1
+
+        self.id_size = 4
+        self.symbols: dict[int, tuple[int, int]] = {}
+        self.names: dict[int, int] = {}
+        # class id -> [super id, 实例大小, [(字段名 id, 类型), ...]]
+        self.classes: dict[int, list] = {}
+        # class id -> (引用字段 Struct, 探测字段 Struct, 探测字段名) 或 None（父类尚未出现）
+        self.layouts: dict[int, typing.Optional[tuple]] = {}
+        self.index: dict[typing.Union[int, str], int] = {}
+        self.keys: list[typing.Union[int, str]] = []
+
+        # (堆, 类) -> [实例数, 浅大小]
+        self.histogram: dict[tuple, list] = {}
+        self.largest: list[tuple] = []
+        self.heap = "default"
+        self.heap_names: dict[int, str] = {}
+        self.objects, self.shallow, self.roots_seen, self.references = 0, 0, 0, 0
+        self.strings, self.string_shallow, self.string_chars = 0, 0, 0
+        self.bitmaps, self.bitmap_shallow, self.bitmap_pixels = 0, 0, 0
+
+        self.counts = np.zeros(self.buckets, dtype=np.uint32)
+        self.targets = np.zeros(self.buckets, dtype=np.uint64)
+        self.parents = np.zeros(self.buckets, dtype=np.uint64)
+        self.owners = np.full(self.buckets, -1, dtype=np.int32)
+        self.__children, self.__referrers, self.__owners = array("Q"), array("Q"), array("l")
+
+    def slot(self, values: "np.ndarray") -> "np.ndarray":
+        """
+        对象 id 的哈希槽位（Fibonacci 哈希，id 按 8 字节对齐先右移）。
+        """
+        return ((values >> np.uint64(3)) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(self.shift)
+
+    def refer(self, children: typing.Iterable[int], parent: int, owner: int) -> None:
+        """
+        缓冲一批引用，满 64K 条时批量写入哈希表。
+        """
+        for child in children:
+            if child:
+                self.__children.append(child)
+                self.__referrers.append(parent)
+                self.__owners.append(owner)
+        if len(self.__children) >= 1 << 16:
+            self.flush()
+
+    def flush(self, children: typing.Optional["np.ndarray"] = None, parent: int = 0, owner: int = -1) -> None:
+        """
+        将缓冲的引用写入哈希表；传入 children 时直接写入一整个对象数组的元素，不经过缓冲。
+        """
+        if children is None:
+            if not self.__children:
+                return None
+            children = np.array(self.__children, dtype=np.uint64)
+            referrers = np.array(self.__referrers, dtype=np.uint64)
+            owners = np.array(self.__owners, dtype=np.int32)
+            self.__children, self.__referrers, self.__owners = array("Q"), array("Q"), array("l")
+        else:
+            children = children[children != 0]
+            referrers = np.full(len(children), parent, dtype=np.uint64)
+            owners = np.full(len(children), owner, dtype=np.int32)
+
+        slots = self.slot(children)
+        np.add.at(self.counts, slots, 1)
+        # 同一槽位多次写入时以最后一次为准，此时计数已大于 1，不会被追溯使用
+        self.targets[slots], self.parents[slots], self.owners[slots] = children, referrers, owners
+        self.references += len(children)
+
+    def key(self, key: typing.Union[int, str]) -> int:
+        """
+        类（class id 或基本类型数组名）的紧凑编号，用于哈希表中的持有者列。
+        """
+        if (number := self.index.get(key)) is None:
+            number = self.index[key] = len(self.keys)
+            self.keys.append(key)
+        return number
+
+    def symbol(self, buffer: "mmap.mmap", sid: int) -> str:
+        """
+        读取字符串记录。
+        """
+        if (entry := self.symbols.get(sid)) is None:
+            return f"0x{sid:x}"
+        offset, length = entry
+        return buffer[offset:offset + length].decode("utf-8", "replace")
+
+    def class_name(self, buffer: "mmap.mmap", key: typing.Union[int, str]) -> str:
+        """
+        类的可读名称，JVM 签名形式（java/lang/String、[Ljava/lang/Object;）统一为点分形式。
+        """
+        if isinstance(key, str):
+            return key
+        if (sid := self.names.get(key)) is None:
+            return f"0x{key:x}"
+        name = self.symbol(buffer, sid)
+        if name.startswith("["):
+            dims = len(name) - len(name.lstrip("["))
+            name = name[dims:]
+            name = name[1:-1] if name.startswith("L") else Hprof.descriptors.get(name, name)
+            name += "[]" * dims
+        return name.replace("/", ".")
+
+    def layout(self, buffer: "mmap.mmap", cid: int) -> typing.Optional[tuple]:
+        """
+        生成实例数据的读取布局：实例字段按“本类、父类、父类的父类……”顺序排列，
+        引用字段与探测字段各编译为一个带填充的 Struct，单次调用取出全部值。
+        """
+        if cid in self.layouts:
+            return self.layouts[cid]
+
+        fields, current = [], cid
+        while current:
+            if (entry := self.classes.get(current)) is None:
+                return None
+            fields.extend(entry[2])
+            current = entry[0]
+
+        wanted = Hprof.probes.get(self.class_name(buffer, cid), ())
+        refs, probe, probed, names = [">"], [">"], [], {}
+        for sid, kind in fields:
+            size = self.id_size if kind == 2 else Hprof.sizes.get(kind, 0)
+            refs.append(("I" if self.id_size == 4 else "Q") if kind == 2 else f"{size}x")
+            name = self.symbol(buffer, sid) if wanted else ""
+            if kind == 10 and name in wanted and name not in names:
+                names[name] = True
+                probe.append("i")
+                probed.append(name)
+            else:
+                probe.append(f"{size}x")
+
+        self.layouts[cid] = layout = (
+            struct.Struct("".join(refs)) if any(c in "IQ" for c in refs[1:]) else None,
+            struct.Struct("".join(probe)) if probed else None, tuple(probed)
+        )
+        return layout
+
+    def tally(self, heap: str, key: typing.Union[int, str], oid: int, size: int) -> None:
+        """
+        计入直方图与大对象候选。
+        """
+        entry = self.histogram.setdefault((heap, key), [0, 0])
+        entry[0] += 1
+        entry[1] += size
+        self.objects += 1
+        self.shallow += size
+        if len(self.largest) < self.candidates:
+            heapq.heappush(self.largest, (size, oid, key))
+        elif size > self.largest[0][0]:
+            heapq.heapreplace(self.largest, (size, oid, key))
+
+    def segment(self, buffer: "mmap.mmap", start: int, end: int) -> None:
+        """
+        扫描一个 HEAP_DUMP / HEAP_DUMP_SEGMENT 记录内的全部子记录。
+        """
+        n = self.id_size
+        ident = struct.Struct(">I" if n == 4 else ">Q")
+        unpack_id = ident.unpack_from
+        instance = struct.Struct(f">{ident.format[1]}I{ident.format[1]}I")
+        obj_array = struct.Struct(f">{ident.format[1]}II{ident.format[1]}")
+        prim_array = struct.Struct(f">{ident.format[1]}IIB")
+        u2, u4 = struct.Struct(">H"), struct.Struct(">I")
+        dtype = np.dtype(">u4" if n == 4 else ">u8")
+
+        at = start
+        while at < end:
+            tag = buffer[at]
+            at += 1
+
+            if tag == 0x21:
+                oid, _, cid, length = instance.unpack_from(buffer, at)
+                data = at + instance.size
+                at = data + length
+                entry = self.classes.get(cid)
+                size = entry[1] if entry and entry[1] else length
+                self.tally(self.heap, cid, oid, size)
+
+                if (layout := self.layout(buffer, cid)) is None:
+                    continue
+                refs, probe, probed = layout
+                if refs is not None and refs.size <= length:
+                    self.refer(refs.unpack_from(buffer, data), oid, self.key(cid))
+                if probe is not None and probe.size <= length:
+                    values = dict(zip(probed, probe.unpack_from(buffer, data)))
+                    if "count" in values:
+                        self.strings += 1
+                        self.string_shallow += size
+                        self.string_chars += max(0, values["count"])
+                    else:
+                        self.bitmaps += 1
+                        self.bitmap_shallow += size
+                        self.bitmap_pixels += max(0, values.get("mWidth", 0)) * max(0, values.get("mHeight", 0))
+
+            elif tag == 0x22:
+                oid, _, count, cid = obj_array.unpack_from(buffer, at)
+                data = at + obj_array.size
+                at = data + count * n
+                self.tally(self.heap, cid, oid, count * n)
+                if count:
+                    self.flush(
+                        np.frombuffer(buffer, dtype=dtype, count=count, offset=data).astype(np.uint64),
+                        oid, self.key(cid)
+                    )
+
+            elif tag == 0x23 or tag == 0xC3:
+                oid, _, count, kind = prim_array.unpack_from(buffer, at)
+                size = count * Hprof.sizes.get(kind, 1)
+                at += prim_array.size + (size if tag == 0x23 else 0)
+                self.tally(self.heap, Hprof.arrays.get(kind, f"0x{kind:x}[]"), oid, size)
+
+            elif tag == 0x20:
+                cid = unpack_id(buffer, at)[0]
+                super_id = unpack_id(buffer, at + n + 4)[0]
+                at += n + 4 + n * 6
+                instance_size = u4.unpack_from(buffer, at)[0]
+                at += 4
+
+                constants, at = u2.unpack_from(buffer, at)[0], at + 2
+                for _ in range(constants):
+                    kind = buffer[at + 2]
+                    at += 3 + (n if kind == 2 else Hprof.sizes.get(kind, 0))
+
+                statics, at = u2.unpack_from(buffer, at)[0], at + 2
+                for _ in range(statics):
+                    kind = buffer[at + n]
+                    if kind == 2:
+                        self.refer((unpack_id(buffer, at + n + 1)[0],), cid, self.key(cid))
+                    at += n + 1 + (n if kind == 2 else Hprof.sizes.get(kind, 0))
+
+                fields, at = u2.unpack_from(buffer, at)[0], at + 2
+                self.classes[cid] = [super_id, instance_size, [
+                    (unpack_id(buffer, at + i * (n + 1))[0], buffer[at + i * (n + 1) + n]) for i in range(fields)
+                ]]
+                at += fields * (n + 1)
+
+            elif tag == 0x01:
+                self.refer((unpack_id(buffer, at)[0],), 0, -1)
+                self.roots_seen += 1
+                at += n * 2
+
+            elif tag in Hprof.roots:
+                self.refer((unpack_id(buffer, at)[0],), 0, -1)
+                self.roots_seen += 1
+                at += n + Hprof.roots[tag]
+
+            elif tag == 0xFE:
+                heap_id, sid = u4.unpack_from(buffer, at)[0], unpack_id(buffer, at + 4)[0]
+                self.heap = self.heap_names.setdefault(heap_id, self.symbol(buffer, sid))
+                at += 4 + n
+
+            else:
+                logger.warning(f"Unknown hprof sub-record 0x{tag:02x} at {at - 1}, segment skipped")
+                return None
+
+    def dominators(self, buffer: "mmap.mmap") -> list[dict]:
+        """
+        沿唯一引用者链追溯大对象的持有者，汇总出保留大小前 `top` 的支配者估计。
+        """
+        if not self.largest:
+            return []
+
+        retained: dict[int, list] = {}
+        for size, oid, key in self.largest:
+            node, owner, seen = oid, key, {oid}
+            for _ in range(self.depth):
+                slot = int(self.slot(np.array([node], dtype=np.uint64))[0])
+                if self.counts[slot] != 1 or int(self.targets[slot]) != node:
+                    break
+                parent = int(self.parents[slot])
+                if not parent or parent in seen:
+                    break
+                node, owner = parent, self.keys[int(self.owners[slot])]
+                seen.add(node)
+            entry = retained.setdefault(node, [owner, 0, 0])
+            entry[1] += size
+            entry[2] += 1
+
+        ranked = sorted(retained.items(), key=lambda item: item[1][1], reverse=True)[:self.top]
+        return [
+            {
+                "rank": rank,
+                "object": f"0x{oid:x}",
+                "class": ("class " if oid in self.classes else "") + self.class_name(
+                    buffer, oid if oid in self.classes else owner
+                ),
+                "retained": total,
+                "members": members
+            } for rank, (oid, (owner, total, members)) in enumerate(ranked, start=1)
+        ]
+
+    def parse(self) -> dict:
+        """
+        单遍解析快照，阻塞调用，应通过 `asyncio.to_thread` 调用。
+
+        Returns
+        -------
+        dict
+            - summary    : 汇总（objects、shallow、classes、roots、refs、strings、string_shallow、string_chars、
+                           bitmaps、bitmap_shallow、bitmap_bytes、heaps、elapsed），字节数为 B，elapsed 为 ms；
+                           bitmap_bytes 按 ARGB_8888 以宽 × 高 × 4 估算像素内存（Android 8.0 起位于 native 堆）。
+            - classes    : 类直方图 [{"heap", "class", "instances", "shallow"}, ...]，按浅大小降序。
+            - dominators : 支配者估计 [{"rank", "object", "class", "retained", "members"}, ...]。
+        """
+        begin = time.perf_counter()
+        with open(self.hprof_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if not buffer[:12].startswith(b"JAVA PROFILE"):
+                raise ValueError(f"Not an hprof file: {self.hprof_file}")
+
+            at = buffer.find(b"\0") + 1
+            self.id_size = struct.unpack_from(">I", buffer, at)[0]
+            if self.id_size not in (4, 8):
+                raise ValueError(f"Unsupported hprof id size {self.id_size}: {self.hprof_file}")
+            at += 12
+
+            n, size = self.id_size, len(buffer)
+            ident = struct.Struct(">I" if n == 4 else ">Q")
+            while at + Hprof.__record.size <= size:
+                tag, _, length = Hprof.__record.unpack_from(buffer, at)
+                body = at + Hprof.__record.size
+                if body + length > size:
+                    logger.warning(f"Truncated hprof record 0x{tag:02x} at {at}: {self.hprof_file.name}")
+                    break
+                if tag == 0x01:
+                    self.symbols[ident.unpack_from(buffer, body)[0]] = (body + n, length - n)
+                elif tag == 0x02:
+                    self.names[ident.unpack_from(buffer, body + 4)[0]] = ident.unpack_from(buffer, body + 8 + n)[0]
+                elif tag in (0x0C, 0x1C):
+                    self.segment(buffer, body, body + length)
+                at = body + length
+
+            self.flush()
+            dominators = self.dominators(buffer)
+            classes = sorted(
+                (
+                    {"heap": heap, "class": self.class_name(buffer, key), "instances": count, "shallow": shallow}
+                    for (heap, key), (count, shallow) in self.histogram.items()
+                ), key=lambda row: row["shallow"], reverse=True
+            )
+
+        heaps: dict[str, int] = {}
+        for row in classes:
+            heaps[row["heap"]] = heaps.get(row["heap"], 0) + row["shallow"]
+
+        return {
+            "summary": {
+                "objects": self.objects, "shallow": self.shallow, "classes": len({row["class"] for row in classes}),
+                "roots": self.roots_seen, "refs": self.references,
+                "strings": self.strings, "string_shallow": self.string_shallow, "string_chars": self.string_chars,
+                "bitmaps": self.bitmaps, "bitmap_shallow": self.bitmap_shallow, "bitmap_bytes": self.bitmap_pixels * 4,
+                "heaps": heaps, "elapsed": round((time.perf_counter() - begin) * 1000, 2)
+            },
+            "classes": classes,
+            "dominators": dominators
+        }
+
+
+if __name__ == '__main__':
+    pass
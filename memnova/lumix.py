@@ -8,6 +8,7 @@
 # Copyright (c) 2024  Memrix :: 记忆星核
 # This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
 
+import typing
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -17,6 +18,7 @@ from matplotlib.dates import (
     AutoDateLocator, ConciseDateFormatter
 )
 from loguru import logger
+from engine.tinker import Period
 
 
 class Lumix(object):
@@ -26,7 +28,7 @@ class Lumix(object):
 
     @staticmethod
     def draw_mem_metrics(
-        mem_data: list[dict],
+        mem_data: typing.Union[list[dict], dict[str, "np.ndarray"]],
         output_path: str,
         *_,
         **kwargs
@@ -36,8 +38,8 @@ class Lumix(object):
 
         Parameters
         ----------
-        mem_data : list[dict]
-            内存数据列表，每条记录包含时间戳、内存值（PSS、RSS、USS）、模式（前台/后台）、堆内存等信息。
+        mem_data : list[dict] or dict[str, np.ndarray]
+            内存数据记录列表或列字典，包含时间戳、内存值（PSS、RSS、USS）、模式（前台/后台）、堆内存等信息。
 
         output_path : str
             输出图片的保存路径（包含文件名和扩展名）。
@@ -49,7 +51,7 @@ class Lumix(object):
         """
         df = pd.DataFrame(mem_data)
 
-        df.loc[:, "x"] = pd.to_datetime(df["timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+        df.loc[:, "x"] = pd.to_datetime(df["timestamp"] + Period.local_offset(), unit="ms", errors="coerce")
         df = df.dropna(subset=["x"])
         df.loc[:, "pss"] = pd.to_numeric(df["pss"], errors="coerce")
         df = df.dropna(subset=["pss"])
@@ -363,7 +365,7 @@ class Lumix(object):
 
     @staticmethod
     def draw_io_metrics(
-        io_data: list[dict],
+        io_data: typing.Union[list[dict], dict[str, "np.ndarray"]],
         output_path: str,
         *_,
         **kwargs
@@ -373,8 +375,8 @@ class Lumix(object):
 
         Parameters
         ----------
-        io_data : list[dict]
-            I/O 采样数据列表，每条记录包含时间戳、读写字节量、字符数、系统调用次数等。
+        io_data : list[dict] or dict[str, np.ndarray]
+            I/O 采样数据记录列表或列字典，包含时间戳、读写字节量、字符数、系统调用次数等。
 
         output_path : str
             输出图片的保存路径（包含文件名和扩展名）。
@@ -387,7 +389,7 @@ class Lumix(object):
         df = pd.DataFrame(io_data)
 
         # 🔵 ==== 时间轴 ====
-        ts = pd.to_datetime(df["timestamp"], errors="coerce")
+        ts = pd.to_datetime(df["timestamp"] + Period.local_offset(), unit="ms", errors="coerce")
         ts = ts.ffill().bfill()
 
         # 🔵 ==== 中位采样周期 ====
@@ -9,11 +9,557 @@
 # This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
 
 import math
+import typing
 import numpy as np
 import pandas as pd
-from scipy.stats import (
-    linregress, zscore
-)
+
+
+class Trend(object):
+    """
+    流式内存趋势累加器，按批次增量计算统计量、线性/二阶拟合与滑动窗口斜率。
+
+    每批数据只更新固定数量的中间量（合并式均值与协方差、多项式幂和、窗口尾部缓冲），
+    内存占用与序列长度无关，适用于长时间采样数据的分块评分。
+
+    横轴默认为样本序号；调度跳过截止时间或采样时间抖动时，可传入以计划周期为单位的实际采样位置，
+    斜率仍表示“每个计划周期的变化量”，但不再因样本间隔不等而偏斜。
+
+    自适应采样在波动处加密、平稳处放疏，样本密度不均；可为每个样本传入其代表的时长作为权重，
+    均值、方差与拟合均按加权最小二乘计算，避免加密区段主导整体趋势。滑动窗口斜率描述局部形态，不加权。
+
+    Parameters
+    ----------
+    window : int, optional
+        滑动窗口大小，用于计算局部斜率变化趋势，默认值为 30。
+    """
+
+    def __init__(self, window: int = 30):
+        self.window = window
+        self.count, self.weight = 0, 0.0
+        self.invalid = False
+
+        # 合并式统计量（Chan 并行算法），避免大样本下的精度损失
+        self.mean_x, self.mean_y = 0.0, 0.0
+        self.m2_x, self.m2_y, self.c_xy = 0.0, 0.0, 0.0
+        self.peak, self.floor = -math.inf, math.inf
+
+        # 二阶多项式正规方程所需的幂和，y 以首个样本为原点平移以降低抵消误差
+        self.origin = None
+        self.moments = np.zeros(5)
+        self.cross = np.zeros(3)
+        self.square = 0.0
+
+        # 滑动窗口斜率
+        self.tail, self.tail_x = np.empty(0), np.empty(0)
+        self.last_x = 0.0
+        self.slope_count, self.slope_sum = 0, 0.0
+        self.slope_max, self.slope_min = -math.inf, math.inf
+
+    def feed(
+        self,
+        values: typing.Union[list, "np.ndarray"],
+        x: typing.Optional[typing.Union[list, "np.ndarray"]] = None,
+        w: typing.Optional[typing.Union[list, "np.ndarray"]] = None
+    ) -> None:
+        """
+        追加一批按时间顺序排列的采样值。
+
+        Parameters
+        ----------
+        values : list or np.ndarray
+            采样值。
+
+        x : list or np.ndarray, optional
+            各样本的横轴位置（以计划周期为单位，自 0 起递增）；缺省时使用样本序号。
+
+        w : list or np.ndarray, optional
+            各样本的权重（以计划周期为单位的代表时长）；缺省时等权。
+        """
+        if (values := np.asarray(values, dtype=np.float64)).size == 0:
+            return None
+
+        if np.isnan(values).any():
+            self.invalid = True
+            return None
+
+        n_a, n_b = self.count, values.size
+        x = np.arange(n_a, n_a + n_b, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+        w = np.ones(n_b) if w is None else np.asarray(w, dtype=np.float64)
+        self.last_x = float(x[-1])
+
+        # 🟨 ==== 合并统计 ====
+        w_a, w_b = self.weight, float(w.sum())
+        mx, my = (w @ x) / w_b, (w @ values) / w_b
+        dx, dy = x - mx, values - my
+        total = w_a + w_b
+        delta_x, delta_y = mx - self.mean_x, my - self.mean_y
+        weight = w_a * w_b / total
+        self.m2_x += (w * dx) @ dx + delta_x * delta_x * weight
+        self.m2_y += (w * dy) @ dy + delta_y * delta_y * weight
+        self.c_xy += (w * dx) @ dy + delta_x * delta_y * weight
+        self.mean_x += delta_x * w_b / total
+        self.mean_y += delta_y * w_b / total
+        self.peak = max(self.peak, float(values.max()))
+        self.floor = min(self.floor, float(values.min()))
+        self.count, self.weight = n_a + n_b, total
+
+        # 🟨 ==== 多项式幂和 ====
+        if self.origin is None:
+            self.origin = float(values[0])
+        y = values - self.origin
+        powers = x ** np.arange(5)[:, None]
+        self.moments += powers @ w
+        self.cross += powers[:3] @ (w * y)
+        self.square += (w * y) @ y
+
+        # 🟨 ==== 窗口斜率 ====
+        if not self.window:
+            return None
+        seq, seq_x = np.concatenate([self.tail, values]), np.concatenate([self.tail_x, x])
+        if seq.size >= self.window:
+            # 以窗口内首个位置为原点，由前缀和求每个窗口的最小二乘斜率，不要求等间隔
+            w = self.window
+            xs = seq_x - seq_x[0]
+            sums = [np.concatenate([[0.0], np.cumsum(v)]) for v in (xs, seq, xs * seq, xs * xs)]
+            sx, sy, sxy, sxx = (c[w:] - c[:-w] for c in sums)
+            denominator = w * sxx - sx * sx
+            slopes = np.divide(
+                w * sxy - sx * sy, denominator, out=np.zeros_like(denominator), where=denominator > 0
+            )
+            self.slope_count += slopes.size
+            self.slope_sum += float(slopes.sum())
+            self.slope_max = max(self.slope_max, float(slopes.max()))
+            self.slope_min = min(self.slope_min, float(slopes.min()))
+        if self.window > 1:
+            self.tail, self.tail_x = seq[-(self.window - 1):], seq_x[-(self.window - 1):]
+
+    def polyfit(self) -> tuple[list, float]:
+        """
+        由累计幂和求解二阶多项式拟合，返回 ([a, b, c], R²)，系数对应公式 ax² + bx + c。
+        """
+        scale = max(self.last_x, 1.0)
+        factor = float(scale) ** np.arange(5)
+        moments, cross = self.moments / factor, self.cross / factor[:3]
+
+        matrix = np.array([moments[i:i + 3] for i in range(3)])
+        c0, c1, c2 = coef = np.linalg.solve(matrix, cross)
+
+        ss_res = max(self.square - 2 * coef @ cross + coef @ matrix @ coef, 0.0)
+        poly_r2 = 1.0 - ss_res / self.m2_y if self.m2_y != 0 else 0.0
+
+        return [c2 / scale ** 2, c1 / scale, c0 + self.origin], poly_r2
+
+    def finish(self, r2_threshold: float = 0.5, slope_threshold: float = 0.01) -> dict:
+        """
+        汇总累加结果并生成结构化评分，字段与 `Orbis.analyze_mem_score` 一致。
+        """
+
+        # 🟨 ==== 默认结果 ====
+        result = {
+            "trend": "N/A",
+            "trend_score": 0.0,
+            "jitter_index": 0.0,
+            "r_squared": 0.0,
+            "slope": 0.0,
+            "avg": 0.0,
+            "max": 0.0,
+            "min": 0.0,
+            "color": "#BBBBBB",
+            "poly_trend": "-",
+            "poly_r2": 0.0,
+            "poly_coef": [],
+            "window_slope": None,
+            "window_slope_max": None,
+            "window_slope_min": None
+        }
+
+        # 🟨 ==== 数据校验 ====
+        if self.invalid:
+            return {**result, "trend": "Invalid Data"}
+
+        if self.count < 10:
+            return {**result, "trend": "Few Data"}
+
+        # 🟨 ==== 基础统计 ====
+        avg_val = self.mean_y
+        max_val = self.peak
+        min_val = self.floor
+
+        # 🟨 ==== 抖动指数 ====
+        jitter_index = round(math.sqrt(self.m2_y / self.weight) / (avg_val or 1e-6), 4)
+
+        # 🟨 ==== 线性拟合 ====
+        slope = self.c_xy / self.m2_x
+        r_val = self.c_xy / math.sqrt(self.m2_x * self.m2_y) if self.m2_y > 0 else 0.0
+        r_squared = round(min(r_val ** 2, 1.0), 4)
+        slope = round(slope, 4)
+
+        # 🟨 ==== 二阶多项式拟合 ====
+        try:
+            poly_coef, poly_r2 = self.polyfit()
+            poly_r2 = round(poly_r2, 4)
+
+            if abs(poly_coef[0]) < 1e-8: poly_trend = "Linear ~"
+            elif poly_coef[0] > 0: poly_trend = "U-shape ↑↓"
+            else: poly_trend = "∩-shape ↓↑"
+
+        except (np.linalg.LinAlgError, ValueError):
+            poly_coef = [0.0, 0.0, 0.0]
+            poly_r2 = 0.0
+            poly_trend = "-"
+
+        # 🟨 ==== 滑动窗口趋势分析 ====
+        window_slope, window_slope_max, window_slope_min = None, None, None
+        if self.slope_count:
+            window_slope = round(self.slope_sum / self.slope_count, 4)
+            window_slope_max = round(self.slope_max, 4)
+            window_slope_min = round(self.slope_min, 4)
+
+        # 🟨 ==== 趋势判断 ====
+        if r_squared < r2_threshold:
+            trend = "Wave ~"
+            color = "#999999"
+            score = 0.0
+        elif slope > slope_threshold:
+            trend = "Upward ↑"
+            color = "#FF3333"
+            score = min(round(slope * r_squared * 10, 4), 1.0)
+        elif slope < -slope_threshold:
+            trend = "Downward ↓"
+            color = "#33CC66"
+            score = -min(round(abs(slope) * r_squared * 10, 4), 1.0)
+        else:
+            trend = "Stable →"
+            color = "#FFA500"
+            score = 0.3
+
+        # 🟨 ==== 综合输出 ====
+        return {
+            "trend": trend,
+            "trend_score": score,
+            "jitter_index": jitter_index,
+            "r_squared": r_squared,
+            "slope": slope,
+            "avg": avg_val,
+            "max": max_val,
+            "min": min_val,
+            "color": color,
+            "poly_trend": poly_trend,
+            "poly_r2": poly_r2,
+            "poly_coef": [round(c, 6) for c in poly_coef],
+            "window_slope": window_slope,
+            "window_slope_max": window_slope_max,
+            "window_slope_min": window_slope_min
+        }
+
+
+class Flux(object):
+    """
+    流式 I/O 评分累加器，按批次增量统计读写增量、系统调用与 Swap，内存占用与序列长度无关。
+
+    读写突发阈值取决于整体四分位数，系统调用突发取决于整体均值与标准差，空闲判定取决于整体采样周期，
+    这些量只有看完整段序列才能确定；因此分两遍：`feed` 累计分布（读写增量以对数分桶近似分位数），
+    `recount` 按最终阈值重新计数，两遍各自流式读取一次即可。
+
+    Parameters
+    ----------
+    rw_peak_threshold : float, default=100.0
+        读写峰值判定阈值（MB）。
+
+    idle_threshold : float, default=0.01
+        空闲判定阈值（MB/s）。
+
+    swap_threshold : float, default=10.0
+        Swap 突发判定阈值（MB）。
+
+    sys_burst_z : float, default=2.5
+        系统调用突发的 z-score 阈值。
+    """
+
+    io_cols = ["read_bytes", "write_bytes", "rchar", "wchar", "syscr", "syscw"]
+
+    # 读写增量分桶：0 单独计数，正值按 0.1% 的相对宽度对数分桶
+    floor, ratio, buckets = 1e-9, 1.001, 41500
+
+    def __init__(
+        self,
+        rw_peak_threshold: float = 100.0,
+        idle_threshold: float = 0.01,
+        swap_threshold: float = 10.0,
+        sys_burst_z: float = 2.5
+    ):
+        self.rw_peak_threshold = rw_peak_threshold
+        self.idle_threshold = idle_threshold
+        self.swap_threshold = swap_threshold
+        self.sys_burst_z = sys_burst_z
+
+        self.count = 0
+        # 两遍各自保留上一批的末行，跨批次差分
+        self.last, self.again = None, None
+        self.prev_ts = None
+        # 采样间隔（ms）的计数，求中位数
+        self.gaps: dict[int, int] = {}
+
+        # 读写增量的合并式统计与对数分桶
+        self.rw_count, self.rw_mean, self.rw_m2, self.rw_peak = 0, 0.0, 0.0, 0.0
+        self.rw_zeros, self.rw_hist = 0, np.zeros(self.buckets, dtype=np.int64)
+
+        # 系统调用增量的合并式统计 [count, mean, m2]
+        self.sys = {col: [0, 0.0, 0.0] for col in ("syscr", "syscw")}
+
+        self.swap_max, self.swap_over = -math.inf, 0
+
+        # 第二遍计数
+        self.rw_burst_th, self.sample_seconds = None, None
+        self.rw_over, self.idle, self.sys_events = 0, 0, {"syscr": 0, "syscw": 0}
+
+    def deltas(self, batch: dict[str, "np.ndarray"], last: typing.Optional[dict]) -> tuple[dict, dict]:
+        """
+        将累计计数转换为逐样本增量（首个样本为 0，负值与缺失记为 0），返回 (增量, 本批末行)。
+        """
+        values = {col: np.asarray(batch[col], dtype=np.float64) for col in self.io_cols}
+        deltas = {}
+        for col, v in values.items():
+            d = np.diff(v, prepend=v[0] if last is None else last[col])
+            deltas[col] = np.clip(np.nan_to_num(d, nan=0.0), 0.0, None)
+        return deltas, {col: v[-1] for col, v in values.items()}
+
+    @staticmethod
+    def merge(stats: list, values: "np.ndarray") -> None:
+        """
+        以 Chan 并行算法把一批样本合并进 [count, mean, m2]。
+        """
+        n_a, n_b = stats[0], values.size
+        if n_b == 0:
+            return None
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        total = n_a + n_b
+        delta = mean_b - stats[1]
+        stats[1] += delta * n_b / total
+        stats[2] += m2_b + delta * delta * n_a * n_b / total
+        stats[0] = total
+
+    def quantile(self, q: float) -> float:
+        """
+        由分桶计数近似求分位数（与 `np.percentile` 的线性插值一致，桶内取几何中点）。
+        """
+        cumulative = np.cumsum(self.rw_hist)
+
+        def value_at(rank: int) -> float:
+            if rank < self.rw_zeros:
+                return 0.0
+            index = int(np.searchsorted(cumulative, rank - self.rw_zeros, side="right"))
+            return self.floor * self.ratio ** (index + 0.5)
+
+        position = q * (self.rw_count - 1)
+        lower, upper = math.floor(position), math.ceil(position)
+        low_value, high_value = value_at(lower), value_at(upper)
+        return low_value + (high_value - low_value) * (position - lower)
+
+    def feed(self, batch: dict[str, "np.ndarray"]) -> None:
+        """
+        第一遍：追加一批按时间升序排列的 I/O 样本（`Cubicle.stream_io` 的列字典）。
+        """
+        if (n := len(batch.get("timestamp", []))) == 0:
+            return None
+
+        deltas, self.last = self.deltas(batch, self.last)
+        self.count += n
+
+        # 🟦 ==== 采样周期 ====
+        ts = np.asarray(batch["timestamp"], dtype=np.float64)
+        gaps = np.diff(ts, prepend=np.nan if self.prev_ts is None else self.prev_ts)
+        for gap, times in zip(*np.unique(gaps[gaps > 0].astype(np.int64), return_counts=True)):
+            self.gaps[int(gap)] = self.gaps.get(int(gap), 0) + int(times)
+        self.prev_ts = ts[-1]
+
+        # 🟦 ==== 读写分布 ====
+        rw = np.r_[deltas["read_bytes"], deltas["write_bytes"]]
+        stats = [self.rw_count, self.rw_mean, self.rw_m2]
+        self.merge(stats, rw)
+        self.rw_count, self.rw_mean, self.rw_m2 = stats
+        self.rw_peak = max(self.rw_peak, float(rw.max()))
+        positive = rw[rw > 0]
+        self.rw_zeros += rw.size - positive.size
+        index = np.floor(np.log(np.maximum(positive, self.floor) / self.floor) / math.log(self.ratio))
+        self.rw_hist += np.bincount(
+            np.clip(index, 0, self.buckets - 1).astype(np.int64), minlength=self.buckets
+        )
+
+        # 🟦 ==== 系统调用 ====
+        for col, stats in self.sys.items():
+            self.merge(stats, deltas[col])
+
+        # 🟦 ==== Swap ====
+        swap = np.asarray(batch["swap"], dtype=np.float64)
+        self.swap_max = max(self.swap_max, float(swap.max()))
+        self.swap_over += int(np.sum(swap > float(self.swap_threshold)))
+
+    def settle(self) -> None:
+        """
+        第一遍结束后确定读写突发阈值与采样周期，之后才能调用 `recount`。
+        """
+        if self.gaps:
+            gaps, times = np.array(sorted(self.gaps.items()), dtype=np.float64).T
+            cumulative, total = np.cumsum(times), times.sum()
+            middle = [
+                int(np.searchsorted(cumulative, rank, side="right")) for rank in ((total - 1) // 2, total // 2)
+            ]
+            self.sample_seconds = float(gaps[middle].mean()) / 1000
+
+        if self.rw_count:
+            q1, q3 = self.quantile(0.25), self.quantile(0.75)
+            if (iqr := max(q3 - q1, 0.0)) > 0.0:
+                self.rw_burst_th = q3 + 1.5 * iqr
+            else:
+                std = math.sqrt(self.rw_m2 / (self.rw_count - 1)) if self.rw_count > 1 else math.nan
+                self.rw_burst_th = self.rw_mean + std
+        else:
+            self.rw_burst_th = math.inf
+
+    def recount(self, batch: dict[str, "np.ndarray"]) -> None:
+        """
+        第二遍：按 `settle` 得出的阈值重新计数读写突发、空闲样本与系统调用突发。
+        """
+        if len(batch.get("timestamp", [])) == 0:
+            return None
+        if self.rw_burst_th is None:
+            self.settle()
+
+        deltas, self.again = self.deltas(batch, self.again)
+
+        # 🟦 ==== 爆发段 ====
+        if math.isfinite(self.rw_burst_th):
+            self.rw_over += int(np.sum(deltas["read_bytes"] > self.rw_burst_th))
+            self.rw_over += int(np.sum(deltas["write_bytes"] > self.rw_burst_th))
+
+        # 🟦 ==== Idle段 ====
+        io_sum = deltas["read_bytes"] + deltas["write_bytes"] + deltas["rchar"] + deltas["wchar"]
+        if self.sample_seconds and self.sample_seconds > 0:
+            # 以 MB/s 判定空闲 -> io_sum / T < idle_threshold
+            self.idle += int(np.sum((io_sum / self.sample_seconds) < self.idle_threshold))
+        else:
+            # 以 MB/. 判定空闲
+            self.idle += int(np.sum(io_sum < self.idle_threshold))
+
+        # 🟦 ==== 系统调用突变 ====
+        for col, (count, mean, m2) in self.sys.items():
+            if count > 1 and (std := math.sqrt(m2 / (count - 1))) > 0:
+                self.sys_events[col] += int(np.sum((deltas[col] - mean) / std > self.sys_burst_z))
+
+    def finish(self) -> dict:
+        """
+        汇总两遍的累加结果并生成结构化评分，字段与 `Orbis.analyze_io_score` 一致。
+        """
+
+        # 🟦 ==== 默认结果 ====
+        result = {
+            "swap_status": "PASS",
+            "swap_max_mb": 0.0,
+            "swap_burst_ratio": 0.0,
+            "swap_burst_count": 0,
+            "rw_peak_mb": 0.0,
+            "rw_std_mb": 0.0,
+            "rw_burst_ratio": 0.0,
+            "rw_idle_ratio": 0.0,
+            "sys_burst": 0.0,
+            "sys_burst_events": 0,
+            "tags": [],
+            "risk": [],
+            "score": 100,
+            "grade": "S"
+        }
+
+        # 🟦 ==== 数据校验 ====
+        if self.count < 10:
+            return {**result, "swap_status": "Few Data"}
+        if self.rw_burst_th is None:
+            self.settle()
+
+        # 🟦 ==== 惩罚权重 ====
+        penalty_map = {
+            "rw_peak_high": 15,
+            "rw_burst": 10,
+            "rw_idle": 10,
+            "sys_burst": 5,
+            "swap_burst": 20
+        }
+
+        # 🟦 ==== RW峰值与抖动 ====
+        rw_peak = self.rw_peak
+        rw_std = math.sqrt(self.rw_m2 / (self.rw_count - 1)) if self.rw_count > 1 else 0.0
+        result["rw_peak_mb"] = round(rw_peak, 2)
+        result["rw_std_mb"] = round(rw_std, 2)
+
+        # 🟦 ==== 爆发段 ====
+        rw_burst_ratio = self.rw_over / self.rw_count if math.isfinite(self.rw_burst_th) else 0.0
+        result["rw_burst_ratio"] = round(min(max(rw_burst_ratio, 0.0), 1.0), 4)
+
+        # 🟦 ==== Idle段 ====
+        result["rw_idle_ratio"] = round(min(max(self.idle / self.count, 0.0), 1.0), 4)
+
+        # 🟦 ==== 系统调用突变 ====
+        result["sys_burst_events"] = int(sum(self.sys_events.values()))
+        result["sys_burst"] = int(sum(bursts > 0 for bursts in self.sys_events.values()))
+
+        # 🟦 ==== Swap爆发 ====
+        swap_max = self.swap_max if math.isfinite(self.swap_max) else 0.0
+        result["swap_max_mb"] = round(swap_max, 2)
+        result["swap_burst_ratio"] = round(self.swap_over / self.count, 4)
+        result["swap_burst_count"] = self.swap_over
+
+        if swap_max > self.swap_threshold * 2: result["swap_status"] = "FAIL"
+        elif swap_max > self.swap_threshold: result["swap_status"] = "WARN"
+        else: result["swap_status"] = "PASS"
+
+        # 🟦 ==== 标签统计 ====
+        penalties, tags, risk = 0, [], []
+
+        # Notes: 可能是大文件 I / O 或突发读写导致。
+        if rw_peak > self.rw_peak_threshold:
+            penalties += penalty_map["rw_peak_high"]
+            tags.append("rw_peak_high")
+            risk.append("RW Peak High")
+
+        # Notes: I/O 不稳定，可能是后台任务反复读写。
+        if result["rw_burst_ratio"] > 0.10:
+            penalties += penalty_map["rw_burst"]
+            tags.append("rw_burst")
+            risk.append("RW Burst")
+
+        # Notes: I/O 资源利用率低，可能等待或阻塞严重。
+        if result["rw_idle_ratio"] > 0.40:
+            penalties += penalty_map["rw_idle"]
+            tags.append("rw_idle")
+            risk.append("IO Idle")
+
+        # Notes: 短时间内频繁系统调用，可能是异常轮询或批量 I/O。
+        if result["sys_burst_events"] > 3:
+            penalties += penalty_map["sys_burst"]
+            tags.append("sys_burst")
+            risk.append("Sys Burst")
+
+        # Notes: 物理内存不足或内存泄漏，导致频繁换页。
+        if result["swap_status"] in ("WARN", "FAIL"):
+            penalties += penalty_map["swap_burst"]
+            tags.append("swap_burst")
+            risk.append("Swap Burst")
+
+        # 🟦 ==== 综合输出 ====
+        score = max(100 - penalties, 0)
+        result["score"] = int(score)
+        result["tags"] = tags
+        result["risk"] = risk
+
+        if score >= 95: result["grade"] = "S"
+        elif score >= 90: result["grade"] = "A"
+        elif score >= 80: result["grade"] = "B"
+        elif score >= 70: result["grade"] = "C"
+        elif score >= 60: result["grade"] = "D"
+        else: result["grade"] = "E"
+
+        return result
 
 
 class Orbis(object):
@@ -146,124 +692,15 @@ class Orbis(object):
 
         Notes
         -----
-        - 建议输入等间隔采样的内存使用序列，采样长度不少于 10。
+        - 输入按样本序号作为横轴，即假定等间隔采样，采样长度不少于 10；间隔不等时使用 `Trend.feed` 传入实际采样位置。
         - 若输入数据波动剧烈或噪声较多，开启异常剔除可提升趋势识别准确性。
         - 趋势评分可作为内存泄漏、回收抖动等问题的辅助判据。
+        - 长序列可直接使用 `Trend` 分批累加，结果与本函数一致。
         """
 
-        # 🟨 ==== 默认结果 ====
-        result = {
-            "trend": "N/A",
-            "trend_score": 0.0,
-            "jitter_index": 0.0,
-            "r_squared": 0.0,
-            "slope": 0.0,
-            "avg": 0.0,
-            "max": 0.0,
-            "min": 0.0,
-            "color": "#BBBBBB",
-            "poly_trend": "-",
-            "poly_r2": 0.0,
-            "poly_coef": [],
-            "window_slope": None,
-            "window_slope_max": None,
-            "window_slope_min": None
-        }
-
-        # 🟨 ==== 数据校验 ====
-        if np.isnan(values := np.array(mem_part, dtype=float)).any():
-            return {**result, "trend": "Invalid Data"}
-
-        if len(values) < 10:
-            return {**result, "trend": "Few Data"}
-
-        # 🟨 ==== 基础统计 ====
-        avg_val = values.mean()
-        max_val = values.max()
-        min_val = values.min()
-
-        # 🟨 ==== 抖动指数 ====
-        jitter_index = round(values.std() / (avg_val or 1e-6), 4)
-
-        # 🟨 ==== 线性拟合 ====
-        x = np.arange(len(values))
-        slope, intercept, r_val, _, _ = linregress(x, values)
-        r_squared = round(r_val ** 2, 4)
-        slope = round(slope, 4)
-
-        # 🟨 ==== 二阶多项式拟合 ====
-        try:
-            x = np.asarray(x, dtype=np.float64)
-            values = np.asarray(values, dtype=np.float64)
-
-            poly_coef = np.polyfit(x, values, deg=2)
-            poly_func = np.poly1d(poly_coef)
-            fitted = poly_func(x)
-
-            ss_res = np.sum(np.square(values - fitted))
-            ss_tot = np.sum(np.square(values - np.mean(values)))
-            poly_r2 = 1.0 - ss_res / ss_tot if ss_tot != 0 else 0.0
-            poly_r2 = round(poly_r2, 4)
-
-            if abs(poly_coef[0]) < 1e-8: poly_trend = "Linear ~"
-            elif poly_coef[0] > 0: poly_trend = "U-shape ↑↓"
-            else: poly_trend = "∩-shape ↓↑"
-
-        except (np.linalg.LinAlgError, ValueError):
-            poly_coef = [0.0, 0.0, 0.0]
-            poly_r2 = 0.0
-            poly_trend = "-"
-
-        # 🟨 ==== 滑动窗口趋势分析 ====
-        window_slope, window_slope_max, window_slope_min = None, None, None
-        if window and len(values) >= window:
-            slopes = []
-            for i in range(0, len(values) - window + 1):
-                segment = values[i:i + window]
-                xw = np.arange(window)
-                s, _, _, _, _ = linregress(xw, segment)
-                slopes.append(s)
-            if slopes:
-                window_slope = round(np.mean(slopes), 4)
-                window_slope_max = round(np.max(slopes), 4)
-                window_slope_min = round(np.min(slopes), 4)
-
-        # 🟨 ==== 趋势判断 ====
-        if r_squared < r2_threshold:
-            trend = "Wave ~"
-            color = "#999999"
-            score = 0.0
-        elif slope > slope_threshold:
-            trend = "Upward ↑"
-            color = "#FF3333"
-            score = min(round(slope * r_squared * 10, 4), 1.0)
-        elif slope < -slope_threshold:
-            trend = "Downward ↓"
-            color = "#33CC66"
-            score = -min(round(abs(slope) * r_squared * 10, 4), 1.0)
-        else:
-            trend = "Stable →"
-            color = "#FFA500"
-            score = 0.3
-
-        # 🟨 ==== 综合输出 ====
-        return {
-            "trend": trend,
-            "trend_score": score,
-            "jitter_index": jitter_index,
-            "r_squared": r_squared,
-            "slope": slope,
-            "avg": avg_val,
-            "max": max_val,
-            "min": min_val,
-            "color": color,
-            "poly_trend": poly_trend,
-            "poly_r2": poly_r2,
-            "poly_coef": [round(c, 6) for c in poly_coef],
-            "window_slope": window_slope,
-            "window_slope_max": window_slope_max,
-            "window_slope_min": window_slope_min
-        }
+        trend = Trend(window)
+        trend.feed(mem_part)
+        return trend.finish(r2_threshold, slope_threshold)
 
     # Workflow: ======================== GFX ========================
 
@@ -486,7 +923,7 @@ class Orbis(object):
 
     @staticmethod
     def analyze_io_score(
-        io_data: list[dict],
+        io_data: typing.Union[list[dict], dict[str, "np.ndarray"]],
         rw_peak_threshold: float = 100.0,
         idle_threshold: float = 0.01,
         swap_threshold: float = 10.0,
@@ -500,8 +937,8 @@ class Orbis(object):
 
         Parameters
         ----------
-        io_data : list[dict]
-            I/O 指标时间序列，每个元素应包含以下字段（单位均为 MB 或计数）：
+        io_data : list[dict] or dict[str, np.ndarray]
+            I/O 指标时间序列，记录列表或列字典，需包含 timestamp 与以下字段（单位均为 MB 或计数）：
             - read_bytes  : float : 读数据量（MB）
             - write_bytes : float : 写数据量（MB）
             - rchar       : float : 读字符数（MB）
@@ -547,158 +984,77 @@ class Orbis(object):
         - 评分采用扣分制，根据各类风险标签扣除相应分值，最低为 0。
         - 等级划分规则：
             S: ≥95, A: ≥90, B: ≥80, C: ≥70, D: ≥60, E: <60。
+        - 长序列可直接使用 `Flux` 分两遍流式累加，读写分位数以对数分桶近似，其余结果与本函数一致。
         """
 
-        # 🟦 ==== 默认结果 ====
-        result = {
-            "swap_status": "PASS",
-            "swap_max_mb": 0.0,
-            "swap_burst_ratio": 0.0,
-            "swap_burst_count": 0,
-            "rw_peak_mb": 0.0,
-            "rw_std_mb": 0.0,
-            "rw_burst_ratio": 0.0,
-            "rw_idle_ratio": 0.0,
-            "sys_burst": 0.0,
-            "sys_burst_events": 0,
-            "tags": [],
-            "risk": [],
-            "score": 100,
-            "grade": "S"
-        }
-
-        # 🟦 ==== 数据校验 ====
-        if len(io_data) < 10:
-            return {**result, "swap_status": "Few Data"}
-
         df = pd.DataFrame(io_data)
+        batch = {col: df[col].to_numpy() for col in df.columns} if len(df) else {}
 
-        # 🟦 ==== 采样周期 ====
-        ts = pd.to_datetime(df["timestamp"], errors="coerce", utc=True)
-        valid_dt = ts.diff().dt.total_seconds()
-        sample_seconds = float(np.median(valid_dt[valid_dt > 0])) if (valid_dt > 0).any() else None
-
-        # 🟦 ==== 惩罚权重 ====
-        penalty_map = {
-            "rw_peak_high": 15,
-            "rw_burst": 10,
-            "rw_idle": 10,
-            "sys_burst": 5,
-            "swap_burst": 20
-        }
+        flux = Flux(rw_peak_threshold, idle_threshold, swap_threshold, sys_burst_z)
+        flux.feed(batch)
+        flux.recount(batch)
+        return flux.finish()
 
-        # 🟦 ==== 差分策略 ====
-        io_cols = ["read_bytes", "write_bytes", "rchar", "wchar", "syscr", "syscw"]
-        df.loc[:, io_cols] = df[io_cols].astype(float).diff().fillna(0).clip(lower=0)
-
-        if len(df) < 10:
-            return {**result, "swap_status": "Few Data"}
-
-        # 🟦 ==== RW峰值与抖动 ====
-        rw_series = np.r_[df["read_bytes"].values, df["write_bytes"].values]
-        if rw_series.size == 0:
-            rw_series = np.array([0.0])
-        rw_peak = float(np.max(rw_series))
-        rw_std = float(np.std(rw_series, ddof=1)) if rw_series.size > 1 else 0.0
-        result["rw_peak_mb"] = round(rw_peak, 2)
-        result["rw_std_mb"] = round(rw_std, 2)
-
-        # 🟦 ==== 爆发段 ====
-        if (rw := np.asarray(rw_series, dtype=float)).size > 0:
-            q1, q3 = np.percentile(rw, [25, 75])
-            q1, q3 = float(q1), float(q3)
-
-            if (iqr := max(q3 - q1, 0.0)) > 0.0: rw_burst_th = q3 + 1.5 * iqr
-            else: rw_burst_th = float(np.mean(rw)) + float(np.std(rw, ddof=1))
-
-        else:
-            rw_burst_th = float("inf")
-
-        rw_burst_ratio = float(np.mean(rw > rw_burst_th)) if math.isfinite(rw_burst_th) else 0.0
-        rw_burst_ratio = min(max(rw_burst_ratio, 0.0), 1.0)
-        result["rw_burst_ratio"] = round(rw_burst_ratio, 4)
-
-        # 🟦 ==== Idle段 ====
-        io_sum = df[["read_bytes", "write_bytes", "rchar", "wchar"]].sum(axis=1).values
-        if sample_seconds and sample_seconds > 0:
-            # 以 MB/s 判定空闲 -> io_sum / T < idle_threshold
-            idle_ratio = float(np.mean((io_sum / sample_seconds) < idle_threshold))
-        else:
-            # 以 MB/. 判定空闲
-            idle_ratio = float(np.mean(io_sum < idle_threshold))
-        result["rw_idle_ratio"] = round(min(max(idle_ratio, 0.0), 1.0), 4)
-
-        # 🟦 ==== 系统调用突变 ====
-        sys_events, sys_kinds = 0, 0
-        for col in ["syscr", "syscw"]:
-            if (s := df[col].values.astype(float)).size > 1:
-                bursts = int(np.sum(zscore(s, ddof=1) > sys_burst_z))
-            else:
-                bursts = 0
-            sys_events += bursts
-            if bursts > 0: sys_kinds += 1
-        result["sys_burst_events"] = int(sys_events)
-        result["sys_burst"] = int(sys_kinds)
-
-        # 🟦 ==== Swap爆发 ====
-        swap_vals = df["swap"].astype(float).values
-        swap_max = float(np.max(swap_vals)) if swap_vals.size else 0.0
-        result["swap_max_mb"] = round(swap_max, 2)
-        swap_burst_mask = swap_vals > float(swap_threshold)
-        result["swap_burst_ratio"] = round(float(np.mean(swap_burst_mask)), 4)
-        result["swap_burst_count"] = int(np.sum(swap_burst_mask))
-
-        if swap_max > swap_threshold * 2: result["swap_status"] = "FAIL"
-        elif swap_max > swap_threshold: result["swap_status"] = "WARN"
-        else: result["swap_status"] = "PASS"
-
-        # 🟦 ==== 标签统计 ====
-        penalties, tags, risk = 0, [], []
-
-        # Notes: 可能是大文件 I / O 或突发读写导致。
-        if rw_peak > rw_peak_threshold:
-            penalties += penalty_map["rw_peak_high"]
-            tags.append("rw_peak_high")
-            risk.append("RW Peak High")
-
-        # Notes: I/O 不稳定，可能是后台任务反复读写。
-        if result["rw_burst_ratio"] > 0.10:
-            penalties += penalty_map["rw_burst"]
-            tags.append("rw_burst")
-            risk.append("RW Burst")
-
-        # Notes: I/O 资源利用率低，可能等待或阻塞严重。
-        if result["rw_idle_ratio"] > 0.40:
-            penalties += penalty_map["rw_idle"]
-            tags.append("rw_idle")
-            risk.append("IO Idle")
+    @staticmethod
+    def analyze_tick_latency(ticks: dict[str, "np.ndarray"]) -> dict[str, dict]:
+        """
+        统计单轮耗时分解各阶段的分布，用于定位慢轮次来自哪个阶段。
 
-        # Notes: 短时间内频繁系统调用，可能是异常轮询或批量 I/O。
-        if result["sys_burst_events"] > 3:
-            penalties += penalty_map["sys_burst"]
-            tags.append("sys_burst")
-            risk.append("Sys Burst")
+        Parameters
+        ----------
+        ticks : dict[str, np.ndarray]
+            `Cubicle.query_tick_stats` 的列字典，除 tick 与 timestamp 外每列为一个阶段的耗时（毫秒），未经过的阶段为 NaN。
 
-        # Notes: 物理内存不足或内存泄漏，导致频繁换页。
-        if result["swap_status"] in ("WARN", "FAIL"):
-            penalties += penalty_map["swap_burst"]
-            tags.append("swap_burst")
-            risk.append("Swap Burst")
+        Returns
+        -------
+        dict
+            阶段名 -> {"p50", "p95", "p99", "max", "mean", "share"}，按采集顺序排列；
+            share 为该阶段均值占整轮均值的比例，无有效样本的阶段不返回。
+        """
+        result = {}
+        for stage, values in ticks.items():
+            if stage in ("tick", "timestamp") or not (values := values[np.isfinite(values)]).size:
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            result[stage] = {
+                "p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2),
+                "max": round(float(values.max()), 2), "mean": round(float(values.mean()), 2)
+            }
+
+        total = result.get("total", {}).get("mean") or 0.0
+        for stage, stats in result.items():
+            stats["share"] = round(stats["mean"] / total, 4) if total else 0.0
+        return result
 
-        # 🟦 ==== 综合输出 ====
-        score = max(100 - penalties, 0)
-        result["score"] = int(score)
-        result["tags"] = tags
-        result["risk"] = risk
+    @staticmethod
+    def analyze_processes(procs: dict[str, "np.ndarray"]) -> dict[str, dict]:
+        """
+        按进程汇总 PSS，用于拆分应用整体内存来自哪个进程。
 
-        if score >= 95: result["grade"] = "S"
-        elif score >= 90: result["grade"] = "A"
-        elif score >= 80: result["grade"] = "B"
-        elif score >= 70: result["grade"] = "C"
-        elif score >= 60: result["grade"] = "D"
-        else: result["grade"] = "E"
+        Parameters
+        ----------
+        procs : dict[str, np.ndarray]
+            `Cubicle.query_procs` 的列字典。
 
-        return result
+        Returns
+        -------
+        dict
+            进程名 -> {"avg", "max", "last", "share", "samples"}（MB），按均值降序排列；
+            avg 为进程存活期间的均值，share 为该进程 PSS 之和占全部进程之和的比例。
+        """
+        names, pss = procs["process"].astype(str), procs["pss"]
+        total = float(np.nansum(pss)) or 1.0
+        result = {}
+        for name in np.unique(names):
+            values = pss[names == name]
+            if not (values := values[np.isfinite(values)]).size:
+                continue
+            result[str(name)] = {
+                "avg": round(float(values.mean()), 2), "max": round(float(values.max()), 2),
+                "last": round(float(values[-1]), 2), "share": round(float(values.sum()) / total, 4),
+                "samples": int(values.size)
+            }
+        return dict(sorted(result.items(), key=lambda item: -item[1]["avg"]))
 
 
 if __name__ == '__main__':
@@ -10,15 +10,14 @@
 # This file is licensed under the Memrix :: 记忆星核 License. See the LICENSE.md file for more details.
 
 import os
+import re
 import time
 import random
 import string
 import typing
 import asyncio
 import aiofiles
-import aiosqlite
 import numpy as np
-import pandas as pd
 from pathlib import Path
 from loguru import logger
 from functools import partial
@@ -30,10 +29,15 @@ from jinja2 import (
     Environment, FileSystemLoader
 )
 from concurrent.futures import ProcessPoolExecutor
+from memcore.catalog import Catalog
 from memcore.cubicle import Cubicle
+from memcore.packer import Packer
+from memcore.pool import Pool
 from memcore.profile import Align
 from memnova.lumix import Lumix
-from memnova.orbis import Orbis
+from memnova.orbis import (
+    Orbis, Trend, Flux
+)
 from memnova.templater import Templater
 from memnova import const
 
@@ -49,6 +53,8 @@ class Reporter(object):
 
         scene = scene or time.strftime("%Y%m%d%H%M%S", time.localtime(self.before_time))
 
+        self.scene, self.classify_type = scene, classify_type
+
         self.group_dir = os.path.join(self.total_dir, const.TREE_DIR, f"{scene}_{classify_type}")
         if not (group_dir := Path(self.group_dir)).exists():
             group_dir.mkdir(parents=True, exist_ok=True)
@@ -57,22 +63,51 @@ class Reporter(object):
         if not (assemblage := Path(self.assemblage)).exists():
             assemblage.mkdir(parents=True, exist_ok=True)
 
-        self.db_file = os.path.join(self.assemblage, const.DB_FILE)
+        self.db_file = os.path.join(self.assemblage, const.DB_FILE)  # 旧版未分片的数据库
         self.team_file = os.path.join(self.assemblage, f"{const.APP_NAME}_team_{scene}.yaml")
+        self.catalog_file = os.path.join(self.total_dir, const.CATALOG_FILE)
 
         self.background_tasks: list = []
+        self.log_sink: typing.Optional[int] = None
+
+    def shard_file(self, key: str) -> str:
+        """
+        返回指定设备（或其他分片键）的分片数据库路径，每个写入方独占一个文件，互不争用写锁。
+        """
+        return os.path.join(self.assemblage, const.SHARD_FILE.format(re.sub(r"[^\w.\-]", "_", key)))
 
-    async def spawn_trace_hub(self, file_folder: str) -> "Path":
+    def shard_files(self) -> list[str]:
+        """
+        返回分组下全部数据库文件（含旧版未分片的数据库），删除某台设备的数据只需删除对应分片。
+        """
+        return [str(f) for f in sorted(Path(self.assemblage).glob(const.SHARD_GLOB))]
+
+    async def spawn_trace_hub(
+        self, file_folder: str, rotation: typing.Optional[str] = None, retention: typing.Optional[int] = None
+    ) -> "Path":
         """
         初始化任务日志文件并创建追踪数据目录，返回追踪目录路径。
+
+        浸泡模式下按 `rotation`（如 "64 MB"）轮换任务日志，仅保留最近 `retention` 个轮换文件；
+        日志输出在任务结束时由 `close_trace_hub` 移除，同一进程连续执行多个任务时不会累积。
         """
         log_file = os.path.join(self.assemblage, const.SUMMARY, file_folder, f"{file_folder}.log")
-        logger.add(log_file, level=const.NOTE_LEVEL, format=const.WRITE_FORMAT)
+        self.log_sink = logger.add(
+            log_file, level=const.NOTE_LEVEL, format=const.WRITE_FORMAT, rotation=rotation, retention=retention
+        )
 
         if not (traces := Path(self.assemblage) / const.SUMMARY / file_folder / const.TRACES).exists():
             traces.mkdir(parents=True, exist_ok=True)
         return traces
 
+    def close_trace_hub(self) -> None:
+        """
+        移除任务日志输出并关闭日志文件。
+        """
+        if self.log_sink is not None:
+            logger.remove(self.log_sink)
+            self.log_sink = None
+
     async def make_report(self, template: str, *args, **kwargs) -> str:
         """
         基于 Jinja2 模板渲染生成 HTML 报告，带随机文件名并异步写入磁盘。
@@ -270,53 +305,59 @@ class Reporter(object):
         # ==== 时间基线 ====
         normalize_start_ts = min(normalize_list)
 
-        # ==== 初始化合并结构 ====
-        merged = {key: [] for key in frames[0]}
+        # ==== 时间字段 [ms] ====
+        # vsync_app 与 vsync_sys 同样减去时间基线；旧实现误将其赋值为基线，导致应用 FPS 的时间轴全部塌缩到同一点
+        shift_fields = {
+            "raw_frames": ["timestamp_ms"],
+            "vsync_sys": ["ts"],
+            "vsync_app": ["ts"],
+            "roll_ranges": ["start_ts", "end_ts"],
+            "drag_ranges": ["start_ts", "end_ts"],
+            "jank_ranges": ["start_ts", "end_ts"],
+        }
 
         for record in frames:
             logger.info(f"Meta: {record.get('metadata', 'Unknown')}")
-            # ==== 原始帧数据 [ms] ====
-            for frame in record["raw_frames"]:
-                frame["timestamp_ms"] -= normalize_start_ts
-
-            # ==== 系统FPS / 应用FPS [ms] ====
-            for point in record["vsync_sys"]:
-                point["ts"] -= normalize_start_ts
-            for point in record["vsync_app"]:
-                point["ts"] = normalize_start_ts
-
-            # ==== 滑动区域 / 拖拽区域 / 掉帧区域 [ms] ====
-            for r in record["roll_ranges"]:
-                r["start_ts"] -= normalize_start_ts
-                r["end_ts"] -= normalize_start_ts
-            for d in record["drag_ranges"]:
-                d["start_ts"] -= normalize_start_ts
-                d["end_ts"] -= normalize_start_ts
-            for j in record["jank_ranges"]:
-                j["start_ts"] -= normalize_start_ts
-                j["end_ts"] -= normalize_start_ts
-
-            # ==== 合并数据 ====
-            for key, value in record.items():
-                if isinstance(value, list):
-                    merged[key].extend(value)
-                else:
-                    merged[key].append(value)
+
+        # ==== 列式合并 ====
+        merged = {"metadata": [record.get("metadata") for record in frames]}
+        for key, fields in shift_fields.items():
+            columns = Packer.concat([record[key] for record in frames if key in record])
+            for field in fields:
+                if field in columns:
+                    columns[field] = columns[field] - normalize_start_ts
+            merged[key] = Packer.to_records(columns)
 
         return merged
 
     @staticmethod
-    def plot_mem(group: str, data_dir: str, task_list: list, *args) -> str:
+    def plot_mem(
+        group: str, data_dir: str, task_list: list, smaps: dict, latency: dict, procs: dict, maps: dict,
+        events: dict, *args
+    ) -> str:
         """
-        生成并保存内存分析 HTML 报告，包含交互视图与统计图表。
+        生成并保存内存分析 HTML 报告，包含交互视图与统计图表；多进程应用附加按进程拆分的 PSS 面板，
+        启用映射通道时附加增长最多的映射面板（均与主图联动缩放），有耗时分解时在下方附加单轮耗时面板；
+        日志事件直接标注在主图上。
         """
         *loc, extreme = args
-        plot = Templater.plot_mem_analysis(task_list, extreme)
+        plot = Templater.plot_mem_analysis(task_list, extreme, smaps, events)
 
         output_file(output_path := os.path.join(group, f"{data_dir}.html"))
         viewer_div = Templater.generate_viewers(*loc)
 
-        layout = column(viewer_div, Spacer(height=10), plot, sizing_mode="stretch_both")
+        panels = []
+        if procs and len(set(procs["process"])) > 1:
+            breakdown = Templater.plot_proc_breakdown(procs)
+            breakdown.x_range = plot.x_range
+            panels += [Spacer(height=10), breakdown]
+        if maps and len(maps.get("timestamp", [])):
+            growth = Templater.plot_map_growth(maps)
+            growth.x_range = plot.x_range
+            panels += [Spacer(height=10), growth]
+        if latency:
+            panels += [Spacer(height=10), Templater.plot_tick_latency(latency)]
+        layout = column(viewer_div, Spacer(height=10), plot, *panels, sizing_mode="stretch_both")
         save(layout)
 
         return output_path
@@ -343,7 +384,7 @@ class Reporter(object):
 
     async def mem_rendering(
         self,
-        db: "aiosqlite.Connection",
+        pool: "Pool",
         loop: "asyncio.events.AbstractEventLoop",
         executor: "ProcessPoolExecutor",
         memories: dict,
@@ -356,15 +397,91 @@ class Reporter(object):
         )
         relatively = Path(Path(self.assemblage).name) / const.SUMMARY / data_dir
 
-        # 🟡 ==== 数据查询 ====
-        mem_data, io_data, (joint, *_) = await asyncio.gather(
-            Cubicle.query_mem(db, data_dir), Cubicle.query_io(db, data_dir), Cubicle.query_joint(db, data_dir)
-        )
-        if not mem_data:
-            return logger.info(f"MEM data not found for {data_dir}")
-        title, timestamp, *_ = joint
+        # 🟨 ==== MEM 评分 ====
+        r2_threshold, slope_threshold, window = 0.5, 0.01, 30
+
+        # 🟦 ==== I/O 评分 ====
+        rw_peak_threshold, idle_threshold, swap_threshold, sys_burst_z = 100.0, 0.01, 10.0, 2.5
+
+        async with pool.lease() as db:
+
+            # 🟡 ==== 图表粒度 ====
+            mem_span, io_span = await asyncio.gather(
+                Cubicle.rollup_span(db, const.MEM_DATA_TABLE, const.MEM_ROLLUP_TABLE, data_dir, const.ROLLUP_POINTS),
+                Cubicle.rollup_span(db, const.IO_DATA_TABLE, const.IO_ROLLUP_TABLE, data_dir, const.ROLLUP_POINTS)
+            )
+            logger.info(f"Rollup span: MEM={mem_span} IO={io_span}")
+
+            # 🟡 ==== 采样周期 ====
+            # 有节奏记录时按实际采样时间折算横轴，跳过的截止时间与抖动不再使趋势斜率偏斜
+            period, origin = await Cubicle.query_period(db, data_dir), None
+            # 自适应采样时每个样本按其代表的时长加权，加密区段不会主导整体趋势
+            stamps, intervals = await Cubicle.query_intervals(db, data_dir)
+            logger.info(f"Sample period: {period} ms adaptive={bool(stamps.size)}")
+
+            # 🟡 ==== 数据查询 ====
+            trends, mem_parts, mem_count = {}, [], 0
+            async for batch in Cubicle.stream_mem(db, data_dir):
+                if period:
+                    origin = batch["timestamp"][0] if origin is None else origin
+                x = (batch["timestamp"] - origin) / period if period else None
+                w = intervals[
+                    np.clip(np.searchsorted(stamps, batch["timestamp"], side="right") - 1, 0, None)
+                ] / period if period and stamps.size else None
+                if baseline:
+                    for mode in ("FG", "BG"):
+                        mask = batch["mode"] == mode
+                        trends.setdefault(mode, Trend(window)).feed(
+                            batch["pss"][mask], None if x is None else x[mask], None if w is None else w[mask]
+                        )
+                else:
+                    trends.setdefault("MEM", Trend(window)).feed(batch["pss"], x, w)
+                mem_count += len(batch["pss"])
+                if mem_span is None:
+                    mem_parts.append(batch)
+
+            if not mem_count:
+                return logger.info(f"MEM data not found for {data_dir}")
+
+            mem_data = Packer.concat(mem_parts) if mem_span is None else (
+                await Cubicle.query_mem_rollup(db, data_dir, mem_span)
+            )
+            mem_parts.clear()
+
+            # 独立通道按时间与内存序列叠加
+            smaps_data = await Cubicle.query_smaps(db, data_dir, const.ROLLUP_POINTS)
+            tick_data = await Cubicle.query_tick_stats(db, data_dir)
+            overhead = await Cubicle.query_overhead(db, data_dir)
+            procs = await Cubicle.query_procs(db, data_dir, const.ROLLUP_POINTS)
+            heap_dumps = await Cubicle.query_heap_dumps(db, data_dir)
+            # 映射通道只保存变化量，增长排名与时间序列均在库内还原
+            mappings = await Cubicle.query_maps_growth(db, data_dir, 10)
+            maps = await Cubicle.query_maps_series(
+                db, data_dir, [(m["process"], m["mapping"]) for m in mappings[:6]]
+            )
+            hprofs = await Cubicle.query_hprof(db, data_dir)
+            events = await Cubicle.query_events(db, data_dir)
+            # 首末两个快照的类直方图差异，由库内分组求差得出
+            growth = await Cubicle.query_hprof_diff(
+                db, data_dir, hprofs[0]["tick"], hprofs[-1]["tick"], 10
+            ) if len(hprofs) > 1 else []
+
+            # I/O 评分分两遍流式累加，全量序列只在无需汇总时保留用于绘图
+            flux, io_parts = Flux(rw_peak_threshold, idle_threshold, swap_threshold, sys_burst_z), []
+            async for batch in Cubicle.stream_io(db, data_dir):
+                flux.feed(batch)
+                if io_span is None:
+                    io_parts.append(batch)
+            async for batch in Cubicle.stream_io(db, data_dir):
+                flux.recount(batch)
+            io_score = flux.finish()
+            io_view = Packer.concat(io_parts) if io_span is None else (
+                await Cubicle.query_io_rollup(db, data_dir, io_span)
+            )
+            io_parts.clear()
+            joint, *_ = await Cubicle.query_joint(db, data_dir)
 
-        df = pd.DataFrame(mem_data)
+        title, timestamp, *_ = joint
 
         trace_loc = None
         leak_loc  = None
@@ -372,45 +489,38 @@ class Reporter(object):
         io_loc    = Path(group) / f"{data_dir}_io.png"
         log_loc   = Path(group) / f"{data_dir}.log"
 
-        # 🟦 ==== I/O 评分 ====
-        rw_peak_threshold, idle_threshold, swap_threshold, sys_burst_z = 100.0, 0.01, 10.0, 2.5
-        io_score = await loop.run_in_executor(
-            executor, Orbis.analyze_io_score, io_data,
-            rw_peak_threshold, idle_threshold, swap_threshold, sys_burst_z
-        )
+        logger.info(f"IO-Score: {io_score}")
 
         # 🔵 ==== I/O 绘图 ====
         io_paint_func = partial(Lumix.draw_io_metrics, **io_score)
         draw_io_future = loop.run_in_executor(
-            executor, io_paint_func, io_data, str(io_loc)
+            executor, io_paint_func, io_view, str(io_loc)
         )
         self.background_tasks.append(draw_io_future)
 
-        # 🟨 ==== MEM 评分 ====
-        r2_threshold, slope_threshold, window = 0.5, 0.01, 30
+        # 🟡 ==== 单轮耗时 ====
+        latency = Orbis.analyze_tick_latency(tick_data) if tick_data else {}
+        logger.info(f"Tick latency: {latency}")
+
+        # 🟡 ==== 进程拆分 ====
+        processes = Orbis.analyze_processes(procs) if procs else {}
+        logger.info(f"Processes: {processes}")
 
         # 🟡 ==== 内存基线 ====
         if baseline:
-            evaluate, tag_lines, group_stats = [], [], (
-                df.groupby("mode")["pss"].agg(avg_pss="mean", max_pss="max", count="count")
-                .reindex(["FG", "BG"]).reset_index().dropna(subset=["mode"])
-            )
+            evaluate, tag_lines = [], []
 
             # 🟡 ==== 分组统计 ====
             scores = {}
-            for _, row in group_stats.iterrows():
-
-                # 🟨 ==== MEM 评分 ====
-                part_list = df[df["mode"] == (mode := row["mode"])]["pss"].tolist()
-                score = await loop.run_in_executor(
-                    executor, Orbis.analyze_mem_score, part_list,
-                    r2_threshold, slope_threshold, window
-                )
-                logger.info(f"{mode}-Score: {score}")
+            for mode, trend in trends.items():
 
                 # 🟡 ==== 数据校验 ====
-                if not row["count"] or pd.isna(row["avg_pss"]):
+                if not (trend.count or trend.invalid):
                     continue
+
+                # 🟨 ==== MEM 评分 ====
+                score = trend.finish(r2_threshold, slope_threshold)
+                logger.info(f"{mode}-Score: {score}")
                 scores[mode] = score
 
                 # 🟡 ==== 定制评价 ====
@@ -452,10 +562,7 @@ class Reporter(object):
             leak_loc = Path(group) / f"{data_dir}_leak.png"
 
             # 🟨 ==== MEM 评分 ====
-            score = await loop.run_in_executor(
-                executor, Orbis.analyze_mem_score, df["pss"].tolist(),
-                r2_threshold, slope_threshold, window
-            )
+            score = trends["MEM"].finish(r2_threshold, slope_threshold)
             logger.info(f"Score: {score}")
             scores = {"MEM": score}
 
@@ -500,9 +607,94 @@ class Reporter(object):
                 }
             ]
 
+        # 🟡 ==== 观测开销 ====
+        if overhead:
+            tag_lines.append({
+                "fields": [
+                    {"label": f"OVH-{lane}: ", "value": f"{stats['overhead']:.2f}", "unit": "%"}
+                    for lane, stats in overhead.items()
+                ]
+            })
+
+        # 🟡 ==== 映射增长 ====
+        libraries: dict[str, float] = {}
+        for m in mappings:
+            if m["mapping"].startswith("/"):
+                name = m["mapping"].rsplit("/", 1)[-1]
+                libraries[name] = round(libraries.get(name, 0.0) + m["growth"], 3)
+        if mappings:
+            tag_lines.append({
+                "fields": [
+                    {
+                        "label": f"MAP-{m['mapping'].rsplit('/', 1)[-1][:24]}: ",
+                        "value": f"+{m['growth']:.2f}", "unit": "MB"
+                    } for m in mappings[:3]
+                ]
+            })
+
+        # 🟡 ==== 日志事件 ====
+        incidents = {}
+        if events:
+            kinds, values = events["kind"], events["value"].astype(float)
+            gc = kinds == "gc"
+            incidents = {
+                "counts": {str(k): int(v) for k, v in zip(*np.unique(kinds, return_counts=True))},
+                "gc_freed": round(float(values[gc].sum()), 2),
+                "gc_pause": round(float(np.nansum(events["pause"][gc].astype(float))), 2),
+                "killed": sorted({str(p) for p in events["process"][np.isin(kinds, ["lmk", "kill"])]})[:10]
+            }
+            logger.info(f"Events: {incidents}")
+            tag_lines.append({
+                "fields": [
+                    {"label": "GC: ", "value": f"{int(gc.sum())}", "unit": ""},
+                    {"label": "FREED: ", "value": f"{incidents['gc_freed']:.2f}", "unit": "MB"},
+                    {"label": "LMK: ", "value": f"{incidents['counts'].get('lmk', 0)}", "unit": ""},
+                    {"label": "KILL: ", "value": f"{incidents['counts'].get('kill', 0)}", "unit": ""}
+                ]
+            })
+
+        # 🟡 ==== 堆快照 ====
+        if heap_dumps:
+            tag_lines.append({
+                "fields": [
+                    {
+                        "label": "DUMP: ", "unit": "",
+                        "value": f"{sum(d['status'] == 'pulled' for d in heap_dumps)}/{len(heap_dumps)}"
+                    },
+                    {"label": "SLOPE: ", "value": f"{max(d['slope'] for d in heap_dumps):.2f}", "unit": "MB/min"},
+                    *([
+                        {"label": f"GROW-{growth[0]['class'].rsplit('.', 1)[-1]}: ", "unit": "MB",
+                         "value": f"+{growth[0]['shallow_delta'] / 1048576:.2f}"}
+                    ] if growth else [])
+                ]
+            })
+
+        # 🟡 ==== 目录评分 ====
+        await Catalog.score(self.catalog_file, data_dir, {
+            **{
+                k: {"trend": v["trend"], "avg": round(float(v["avg"]), 2), "max": round(float(v["max"]), 2)}
+                for k, v in scores.items()
+            },
+            "IO": {"score": io_score["score"], "grade": io_score["grade"]},
+            **({"latency": {k: {"p50": v["p50"], "p95": v["p95"]} for k, v in latency.items()}} if latency else {}),
+            **({"overhead": overhead} if overhead else {}),
+            **({"processes": processes} if processes else {}),
+            **({"mappings": {
+                "growth": mappings,
+                "libraries": dict(sorted(libraries.items(), key=lambda kv: kv[1], reverse=True)[:5])
+            }} if mappings else {}),
+            **({"events": incidents} if incidents else {}),
+            **({"heap_dumps": heap_dumps} if heap_dumps else {}),
+            **({"hprof": {
+                "dumps": [{k: v for k, v in h.items() if k != "dominators"} for h in hprofs],
+                "dominators": hprofs[-1]["dominators"][:5],
+                "growth": growth
+            }} if hprofs else {})
+        })
+
         # 🟡 ==== MEM 渲染 ====
         output_path = await loop.run_in_executor(
-            executor, self.plot_mem, group, data_dir, mem_data,
+            executor, self.plot_mem, group, data_dir, mem_data, smaps_data, latency, procs, maps, events,
             trace_loc, leak_loc, gfx_loc, io_loc, log_loc, baseline
         )
 
@@ -526,7 +718,7 @@ class Reporter(object):
 
     async def gfx_rendering(
         self,
-        db: "aiosqlite.Connection",
+        pool: "Pool",
         loop: "asyncio.events.AbstractEventLoop",
         executor: "ProcessPoolExecutor",
         memories: dict,
@@ -539,9 +731,12 @@ class Reporter(object):
         relatively = Path(Path(self.assemblage).name) / const.SUMMARY / data_dir
 
         # 🟢 ==== 数据查询 ====
-        gfx_data, (joint, *_) = await asyncio.gather(
-            Cubicle.query_gfx(db, data_dir), Cubicle.query_joint(db, data_dir)
-        )
+        # 帧图、分段切割与帧率分位数都需要合并后的完整帧序列，评分与绘图共用同一份数据，不再单独流式读取
+        async with pool.lease() as db:
+            gfx_data, (joint, *_) = await asyncio.gather(
+                Cubicle.query_gfx(db, data_dir), Cubicle.query_joint(db, data_dir)
+            )
+
         if not gfx_data:
             return logger.info(f"GFX data not found for {data_dir}")
         title, timestamp, *_ = joint
@@ -561,20 +756,28 @@ class Reporter(object):
         log_loc   = Path(group) / f"{data_dir}.log"
 
         # 🟩 ==== GFX 评分 ====
-        score = await loop.run_in_executor(
-            executor, Orbis.analyze_gfx_score,
-            raw_frames, roll_ranges, drag_ranges, jank_ranges, "fps_app"
+        # 已压缩的任务不再保留原始帧，沿用压缩时写入 metadata 的评分，且不再生成图表
+        retained = next(
+            (m["retained_score"] for m in frame_merged["metadata"] if m and "retained_score" in m), None
         )
+        if compacted := (not raw_frames and retained is not None):
+            score = retained
+        else:
+            score = await loop.run_in_executor(
+                executor, Orbis.analyze_gfx_score,
+                raw_frames, roll_ranges, drag_ranges, jank_ranges, "fps_app"
+            )
         logger.info(f"Score: {score}")
         scores = {"GFX": score}
 
         # 🟢 ==== GFX 绘图 ====
-        paint_func = partial(Lumix.draw_gfx_metrics, **score)
-        draw_future = loop.run_in_executor(
-            executor, paint_func,
-            raw_frames, vsync_sys, vsync_app, roll_ranges, drag_ranges, jank_ranges, str(gfx_loc)
-        )
-        self.background_tasks.append(draw_future)
+        if not compacted:
+            paint_func = partial(Lumix.draw_gfx_metrics, **score)
+            draw_future = loop.run_in_executor(
+                executor, paint_func,
+                raw_frames, vsync_sys, vsync_app, roll_ranges, drag_ranges, jank_ranges, str(gfx_loc)
+            )
+            self.background_tasks.append(draw_future)
 
         # 🟢 ==== 定制评价 ====
         standard = self.align.get_standard("gfx", "base")
@@ -595,12 +798,22 @@ class Reporter(object):
         ]
 
         # 🟢 ==== 分段切割 ====
-        segments = await loop.run_in_executor(
+        segments = [] if compacted else await loop.run_in_executor(
             executor, self.split_ranges, raw_frames, roll_ranges, drag_ranges, jank_ranges
         )
 
+        # 🟢 ==== 目录评分 ====
+        await Catalog.score(self.catalog_file, data_dir, {
+            "GFX": {
+                "level": score["level"],
+                "score": round(float(score["score"]), 4),
+                "avg_fps": round(float(score["avg_fps"]), 2),
+                "min_fps": round(float(score["min_fps"]), 2)
+            }
+        })
+
         # 🟢 ==== GFX 渲染 ====
-        output_path = await loop.run_in_executor(
+        output_path = None if compacted else await loop.run_in_executor(
             executor, self.plot_gfx, group, data_dir, segments,
             trace_loc, leak_loc, gfx_loc, io_loc, log_loc
         )
@@ -617,7 +830,7 @@ class Reporter(object):
             **scores,
             "subtitle": {
                 "text": title or data_dir,
-                "link": str(relatively / Path(output_path).name),
+                "link": str(relatively / Path(output_path).name) if output_path else "",
             },
             "evaluate": evaluate,
             "tags": tag_lines
@@ -627,7 +840,7 @@ class Reporter(object):
 
     async def mem_rendition(
         self,
-        db: "aiosqlite.Connection",
+        pool: "Pool",
         loop: "asyncio.events.AbstractEventLoop",
         executor: "ProcessPoolExecutor",
         memories: dict,
@@ -640,7 +853,7 @@ class Reporter(object):
         cur_time, cur_mark, cur_data = await self.begin_render(team_data)
 
         compilation = await asyncio.gather(
-            *(self.mem_rendering(db, loop, executor, memories, d, baseline)
+            *(self.mem_rendering(pool, loop, executor, memories, d, baseline)
               for d in cur_data)
         )
         if not (compilation := [c for c in compilation if c]):
@@ -709,7 +922,7 @@ class Reporter(object):
 
     async def gfx_rendition(
         self,
-        db: "aiosqlite.Connection",
+        pool: "Pool",
         loop: "asyncio.events.AbstractEventLoop",
         executor: "ProcessPoolExecutor",
         memories: dict,
@@ -721,7 +934,7 @@ class Reporter(object):
         cur_time, cur_mark, cur_data = await self.begin_render(team_data)
 
         compilation = await asyncio.gather(
-            *(self.gfx_rendering(db, loop, executor, memories, d)
+            *(self.gfx_rendering(pool, loop, executor, memories, d)
               for d in cur_data)
         )
         if not (compilation := [c for c in compilation if c]):
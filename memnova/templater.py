@@ -15,10 +15,12 @@ import pandas as pd
 from pathlib import Path
 from bokeh.io import curdoc
 from bokeh.plotting import figure
+from bokeh.transform import dodge
 from bokeh.models import (
     ColumnDataSource, Span, Div,
     DatetimeTickFormatter, Range1d, HoverTool
 )
+from engine.tinker import Period
 
 
 class Templater(object):
@@ -110,7 +112,10 @@ class Templater(object):
 
     @staticmethod
     def plot_mem_analysis(
-        mem_data: list[dict], extreme: bool = False
+        mem_data: typing.Union[list[dict], dict[str, "np.ndarray"]],
+        extreme: bool = False,
+        smaps: typing.Optional[dict[str, "np.ndarray"]] = None,
+        events: typing.Optional[dict[str, "np.ndarray"]] = None
     ) -> "figure":
         """
         绘制内存用量随时间变化的分析图。
@@ -121,14 +126,21 @@ class Templater(object):
 
         Parameters
         ----------
-        mem_data : list of dict
-            内存采集数据列表，每个元素包含时间戳、内存统计值、模式信息等字段。
+        mem_data : list of dict or dict of str to np.ndarray
+            内存采集数据记录列表或列字典，包含时间戳、内存统计值、模式信息等字段。
 
         extreme : bool, default=False
             是否启用极值标记模式：
             - True  ：分别标注前台最大值、后台最大值。
             - False ：仅标注全局最大值。
 
+        smaps : dict of str to np.ndarray, optional
+            smaps_rollup 独立通道的列字典（`Cubicle.query_smaps`），采样时间与内存明细不同，
+            以独立数据源叠加在同一时间轴上。
+
+        events : dict of str to np.ndarray, optional
+            日志事件的列字典（`Cubicle.query_events`），GC 标记在图底部，查杀、低内存与裁剪事件标记在图顶部。
+
         Returns
         -------
         figure
@@ -149,7 +161,7 @@ class Templater(object):
 
         # 🟡 ==== 数据处理 ====
         df = pd.DataFrame(mem_data)
-        df.loc[:, "x"] = pd.to_datetime(df["timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+        df.loc[:, "x"] = pd.to_datetime(df["timestamp"] + Period.local_offset(), unit="ms", errors="coerce")
         df = df.dropna(subset=["x"])
         for col in ["summary_java_heap", "summary_native_heap", "summary_graphics", "pss", "rss", "uss"]:
             df.loc[:, col] = pd.to_numeric(df.get(col, 0), errors="coerce").fillna(0)
@@ -189,6 +201,7 @@ class Templater(object):
         max_color = "#FF5872"
         # min_color = "#54E3AF"
         sld_color = "#A8BFFF"
+        lane_color = "#7E57C2"
 
         # 🟡 ==== 区块配色 ====
         fg_color = "#8FE9FC"
@@ -283,6 +296,49 @@ class Templater(object):
             source=source, line_width=1.5, color=sld_color, alpha=0.7, legend_label="Sliding Avg", line_dash="dotdash"
         )
 
+        # 🟡 ==== SMAPS 通道 ====
+        if smaps and len(smaps.get("timestamp", [])):
+            lane = pd.DataFrame(smaps)
+            lane.loc[:, "x"] = pd.to_datetime(lane["timestamp"] + Period.local_offset(), unit="ms", errors="coerce")
+            p.line(
+                "x", "pss",
+                source=ColumnDataSource(lane.dropna(subset=["x"])), line_width=1.0, color=lane_color, alpha=0.8,
+                legend_label="Rollup PSS"
+            )
+
+        # 🟡 ==== 日志事件 ====
+        if events and len(events.get("timestamp", [])):
+            marks = pd.DataFrame(events)
+            marks.loc[:, "x"] = pd.to_datetime(marks["timestamp"] + Period.local_offset(), unit="ms", errors="coerce")
+            marks.loc[:, "pause"] = pd.to_numeric(marks["pause"], errors="coerce").fillna(0)
+            marks = marks.dropna(subset=["x"])
+            inset = (y_close - y_start) * 0.03
+            event_spots = []
+            for kind, label, marker, color, level in (
+                    ("gc", "GC", "diamond", "#26A69A", y_start + inset),
+                    ("trim", "Trim", "triangle_dot", "#FFA726", y_close - inset),
+                    ("low_memory", "Low Memory", "inverted_triangle", "#AB47BC", y_close - inset * 2),
+                    ("lmk", "LMK", "x", "#E53935", y_close - inset * 3),
+                    ("kill", "Kill", "square_x", "#8D6E63", y_close - inset * 3),
+            ):
+                if (group := marks[marks["kind"] == kind]).empty:
+                    continue
+                group = group.assign(y=level)
+                event_spots.append(p.scatter(
+                    "x", "y",
+                    source=ColumnDataSource(group), size=8 if kind == "gc" else 10, marker=marker,
+                    color=color, alpha=0.75, legend_label=label
+                ))
+            if event_spots:
+                p.add_tools(HoverTool(tooltips=[
+                    ("时间", "@x{%H:%M:%S.%3N}"),
+                    ("事件", "@kind"),
+                    ("进程", "@process (@pid)"),
+                    ("取值", "@value{0.00}"),
+                    ("暂停", "@pause{0.00} ms"),
+                    ("日志", "@message"),
+                ], formatters={"@x": "datetime"}, mode="mouse", renderers=event_spots))
+
         # 🟡 ==== 均值线 ====
         p.add_layout(
             Span(location=avg_value, dimension="width", line_color=avg_color, line_dash="dotted", line_width=2)
@@ -296,7 +352,7 @@ class Templater(object):
 
         # 🟡 ==== 悬浮提示 ====
         tooltips = [
-            ("时间", "@timestamp{%H:%M:%S}"),
+            ("时间", "@x{%H:%M:%S.%3N}"),
             ("滑窗均值", "@pss_sliding_avg{0.00} MB"),
             ("PSS", "@pss{0.00} MB"),
             ("RSS", "@rss{0.00} MB"),
@@ -308,7 +364,7 @@ class Templater(object):
             ("优先级", "@mode"),
         ]
         hover = HoverTool(
-            tooltips=tooltips, formatters={"@timestamp": "datetime"}, mode="mouse", renderers=[pss_spot]
+            tooltips=tooltips, formatters={"@x": "datetime"}, mode="mouse", renderers=[pss_spot]
         )
         p.add_tools(hover)
 
@@ -340,6 +396,210 @@ class Templater(object):
 
         return p
 
+    @staticmethod
+    def plot_tick_latency(latency: dict[str, dict]) -> "figure":
+        """
+        绘制单轮采样耗时分解图，每个阶段一组横向条形（P50 / P95 / P99）。
+
+        Parameters
+        ----------
+        latency : dict[str, dict]
+            `Orbis.analyze_tick_latency` 的结果。
+
+        Returns
+        -------
+        figure
+            `bokeh.plotting.figure` 对象，悬浮提示给出各分位数、最大值、均值与均值占整轮的比例。
+        """
+        stages = list(latency.keys())
+        source = ColumnDataSource({
+            "stage": stages,
+            **{k: [latency[s][k] for s in stages] for k in ("p50", "p95", "p99", "max", "mean")},
+            "share": [latency[s]["share"] * 100 for s in stages]
+        })
+
+        p = figure(
+            y_range=list(reversed(stages)),
+            height=80 + 36 * len(stages),
+            sizing_mode="stretch_width",
+            tools="save",
+            title="Tick Latency Breakdown"
+        )
+
+        bars = []
+        for offset, field, color in zip((-0.25, 0.0, 0.25), ("p50", "p95", "p99"), ("#90B2C8", "#3564B0", "#FF5872")):
+            bars.append(p.hbar(
+                y=dodge("stage", offset, range=p.y_range), right=field, height=0.22,
+                source=source, color=color, alpha=0.8, legend_label=field.upper()
+            ))
+
+        p.add_tools(HoverTool(tooltips=[
+            ("阶段", "@stage"),
+            ("P50", "@p50{0.00} ms"),
+            ("P95", "@p95{0.00} ms"),
+            ("P99", "@p99{0.00} ms"),
+            ("最大", "@max{0.00} ms"),
+            ("均值", "@mean{0.00} ms"),
+            ("占比", "@share{0.0} %"),
+        ], renderers=bars))
+
+        p.x_range.start = 0
+        p.xgrid.grid_line_color = "#E3E3E3"
+        p.xgrid.grid_line_alpha = 0.25
+        p.ygrid.grid_line_color = None
+        p.xaxis.axis_label = "耗时 (ms)"
+        p.legend.location = "bottom_right"
+        p.legend.click_policy = "hide"
+        p.legend.border_line_alpha = 0.1
+        p.legend.background_fill_alpha = 0.07
+        p.background_fill_color = "#FBFCFD"
+        p.background_fill_alpha = 0.24
+
+        return p
+
+    @staticmethod
+    def plot_proc_breakdown(procs: dict[str, "np.ndarray"]) -> "figure":
+        """
+        绘制按进程拆分的 PSS 堆叠面积图，各层之和即应用整体 PSS；某一时刻不存在的进程记为 0。
+
+        Parameters
+        ----------
+        procs : dict[str, np.ndarray]
+            `Cubicle.query_procs` 的列字典。
+
+        Returns
+        -------
+        figure
+            `bokeh.plotting.figure` 对象，进程按平均 PSS 从大到小自下而上堆叠，悬浮提示给出该时刻各进程的 PSS。
+        """
+        df = pd.DataFrame({k: procs[k] for k in ("timestamp", "process", "pss")})
+        df.loc[:, "process"] = df["process"].astype(str)
+        table = df.pivot_table(index="timestamp", columns="process", values="pss", aggfunc="sum").fillna(0.0)
+        names = list(table.mean().sort_values(ascending=False).index)
+        table = table[names]
+
+        # 进程名含 `.` 与 `:`，数据源字段改用序号
+        fields = [f"p{i}" for i in range(len(names))]
+        source = ColumnDataSource({
+            "x": pd.to_datetime(table.index + Period.local_offset(), unit="ms"),
+            "total": table.sum(axis=1).to_numpy(),
+            **{field: table[name].to_numpy() for field, name in zip(fields, names)}
+        })
+
+        palette = ("#3564B0", "#FF8C00", "#00A86B", "#C03F91", "#90B2C8", "#FFC24D", "#8B6FD6", "#FF5872")
+        colors = [palette[i % len(palette)] for i in range(len(names))]
+
+        p = figure(
+            height=300,
+            sizing_mode="stretch_width",
+            x_axis_type="datetime",
+            tools="pan,wheel_zoom,box_zoom,reset,save",
+            title="PSS by Process"
+        )
+        p.varea_stack(fields, x="x", source=source, color=colors, alpha=0.55, legend_label=names)
+        p.line("x", "total", source=source, line_width=1.2, color="#4A4A4A", alpha=0.6, legend_label="Total")
+        spot = p.scatter("x", "total", source=source, size=3, color="#4A4A4A", alpha=0.0)
+
+        p.add_tools(HoverTool(
+            tooltips=[("时间", "@x{%H:%M:%S}"), ("合计", "@total{0.00} MB")] + [
+                (name, f"@{field}{{0.00}} MB") for field, name in zip(fields, names)
+            ],
+            formatters={"@x": "datetime"}, mode="vline", renderers=[spot]
+        ))
+
+        p.y_range.start = 0
+        p.xgrid.grid_line_color = "#E3E3E3"
+        p.ygrid.grid_line_color = "#E3E3E3"
+        p.xgrid.grid_line_alpha = 0.25
+        p.ygrid.grid_line_alpha = 0.25
+        p.yaxis.axis_label = "PSS (MB)"
+        p.xaxis.formatter = DatetimeTickFormatter(
+            seconds="%H:%M:%S",
+            minsec="%H:%M:%S",
+            minutes="%H:%M",
+            hourmin="%H:%M",
+            hours="%H:%M",
+            days="%m-%d",
+            months="%m-%d",
+            years="%Y-%m"
+        )
+        p.legend.location = "top_left"
+        p.legend.click_policy = "hide"
+        p.legend.border_line_alpha = 0.1
+        p.legend.background_fill_alpha = 0.07
+        p.background_fill_color = "#FBFCFD"
+        p.background_fill_alpha = 0.24
+
+        return p
+
+    @staticmethod
+    def plot_map_growth(series: dict[str, "np.ndarray"]) -> "figure":
+        """
+        绘制增长最多的若干映射的 PSS 阶梯曲线，增量记录在两次变化之间保持不变，因此按阶梯连接。
+
+        Parameters
+        ----------
+        series : dict[str, np.ndarray]
+            `Cubicle.query_maps_series` 的列字典。
+
+        Returns
+        -------
+        figure
+            `bokeh.plotting.figure` 对象，图例为映射的文件名（匿名映射保留原名），悬浮提示给出进程与完整路径。
+        """
+        names = [k for k in series if k != "timestamp"]
+        x = pd.to_datetime(series["timestamp"] + Period.local_offset(), unit="ms")
+
+        palette = ("#3564B0", "#FF8C00", "#00A86B", "#C03F91", "#90B2C8", "#FFC24D", "#8B6FD6", "#FF5872")
+
+        p = figure(
+            height=300,
+            sizing_mode="stretch_width",
+            x_axis_type="datetime",
+            tools="pan,wheel_zoom,box_zoom,reset,save",
+            title="Top Growing Mappings"
+        )
+
+        renderers = []
+        for i, name in enumerate(names):
+            process, _, mapping = name.partition(" ")
+            source = ColumnDataSource({
+                "x": x, "pss": series[name], "process": [process] * len(x), "mapping": [mapping] * len(x)
+            })
+            renderers.append(p.step(
+                "x", "pss", source=source, mode="after", line_width=1.6, color=palette[i % len(palette)],
+                legend_label=mapping.rsplit("/", 1)[-1] if mapping.startswith("/") else mapping
+            ))
+
+        p.add_tools(HoverTool(
+            tooltips=[("时间", "@x{%H:%M:%S}"), ("进程", "@process"), ("映射", "@mapping"), ("PSS", "@pss{0.00} MB")],
+            formatters={"@x": "datetime"}, renderers=renderers
+        ))
+
+        p.xgrid.grid_line_color = "#E3E3E3"
+        p.ygrid.grid_line_color = "#E3E3E3"
+        p.xgrid.grid_line_alpha = 0.25
+        p.ygrid.grid_line_alpha = 0.25
+        p.yaxis.axis_label = "PSS (MB)"
+        p.xaxis.formatter = DatetimeTickFormatter(
+            seconds="%H:%M:%S",
+            minsec="%H:%M:%S",
+            minutes="%H:%M",
+            hourmin="%H:%M",
+            hours="%H:%M",
+            days="%m-%d",
+            months="%m-%d",
+            years="%Y-%m"
+        )
+        p.legend.location = "top_left"
+        p.legend.click_policy = "hide"
+        p.legend.border_line_alpha = 0.1
+        p.legend.background_fill_alpha = 0.07
+        p.background_fill_color = "#FBFCFD"
+        p.background_fill_alpha = 0.24
+
+        return p
+
     # Workflow: ======================== GFX ========================
 
     @staticmethod
@@ -14,6 +14,7 @@ from bisect import bisect_left
 from perfetto.trace_processor import (
     TraceProcessor, TraceProcessorConfig
 )
+from memcore.packer import Packer
 
 
 class _TraceAnalyzer(object):
@@ -327,10 +328,10 @@ class GfxAnalyzer(_TraceAnalyzer):
                 raw_frames, roll_ranges, drag_ranges, jank_ranges, vsync_sys, vsync_app
             )
 
+            metadata = {
+                "source": "perfetto", "app": app_name, "normalize": self.normalize_start_ts
+            }
             gfx_data = {
-                "metadata": {
-                    "source": "perfetto", "app": app_name, "normalize": self.normalize_start_ts
-                },
                 "raw_frames": raw_frames,
                 "vsync_sys": vsync_sys,
                 "vsync_app": vsync_app,
@@ -339,7 +340,8 @@ class GfxAnalyzer(_TraceAnalyzer):
                 "jank_ranges": jank_ranges
             }
 
-            gfx_fmt_data = {k: json.dumps(v) for k, v in gfx_data.items()}
+            # 帧数据按列打包为二进制块，元信息保持 JSON
+            gfx_fmt_data = {"metadata": json.dumps(metadata)} | {k: Packer.pack(v) for k, v in gfx_data.items()}
 
             return gfx_fmt_data
 
@@ -13,6 +13,7 @@ import os
 import re
 import sys
 import stat
+import struct
 import json
 import time
 import uuid
@@ -38,14 +39,29 @@ from engine.device import Device
 from engine.manage import Manage
 from engine.terminal import Terminal
 from engine.tinker import (
-    Active, Period, FileAssist, ToolKit, MemrixError
+    Active, Period, FileAssist, MemrixError
 )
 from memcore.api import Api
+from memcore.archive import Archive
+from memcore.cadence import (
+    Cadence, Governor, Latency
+)
 from memcore import authorize
+from memcore.catalog import Catalog
 from memcore.cubicle import Cubicle
 from memcore.design import Design
+from memcore.journal import Journal
+from memcore.exchange import Exchange
 from memcore.parser import Parser
+from memcore.pool import Pool
 from memcore.profile import Align
+from memcore.sentinel import (
+    Sentinel, Overhead
+)
+from memcore.warden import Warden
+from memnova.compactor import Compactor
+from memnova.dissect import Dissect
+from memnova.hprof import Hprof
 from memnova.reporter import Reporter
 from memnova.trace_analyzer import GfxAnalyzer
 from memnova import const
@@ -92,7 +108,18 @@ class Memrix(object):
         self.task_close_event: typing.Optional["asyncio.Event"] = asyncio.Event()
         self.dumped: typing.Optional["asyncio.Event"] = None
 
-        self.background: list["asyncio.Task"] = []
+        self.journal: typing.Optional["Journal"] = None
+        self.journal_task: typing.Optional["asyncio.Task"] = None
+        self.journal_close_event: typing.Optional["asyncio.Event"] = None
+        self.archive: typing.Optional["Archive"] = None
+        self.cadences: dict[str, "Cadence"] = {}
+        self.governor: typing.Optional["Governor"] = None
+        self.sentinel: typing.Optional["Sentinel"] = None
+        self.latency: typing.Optional["Latency"] = None
+        self.overhead: typing.Optional["Overhead"] = None
+        self.warden: typing.Optional["Warden"] = None
+        self.heaps: set["asyncio.Task"] = set()
+        self.heap_dir: typing.Optional["Path"] = None
         self.data_queue: "asyncio.Queue" = asyncio.Queue()
 
     @property
@@ -181,10 +208,68 @@ class Memrix(object):
             except asyncio.TimeoutError:
                 pass
 
-        # ⛔️ ==== 等待 MEM 数据存储完毕 ====
-        if self.background:
-            logger.info(f"Awaiting background sync ...")
-            await asyncio.gather(*self.background, return_exceptions=True)
+        # ⛔️ ==== 等待 堆快照 拉取完毕 ====
+        if self.heaps:
+            logger.info(f"Awaiting heap dumps ...")
+            _, pending = await asyncio.wait(self.heaps, timeout=180)
+            for task in pending:
+                task.cancel()
+
+        # ⛔️ ==== 泄漏检测 ====
+        if self.warden:
+            warden = self.warden.summary()
+            logger.info(f"Warden: {warden}")
+            await Catalog.score(reporter.catalog_file, self.file_folder, {"warden": warden})
+
+        # ⛔️ ==== 观测开销 ====
+        if self.overhead and (overhead := self.overhead.summary()):
+            if self.journal:
+                self.journal.append(Period.stamp(), self.align.app_label, None, None, overhead=overhead)
+            for lane, stats in overhead.items():
+                logger.info(
+                    f"Overhead {lane}: {stats['overhead']}% cpu={stats['cpu_ms']} ms "
+                    f"probe={stats['per_probe']} ms throttled={stats['throttled']}"
+                )
+            await Catalog.score(reporter.catalog_file, self.file_folder, {"overhead": overhead})
+
+        # ⛔️ ==== 等待 日志 加载完毕 ====
+        if self.journal_task:
+            logger.info(f"Awaiting journal sync ...")
+            self.journal_close_event.set()
+            await self.journal_task
+
+        # ⛔️ ==== 等待 存档 写入完毕 ====
+        if self.archive:
+            await asyncio.to_thread(self.archive.close)
+
+        # ⛔️ ==== 目录登记 ====
+        await Catalog.conclude(reporter.catalog_file, self.file_folder, Period.stamp(), self.file_insert)
+
+        # ⛔️ ==== 采样节奏 ====
+        if self.cadences:
+            cadences = {lane: cadence.summary() for lane, cadence in self.cadences.items()}
+            if self.governor:
+                cadences["mem"]["adaptive"] = self.governor.summary()
+                logger.info(f"Adaptive: {cadences['mem']['adaptive']}")
+            for lane, cadence in cadences.items():
+                logger.info(
+                    f"Cadence {lane}: {cadence['rate']}/{cadence['target']} Hz "
+                    f"missed={cadence['missed']} lag={cadence['lag']} ms jitter={cadence['jitter']} ms"
+                )
+            await Catalog.score(reporter.catalog_file, self.file_folder, {"cadence": cadences})
+
+        # ⛔️ ==== 单轮耗时 ====
+        if self.latency and (quantiles := self.latency.percentiles()):
+            logger.info(f"Latency p50/p95 ms: {quantiles}")
+
+        # ⛔️ ==== 宿主自监控 ====
+        if self.sentinel:
+            host = self.sentinel.summary()
+            logger.info(
+                f"Host RSS {host['rss_first']} -> {host['rss_last']} MB peak={host['rss_peak']} MB "
+                f"slope={host['rss_slope']} MB/h tasks={host['tasks_last']}/{host['tasks_peak']}"
+            )
+            await Catalog.score(reporter.catalog_file, self.file_folder, {"host": host})
 
         # ⛔️ ==== 结束 采集 / 队列 / 动画 ====
         for arg in args:
@@ -197,7 +282,7 @@ class Memrix(object):
             elif isinstance(arg, asyncio.Event):
                 msg = f"{self.file_insert} records. Zero point."
                 self.memories.update(
-                    {"MSG": msg, "MOD": "*", "ACT": "*", "PSS": "*", "FOREGROUND": "*", "BACKGROUND": "*"}
+                    {"MSG": msg, "MOD": "*", "ACT": "*", "PSS": "*", "LAT": "*", "FOREGROUND": "*", "BACKGROUND": "*"}
                     if self.storm else
                     {"MSG": msg, "ANA": "*", "PFT": "*", "ERR": "*"}
                 )
@@ -264,7 +349,7 @@ class Memrix(object):
                 ))
 
                 await Cubicle.insert_gfx(
-                    db, self.file_folder, self.align.app_label, Period.convert_time(now_time), gfx_fmt_data
+                    db, self.file_folder, self.align.app_label, Period.convert_stamp(now_time), gfx_fmt_data
                 )
 
                 self.file_insert += 1
@@ -284,59 +369,134 @@ class Memrix(object):
     async def mix_collector(
         self,
         track_enabled: bool,
-        device: "Device",
-        db: "aiosqlite.Connection"
+        device: "Device"
     ) -> None:
         """
-        混合采集内存与 I/O 数据，自动识别前后台状态，异步解析并入库，支持持续追踪与队列化处理。
+        混合采集内存与 I/O 数据，自动识别前后台状态，异步解析后写入采样日志，由后台加载器入库。
+
+        内存明细以 `mem_speed` 为周期（自适应模式下由 `Governor` 在上下限之间调整）；`lanes` 中启用的通道（io、smaps、maps）各自以独立周期并行采样，
+        写入各自的数据表，进程列表沿用内存通道最近一次的查询结果，不额外增加进程查询。
         """
 
-        async def mem_analyze(pname: str) -> dict:
-            meminfo_map, summary_map = {}, {}
+        # 紧凑格式连续多轮无输出时回退为文本格式，回退后本次采集不再尝试
+        checkin_enabled, checkin_misses = self.align.mem_format == "checkin", 0
+
+        # 各通道共享的最近一次进程列表与换出量（I/O 通道的 swap 取自内存通道）
+        lanes, members, swap, smaps_enabled, maps_enabled = self.align.lanes, {}, 0.0, True, True
+
+        # smaps / maps 通道连续多轮有存活进程的分段却解析不出任何字段时，才判定无权读取并关闭该通道
+        lane_misses = {"smaps": 0, "maps": 0}
+
+        def unreadable(lane: str) -> bool:
+            lane_misses[lane] += 1
+            return lane_misses[lane] >= 3
+
+        # 映射通道上一次快照的取值（kB），只写入变化的映射
+        mappings: dict[tuple[str, str], tuple[int, int, int]] = {}
+
+        def metered() -> str:
+            # 计量启用时在探测命令前后插入 CPU 快照，覆盖观测进程与当前目标进程
+            return device.meter([*self.overhead.observers, *members]) if self.overhead else ""
+
+        def settle(lane: str, raw: typing.Optional[bytes]) -> typing.Optional[bytes]:
+            if not (self.overhead and raw):
+                return raw
+
+            raw = self.overhead.settle(lane, raw)
+            # 近期开销超出预算时拉长该通道周期，自适应模式同时抬高周期下限
+            if self.overhead.over_budget(lane) and (cadence := self.cadences.get(lane)):
+                cadence.period = min(round(cadence.period * 1.25, 3), 60.0)
+                if lane == "mem" and self.governor:
+                    self.governor.floor = min(max(self.governor.floor, cadence.period), self.governor.ceil)
+                logger.warning(f"Overhead {lane} over {self.overhead.budget}% budget, period -> {cadence.period}s")
+            self.memories["OVH"] = self.overhead.panel()
+            return raw
+
+        async def mem_checkin(tick: int, tms: int, pids: list[str], timing: dict) -> typing.Optional[dict]:
+            nonlocal checkin_enabled, checkin_misses
 
-            if not (mem_info := await device.mem_info(pname)):
+            # 紧凑格式一次调用输出应用全部进程，每轮只调用一次，由各进程共享
+            if not (mem_info := settle("mem", await Latency.timed(
+                    timing, "meminfo", device.mem_checkin(self.focus, pids, meter=metered())))):
                 return {}
 
-            if not re.search(r"====MEM====.*?====EOF====", mem_info, re.S):
+            start = time.perf_counter()
+            processes = Dissect.checkin(mem_info, pids[0])
+            Latency.lap(timing, "parse", start)
+            if not processes:
+                # 进程在查询进程列表与 dumpsys 之间退出或重启时没有任何 VmRSS 行，本轮跳过，不计为不支持
+                if b"VmRSS:" not in mem_info:
+                    logger.warning(f"MEM #{tick} checkin skipped, processes gone: {pids}")
+                    return None
+                # 进程仍在但没有紧凑格式行，连续多轮如此才判定设备不支持，其间本轮以文本格式补采
+                if (checkin_misses := checkin_misses + 1) >= 3:
+                    checkin_enabled = False
+                    logger.warning(f"Checkin meminfo unsupported, fallback to text format")
                 return {}
 
-            if app_meminfo := re.search(r"\*\* MEMINFO.*?(?=App Summary)", mem_info, re.S):
-                logger.info(f"Current APP MEMINFO\n{(meminfo_c := app_meminfo.group())}")
-                for i in [
-                    "Native Heap", "Dalvik Heap", "Dalvik Other", "Stack", "Ashmem", "Other dev",
-                    ".so mmap", ".jar mmap", ".apk mmap", ".ttf mmap", ".dex mmap", ".oat mmap", ".art mmap",
-                    "Other mmap", "GL mtrack", "Unknown"
-                ]:
-                    meminfo_map[i] = ToolKit.fit_mem(i, meminfo_c)
-                meminfo_map["TOTAL USS"] = ToolKit.uss_addition(meminfo_c)
-
-            if app_summary := re.search(r"App Summary.*?(?=Objects)", mem_info, re.S):
-                logger.info(f"Current APP SUMMARY\n{(summary_c := app_summary.group())}")
-                for i in [
-                    "Java Heap", "Native Heap", "Graphics", "TOTAL PSS", "TOTAL RSS", "TOTAL SWAP"
-                ]:
-                    summary_map[i] = ToolKit.fit_mem(i, summary_c)
+            checkin_misses = 0
+
+            self.archive.put(tick, "checkin", pids[0], tms, mem_info)
+            logger.info(f"MEM #{tick} checkin {len(mem_info)} B, {len(processes)} processes")
+            return processes
+
+        async def mem_analyze(
+            tick: int, tms: int, pid: str, pname: str, timing: dict, checkin: typing.Optional["asyncio.Future"]
+        ) -> dict:
+            if (processes := await checkin if checkin else {}) is None:
+                return {}
+            if not (parsed := processes.get(pid) or next(
+                    (v for v in processes.values() if v["process"] == pname), None)):
+                if not (mem_info := settle("mem", await Latency.timed(
+                        timing, "meminfo", device.mem_info(pname, meter=metered())))):
+                    return {}
+
+                if (start := mem_info.find(b"====MEM====")) < 0 or mem_info.find(b"====EOF====", start) < 0:
+                    return {}
+
+                # 单遍字节解析，一次取回全部分类与列
+                start = time.perf_counter()
+                parsed = Dissect.parse(mem_info)
+                Latency.lap(timing, "parse", start)
+                if not parsed:
+                    return {}
+
+                # 原始输出进入压缩存档，日志只保留一行摘要
+                self.archive.put(tick, "meminfo", pid, tms, mem_info)
+                logger.info(f"MEM #{tick} {pid} meminfo {len(mem_info)} B, {len(parsed['table'])} categories")
+
+            start = time.perf_counter()
+            meminfo_map, summary_map = Dissect.mem_fields(parsed)
+            Latency.lap(timing, "parse", start)
 
             return {"meminfo": meminfo_map, "summary": summary_map} if meminfo_map and summary_map else {}
 
-        async def io_analyze(pid: str) -> dict:
-            io_map = {}
+        async def io_analyze(tick: int, tms: int, pid: str, timing: dict) -> dict:
+            # 未启用独立 I/O 通道时随内存通道采样，开销计入内存通道
+            if not (io_info := settle("mem", await Latency.timed(timing, "io", device.io_info(pid, meter=metered())))):
+                return {}
 
-            if not (io_info := await device.io_info(pid)):
-                return io_map
+            if (start := io_info.find(b"====I/O====")) < 0 or (end := io_info.find(b"====EOF====", start)) < 0:
+                return {}
 
-            if app_io := re.search(r"====I/O====.*?====EOF====", io_info, re.S):
-                logger.info(f"Current APP IO\n{(app_io_c := app_io.group())}")
-                for i in ["rchar", "wchar", "read_bytes", "write_bytes", "cancelled_write_bytes"]:
-                    io_map[i] = ToolKit.fit_io(i, app_io_c)
-                for j in ["syscr", "syscw"]:
-                    io_map[j] = ToolKit.fit_io_count(j, app_io_c)
+            begin = time.perf_counter()
+            io_map = Dissect.io_fields(io_info[start:end])
+            Latency.lap(timing, "parse", begin)
+            if io_map:
+                self.archive.put(tick, "io", pid, tms, io_info)
+                logger.info(f"I/O #{tick} {pid} {len(io_info)} B")
 
             return {"io": io_map} if io_map else {}
 
-        async def union_analyzer(pid: str, pname: str) -> dict:
+        async def union_analyzer(
+            tick: int, tms: int, pid: str, pname: str, timing: dict, checkin: typing.Optional["asyncio.Future"]
+        ) -> dict:
+            # I/O 由独立通道采样
+            if "io" in lanes:
+                return await mem_analyze(tick, tms, pid, pname, timing, checkin)
+
             io_map, mem_map = await asyncio.gather(
-                *(io_analyze(pid), mem_analyze(pname))
+                *(io_analyze(tick, tms, pid, timing), mem_analyze(tick, tms, pid, pname, timing, checkin))
             )
             io_multiplex = io_map.get("io", {}) | {
                 "swap": mem_map.get("summary", {}).get("TOTAL SWAP", 0.0)
@@ -344,19 +504,236 @@ class Memrix(object):
 
             return {**mem_map, **{"io": io_multiplex}}
 
-        async def track_launcher() -> None:
-            self.dumped.clear()
+        async def io_launcher(tick: int, scheduled: int, turn: "asyncio.Event") -> None:
+            if not members:
+                return None
+
+            tms = Period.stamp()
+            io_map = defaultdict(float)
+            raw = settle("io", await device.proc_io(list(members), meter=metered()))
+            for pid, chunk in Dissect.sections(raw or b"").items():
+                if fields := Dissect.io_fields(chunk):
+                    self.archive.put(tick, "io", pid, tms, chunk)
+                    for k, v in fields.items():
+                        io_map[k] += v
+
+            if not io_map:
+                return None
+
+            await turn.wait()
+            self.journal.append(tms, self.align.app_label, None, {**io_map, "swap": swap})
+            self.cadences["io"].record(scheduled, tms)
+
+        async def smaps_launcher(tick: int, scheduled: int, turn: "asyncio.Event") -> None:
+            nonlocal smaps_enabled
+
+            if not (members and smaps_enabled):
+                return None
+
+            tms = Period.stamp()
+            smaps_map, processes = defaultdict(float), 0
+            raw = settle("smaps", await device.smaps_rollup(self.focus, list(members), meter=metered()))
+            for pid, chunk in (sections := Dissect.sections(raw or b"")).items():
+                if fields := Dissect.smaps_fields(chunk):
+                    self.archive.put(tick, "smaps", pid, tms, chunk)
+                    processes += 1
+                    for k, v in fields.items():
+                        smaps_map[k] += v
+
+            if not processes:
+                # 进程在内存通道查询之后全部退出或重启时没有任何分段，本轮跳过，不计为无权读取
+                if sections and unreadable("smaps"):
+                    smaps_enabled = False
+                    logger.warning(f"smaps_rollup unreadable for {self.focus}, smaps lane disabled")
+                return None
+
+            lane_misses["smaps"] = 0
+
+            await turn.wait()
+            self.journal.append(tms, self.align.app_label, None, None, smaps={**smaps_map, "processes": processes})
+            self.cadences["smaps"].record(scheduled, tms)
+            logger.info(f"SMAPS #{tick} {processes} processes PSS={smaps_map['pss']:.2f} MB")
+
+        async def maps_launcher(tick: int, scheduled: int, turn: "asyncio.Event") -> None:
+            nonlocal maps_enabled, mappings
+
+            if not (members and maps_enabled):
+                return None
+
+            tms = Period.stamp()
+            current: dict[tuple[str, str], tuple[int, int, int]] = {}
+            raw = settle("maps", await device.smaps(self.focus, list(members), meter=metered()))
+            for pid, chunk in (sections := Dissect.sections(raw or b"")).items():
+                if fields := Dissect.smaps_mappings(chunk):
+                    self.archive.put(tick, "maps", pid, tms, chunk)
+                    process = members.get(pid, pid)
+                    for mapping, values in fields.items():
+                        current[(process, mapping)] = values
+
+            if not current:
+                # 进程在内存通道查询之后全部退出或重启时没有任何分段，本轮跳过，不计为无权读取
+                if sections and unreadable("maps"):
+                    maps_enabled = False
+                    logger.warning(f"smaps unreadable for {self.focus}, maps lane disabled")
+                return None
+
+            lane_misses["maps"] = 0
+
+            # 仍在进程列表中但本轮没有输出的进程沿用上一次快照，不写入 0，避免虚假的回落与回涨
+            seen, listed = {process for process, _ in current}, set(members.values())
+            for key, values in mappings.items():
+                if key[0] not in seen and key[0] in listed:
+                    current[key] = values
+
+            # 增量编码：取值变化或新出现的映射写入当前值，消失的映射（含已离开进程列表的进程）写入 0
+            changed = [
+                (key, values) for key, values in current.items() if mappings.get(key) != values
+            ] + [
+                (key, (0, 0, 0)) for key in mappings.keys() - current.keys()
+            ]
+            mappings = current
+
+            if changed:
+                await turn.wait()
+                self.journal.append(tms, self.align.app_label, None, None, maps=[
+                    {
+                        "process": process, "mapping": mapping,
+                        **{k: round(v / 1024, 3) for k, v in zip(("rss", "pss", "swap"), values)}
+                    } for (process, mapping), values in changed
+                ])
+            self.cadences["maps"].record(scheduled, tms)
+            logger.info(f"MAPS #{tick} {len(current)} mappings, {len(changed)} changed")
+
+        async def heap_launcher(record: dict) -> None:
+            # 快照写入设备临时目录，等待写完后拉取到任务日志同目录并删除设备上的文件
+            remote = record["remote"]
+            local = self.heap_dir / Path(remote).name
+            try:
+                await device.dump_heap(record["pid"], remote)
+                if size := await device.settle_file(remote):
+                    await device.pull(remote, str(local))
+                record = {**record, **(
+                    {"local": str(local), "size": size, "status": "pulled"} if local.is_file() else {"status": "failed"}
+                )}
+            finally:
+                await device.remove(remote)
+
+            self.journal.append(Period.stamp(), self.align.app_label, None, None, heap=record)
+            self.memories["MSG"] = f"[bold #FFAF5F]Heap dump #{record['tick']} {record['status']}"
+            logger.info(f"Heap dump #{record['tick']} {record['status']}: {record.get('local') or remote}")
+
+            if record["status"] != "pulled":
+                return None
+            # 解析在线程中单遍完成，结果随日志入库，同一任务的多个快照之间可直接按类对比
+            try:
+                analysis = await asyncio.to_thread(Hprof(local).parse)
+            except (OSError, ValueError, struct.error) as e:
+                return logger.warning(f"Heap dump #{record['tick']} parse failed: {e}")
+            self.journal.append(
+                Period.stamp(), self.align.app_label, None, None, hprof={"tick": record["tick"], **analysis}
+            )
+            summary = analysis["summary"]
+            logger.info(
+                f"Heap dump #{record['tick']} parsed: {summary['objects']} objects "
+                f"{summary['shallow'] / 1048576:.2f} MB in {summary['elapsed']} ms"
+            )
+
+        def heap_trigger(tick: int, tms: int, pid: str, verdict: dict) -> None:
+            # 同一时间只保留一个在途快照，快照本身会让应用短暂停顿
+            if self.heaps:
+                return logger.warning(f"Heap dump in flight, trigger #{tick} skipped: {verdict}")
+
+            record = {
+                "tick": tick, "timestamp": tms, "pid": pid, "process": members.get(pid, self.focus),
+                **{k: verdict[k] for k in ("slope", "r2", "span", "pss")},
+                "remote": f"/data/local/tmp/{self.file_folder}_{tick}.hprof", "local": None, "size": None,
+                "status": "triggered"
+            }
+            self.journal.append(tms, self.align.app_label, None, None, heap=record)
+            self.heaps.add(task := asyncio.create_task(heap_launcher(record), name=f"heap dump {tick}"))
+            task.add_done_callback(self.heaps.discard)
+            logger.warning(f"Leak suspected #{tick}: {verdict}, dumping heap of {record['process']} ({pid})")
+
+        async def host_launcher(tick: int, scheduled: int, turn: "asyncio.Event") -> None:
+            tms = Period.stamp()
+            host = self.sentinel.sample(tms)
+
+            await turn.wait()
+            self.journal.append(tms, self.align.app_label, None, None, host=host)
+            self.cadences["host"].record(scheduled, tms)
+            logger.info(f"HOST #{tick} RSS={host['rss']:.2f} MB tasks={host['tasks']}")
+
+        async def event_launcher(flush: float) -> None:
+            # 常驻 logcat 流，事件按批写入日志：满 256 条或距上次写入超过 flush 秒
+            batch, counts, flushed = [], {}, time.monotonic()
+
+            def deliver() -> None:
+                nonlocal batch, flushed
+                if batch:
+                    self.journal.append(Period.stamp(), self.align.app_label, None, None, events=batch)
+                batch, flushed = [], time.monotonic()
+
+            try:
+                transports = await device.logcat(self.focus)
+            except OSError as e:
+                return logger.warning(f"logcat unavailable, events lane disabled: {e}")
+
+            try:
+                while not self.task_close_event.is_set():
+                    try:
+                        line = await asyncio.wait_for(transports.stdout.readline(), timeout=flush)
+                    except asyncio.TimeoutError:
+                        line = None
+                    except (ValueError, OSError) as e:
+                        logger.warning(f"logcat stream broken: {e}")
+                        break
+                    else:
+                        if not line:
+                            logger.warning(f"logcat exited with {await transports.wait()}")
+                            break
+
+                    if line and (event := Dissect.logcat_event(line)):
+                        # GC 与裁剪只保留目标应用进程，查杀与低内存事件为系统级，全部保留
+                        if event["kind"] in ("gc", "trim"):
+                            if not (event["pid"] in members or (not members and event["process"] == self.focus)):
+                                event = None
+                            else:
+                                event["process"] = members.get(event["pid"], event["process"])
+                        if event:
+                            batch.append(event)
+                            counts[event["kind"]] = counts.get(event["kind"], 0) + 1
+                            self.memories["EVT"] = " ".join(f"{k}={v}" for k, v in counts.items())
+                            if event["kind"] != "gc":
+                                logger.info(f"EVENT {event['kind']} {event['process']}({event['pid']}) {event['value']}")
+
+                    if len(batch) >= 256 or time.monotonic() - flushed >= flush:
+                        deliver()
+            finally:
+                deliver()
+                if transports.returncode is None:
+                    transports.terminate()
+                    try:
+                        await asyncio.wait_for(transports.wait(), timeout=5)
+                    except asyncio.TimeoutError:
+                        transports.kill()
+                        await transports.wait()
+                logger.info(f"Events: {counts}")
+
+        async def track_launcher(tick: int, scheduled: int, turn: "asyncio.Event") -> None:
+            nonlocal members, swap
 
             dump_start_time = time.time()
+            # 各阶段以单调时钟计时，写入日志后随样本入库
+            timing, begin = {}, time.perf_counter()
 
             # 🟡 ==== 进程查询 ====
-            if not (app_pid := await device.pid_value(self.focus)):
-                self.dumped.set()
+            if not (app_pid := await Latency.timed(timing, "pid", device.pid_value(self.focus))):
                 self.memories.update({
                     "MSG": f"[bold #FF5F5F]Process -> {app_pid}", "MOD": "*", "ACT": "*", "PSS": "*",
                 })
                 return logger.info(f"Process -> {app_pid}\n")
 
+            members = app_pid.member
             logger.info(device)
             self.memories.update({
                 "MSG": f"[bold #87D700]Process -> {app_pid.member}"
@@ -366,17 +743,18 @@ class Memrix(object):
             try:
                 main_pid = list(app_pid.member.keys())[0]
             except (KeyError, IndexError) as e:
-                self.dumped.set()
                 self.memories.update({
                     "MSG": f"[bold #FF5F5F]Pid -> {e}", "MOD": "*", "ACT": "*", "PSS": "*",
                 })
                 return logger.info(f"Pid -> {e}\n")
 
             # 🟡 ==== 图层查询 ====
-            activity, adj = await asyncio.gather(device.activity(), device.adj(main_pid))
+            activity, adj = await asyncio.gather(
+                Latency.timed(timing, "activity", device.activity()), Latency.timed(timing, "adj", device.adj(main_pid))
+            )
 
             mark_map = {
-                "mark": {"tms": (tms := time.strftime("%Y-%m-%d %H:%M:%S")), "act": activity}
+                "mark": {"tms": (tms := Period.stamp()), "act": activity}
             }
 
             # 🟡 ==== 图层判定 ====
@@ -393,7 +771,7 @@ class Memrix(object):
                 "MOD": f"[bold {color}]{state}", "ACT": activity
             })
 
-            logger.info(f"TMS: {mark_map['mark']['tms']}")
+            logger.info(f"TMS: {Period.format_stamp(mark_map['mark']['tms'])}")
             logger.info(f"ADJ: {mark_map['mark']['adj']}")
             logger.info(f"{mark_map['mark']['act']}")
             logger.info(f"{mark_map['mark']['mode']}")
@@ -401,10 +779,12 @@ class Memrix(object):
             mark_map["mark"]["pid"] = json.dumps(app_pid.member)
 
             # 🟡 ==== 信息查询 ====
+            checkin = asyncio.ensure_future(
+                mem_checkin(tick, tms, list(app_pid.member), timing)
+            ) if checkin_enabled else None
             if not (result := await asyncio.gather(
-                *(union_analyzer(pid, pname) for pid, pname in list(app_pid.member.items())))
+                *(union_analyzer(tick, tms, pid, pname, timing, checkin) for pid, pname in list(app_pid.member.items())))
             ):
-                self.dumped.set()
                 self.memories.update({
                     "MSG": f"[bold #FF5F5F]Resp -> {result}", "MOD": "*", "ACT": "*", "PSS": "*",
                 })
@@ -419,20 +799,57 @@ class Memrix(object):
             muster = {k: dict(v) for k, v in muster.items()}
 
             logger.info(f"Muster: {muster}")
+            swap = muster.get("summary", {}).get("TOTAL SWAP", swap)
+
+            # 🟡 ==== 进程明细 ====
+            procs = [
+                {
+                    "pid": pid, "process": pname,
+                    "pss": r["summary"]["TOTAL PSS"], "rss": r["summary"]["TOTAL RSS"], "uss": r["meminfo"]["TOTAL USS"],
+                    "swap": r["summary"]["TOTAL SWAP"], "java_heap": r["summary"]["Java Heap"],
+                    "native_heap": r["summary"]["Native Heap"], "graphics": r["summary"]["Graphics"]
+                } for (pid, pname), r in zip(app_pid.member.items(), result) if r.get("summary")
+            ]
 
             # 🟡 ==== 数据存储 ====
             try:
                 io_map, mem_map = muster.pop("io", {}), mark_map | muster
 
-                if muster:
-                    self.background.append(asyncio.create_task(
-                        Cubicle.insert_mem(db, self.file_folder, self.align.app_label, mem_map))
+                # 重叠的轮次按编号顺序追加，保证日志与入库顺序和时间一致
+                start = time.perf_counter()
+                await turn.wait()
+                start = Latency.lap(timing, "wait", start)
+
+                # 自适应模式按趋势估计选择下一轮周期，随样本记录供评分加权
+                interval = self.cadences["mem"].period
+                if self.governor and "summary" in muster:
+                    interval = self.cadences["mem"].period = self.governor.update(
+                        muster["summary"]["TOTAL PSS"], mode, tms
                     )
+
+                # 追加写入日志即视为确认，由后台加载器批量入库
+                self.journal.append(
+                    tms, self.align.app_label, mem_map if muster else None, io_map or None,
+                    (tick, scheduled, int(interval * 1000)), procs=procs or None
+                )
+                self.cadences["mem"].record(scheduled, tms)
+                Latency.lap(timing, "journal", start)
+                Latency.lap(timing, "total", begin)
+
+                # 在线泄漏检测：PSS 持续增长时在后台抓取一次堆快照
+                if self.warden and "summary" in muster and (
+                        verdict := self.warden.feed(tms, muster["summary"]["TOTAL PSS"], mode)):
+                    heap_trigger(tick, tms, main_pid, verdict)
+
+                # 耗时分解作为独立记录紧随样本写入，实时面板显示最近窗口的分位数
+                breakdown = self.latency.record(timing)
+                self.journal.append(tms, self.align.app_label, None, None, ticks={"tick": tick, **breakdown})
+                self.memories["LAT"] = self.latency.panel()
+                logger.info(f"Latency #{tick}: {breakdown}")
+
+                if muster:
                     logger.info(f"Stick MEM: {mem_map.get('summary', {})}")
                 if io_map:
-                    self.background.append(asyncio.create_task(
-                        Cubicle.insert_io(db, self.file_folder, self.align.app_label, tms, io_map))
-                    )
                     logger.info(f"Stick I/O: {io_map}")
 
                 self.file_insert += 1
@@ -452,16 +869,52 @@ class Memrix(object):
                 logger.info(msg)
 
             finally:
-                self.dumped.set()
-                logger.info(f"{time.time() - dump_start_time:.2f} s\n")
+                logger.info(f"#{tick} lag {tms - scheduled} ms, {time.time() - dump_start_time:.2f} s\n")
 
         if not track_enabled:
             return None
 
-        self.dumped = asyncio.Event()
-        while not self.task_close_event.is_set():
-            await track_launcher()
-            await asyncio.sleep(self.align.mem_speed)
+        # 固定速率调度，单轮耗时不再叠加到采样周期上；各通道独立调度
+        launchers = {
+            "mem": track_launcher, "io": io_launcher, "smaps": smaps_launcher, "maps": maps_launcher,
+            "host": host_launcher
+        }
+
+        # 浸泡模式额外以低频记录宿主进程自身的内存与任务数
+        if (soak := self.align.soak)["enabled"]:
+            self.sentinel, lanes = Sentinel(), {**lanes, "host": soak["monitor"]}
+        self.governor = Governor(
+            self.align.mem_speed_min, self.align.mem_speed_max
+        ) if self.align.mem_adaptive else None
+        self.cadences = {
+            "mem": Cadence(self.governor.interval if self.governor else self.align.mem_speed)
+        } | {
+            lane: Cadence(period) for lane, period in lanes.items()
+        }
+        self.dumped = self.cadences["mem"].idle
+        self.latency = Latency()
+
+        # 在线泄漏检测，触发后抓取堆快照
+        if (warden := self.align.warden)["enabled"]:
+            self.warden = Warden(**{k: v for k, v in warden.items() if k != "enabled"})
+            logger.info(f"Warden: {warden}")
+
+        # 观测开销计量：system_server 与 adbd 的 PID 在采集开始时查询一次
+        if (observer := self.align.observer)["enabled"]:
+            self.overhead = Overhead(await device.observer_pids(), observer["budget"])
+            logger.info(f"Observer: {self.overhead.observers} budget={observer['budget']}%")
+        logger.info(f"Lanes: {' '.join(f'{k}={v.period}s' for k, v in self.cadences.items())}")
+
+        # GC 与低内存事件：整个采集期间一条常驻 logcat 流
+        events = asyncio.create_task(
+            event_launcher(stream["flush"]), name="events"
+        ) if (stream := self.align.events)["enabled"] else None
+
+        await asyncio.gather(
+            *(cadence.pace(launchers[lane], self.task_close_event) for lane, cadence in self.cadences.items())
+        )
+        if events:
+            await events
 
     # """星痕律动 / 帧影流光"""
     async def track_core_task(self, device: "Device") -> None:
@@ -478,7 +931,11 @@ class Memrix(object):
         )
         self.file_insert = 0
         self.file_folder = f"{prefix}_{(now_time := time.strftime('%Y%m%d%H%M%S'))}"
-        traces = await reporter.spawn_trace_hub(self.file_folder)
+        # 浸泡模式按大小轮换任务日志与采样日志分段，长时间运行时磁盘与宿主内存占用有界
+        soak = self.align.soak
+        traces = await reporter.spawn_trace_hub(
+            self.file_folder, *((f"{soak['rotate_mb']} MB", soak["keep_logs"]) if soak["enabled"] else ())
+        )
 
         logger.info(f"^*{self.padding} {const.APP_DESC} Engine Start {self.padding}*^")
 
@@ -499,16 +956,40 @@ class Memrix(object):
 
         # 🏆 ========== 显示面板 ==========
         self.memories = {
-            "MSG": "*", "MOD": "*", "ACT": "*", "PSS": "*", "FOREGROUND": 0, "BACKGROUND": 0
+            "MSG": "*", "MOD": "*", "ACT": "*", "PSS": "*", "LAT": "*", "FOREGROUND": 0, "BACKGROUND": 0
         } if self.storm else {
             "MSG": "*", "ANA": "*", "PFT": "*", "ERR": "*"
         }
 
         # 🏆 ========== 开始采样 ==========
-        async with aiosqlite.connect(reporter.db_file) as db:
+        # 按设备分片写入，多台设备同时采集同一分组时互不争用写锁
+        async with aiosqlite.connect(reporter.shard_file(device.serial)) as db:
             await Cubicle.initialize_tables(
                 db, self.file_folder, cur_title, Period.convert_time(now_time), device.device_info
             )
+            await Catalog.register(reporter.catalog_file, self.file_folder, {
+                "group_dir": Path(reporter.group_dir).name,
+                "kind": prefix,
+                "scene": reporter.scene,
+                "package": self.focus,
+                "label": self.align.app_label,
+                "title": cur_title,
+                "started": Period.convert_stamp(now_time),
+                **device.device_info
+            })
+            await self.replay_journals(reporter, db)
+
+            # 采样热路径只写日志，后台加载器批量入库
+            self.journal = Journal(
+                Path(reporter.assemblage) / f"{self.file_folder}{const.JOURNAL_SUFFIX}",
+                soak["rotate_mb"] << 20 if soak["enabled"] else 0
+            ).open()
+            self.journal_close_event = asyncio.Event()
+            # 原始输出写入任务日志同目录的压缩存档
+            self.archive = Archive(traces.parent / f"{self.file_folder}{const.ARCHIVE_SUFFIX}").open()
+            self.journal_task = asyncio.create_task(
+                self.journal.loader(db, self.journal_close_event), name="journal loader task"
+            )
             self.animation_task = asyncio.create_task(
                 getattr(self.design, "mem_wave" if self.storm else "gfx_wave")(
                     self.memories, self.atlas, animation_event := asyncio.Event()
@@ -523,7 +1004,8 @@ class Memrix(object):
             )
 
             watcher = asyncio.create_task(self.watcher())
-            await self.mix_collector(self.storm, device, db)
+            self.heap_dir = traces.parent
+            await self.mix_collector(self.storm, device)
 
             await self.task_close_event.wait()
 
@@ -537,14 +1019,155 @@ class Memrix(object):
                 watcher, self.sample_stop(reporter, pft_task, gfx_task, animation_event)
             )
 
+        reporter.close_trace_hub()
+
+    @staticmethod
+    async def replay_journals(reporter: "Reporter", db: "aiosqlite.Connection") -> None:
+        """
+        重放分组内遗留的采样日志（上次运行异常退出时未入库的样本），并补写目录登记的结束信息。
+        """
+        for data_dir, (loaded, stopped) in (await Journal.replay(db, reporter.assemblage)).items():
+            logger.info(f"Replayed journal {data_dir}: {loaded} records")
+            await Catalog.conclude(reporter.catalog_file, data_dir, stopped, loaded)
+
+    @staticmethod
+    async def locate(src_total_place: str, target: str) -> tuple["Path", str, str]:
+        """
+        将分组目录名或任务目录名解析为 (分组目录, 场景, 类型)，目录登记优先，旧版分组回退到目录名解析。
+        """
+        original = Path(src_total_place) / const.TOTAL_DIR / const.TREE_DIR
+        catalog_file = Path(src_total_place) / const.TOTAL_DIR / const.CATALOG_FILE
+
+        if catalog_file.parent.exists() and (entry := await Catalog.resolve(str(catalog_file), target)):
+            return original / entry["group_dir"], entry["scene"], entry["kind"]
+
+        target_dir = original / target
+        if len(parts := target_dir.name.split("_")) != 2:
+            raise MemrixError(f"Unexpected directory name format: {target_dir.name}")
+        return target_dir, *parts
+
+    # """星尘封存"""
+    @staticmethod
+    async def exchange_export(src_total_place: str, target: str, arrow_ipc: bool, align: "Align") -> None:
+        """
+        将分组（或分组中的单个任务）导出为分区列式文件，输出到 `Memrix_Library/Export/<分组名>`。
+        """
+        target_dir, src, dst = await Memrix.locate(src_total_place, target)
+        reporter = Reporter(src_total_place, src, dst, align)
+
+        if not (shards := reporter.shard_files()):
+            raise MemrixError(f"Missing valid data file: {reporter.db_file}")
+        if not Path(reporter.team_file).is_file():
+            raise MemrixError(f"Missing valid data file: {reporter.team_file}")
+
+        team_data = await FileAssist.read_yaml(reporter.team_file)
+        data_dirs = [target] if target in (files := team_data.get("file") or []) else files
+        if not data_dirs:
+            raise MemrixError(f"No data scenario: {data_dirs} ...")
+
+        catalog_file = reporter.catalog_file
+        entries = await Catalog.entries(catalog_file, data_dirs) if Path(catalog_file).is_file() else []
+
+        out_dir = Path(reporter.total_dir) / const.EXPORT_DIR / target_dir.name
+        logger.info(f"Export {len(data_dirs)} tasks -> {out_dir}")
+
+        root = await Exchange.export(shards, str(out_dir), data_dirs, {
+            "group_dir": target_dir.name, "scene": src, "kind": dst, "team": team_data, "catalog": entries
+        }, arrow_ipc)
+
+        Design.console.print()
+        Design.build_file_tree(str(root))
+        Design.console.print()
+        logger.info(f"Usage: {const.APP_NAME} --ingest {root}")
+
+    # """星尘归航"""
+    @staticmethod
+    async def exchange_ingest(src_total_place: str, src_dir: str, scene: typing.Optional[str], align: "Align") -> None:
+        """
+        将导出目录导入为分组，合并任务列表并重新登记全局目录。
+        """
+        if not (manifest_file := Path(src_dir) / "manifest.json").is_file():
+            raise MemrixError(f"Missing manifest: {manifest_file}")
+        manifest = json.loads(manifest_file.read_text(encoding=const.CHARSET))
+
+        reporter = Reporter(src_total_place, scene or manifest["scene"], manifest["kind"], align)
+        logger.info(f"Ingest {src_dir} -> {reporter.group_dir}")
+
+        # 导入数据单独成片，删除导入结果只需删除该分片
+        await Exchange.ingest(src_dir, reporter.shard_file(f"ingest_{manifest['group_dir']}"))
+
+        team_data = manifest.get("team") or {}
+        if Path(reporter.team_file).is_file():
+            current = await FileAssist.read_yaml(reporter.team_file)
+            current["file"] = list(dict.fromkeys(current.get("file", []) + manifest["data_dirs"]))
+            team_data = current
+        await FileAssist.dump_yaml(reporter.team_file, team_data)
+
+        for entry in manifest.get("catalog", []):
+            await Catalog.register(reporter.catalog_file, entry["data_dir"], {
+                **entry, "group_dir": Path(reporter.group_dir).name, "scene": reporter.scene
+            })
+            await Catalog.conclude(reporter.catalog_file, entry["data_dir"], entry["stopped"], entry["samples"])
+            if entry.get("scores"):
+                await Catalog.score(reporter.catalog_file, entry["data_dir"], entry["scores"])
+
+        Design.console.print()
+        Design.build_file_tree(reporter.group_dir)
+        Design.console.print()
+        logger.info(f"Usage: {const.APP_NAME} --forge {Path(reporter.group_dir).name}")
+
+    # """星核坍缩"""
+    @staticmethod
+    async def compaction(src_total_place: str, align: "Align", dry: bool) -> None:
+        """
+        按 retain 策略压缩全部分组的过期任务，丢弃原始帧的任务同步回写目录评分。
+        """
+        await align.load_align()
+
+        total_dir = os.path.join(src_total_place, const.TOTAL_DIR)
+        reports = await Compactor.compact(total_dir, align.retain, dry)
+
+        catalog_file = os.path.join(total_dir, const.CATALOG_FILE)
+        if not dry and Path(catalog_file).is_file():
+            for report in reports:
+                for data_dir, score in report["scores"].items():
+                    await Catalog.score(catalog_file, data_dir, {
+                        "GFX": {
+                            "level": score["level"],
+                            "score": round(float(score["score"]), 4),
+                            "avg_fps": round(float(score["avg_fps"]), 2),
+                            "min_fps": round(float(score["min_fps"]), 2)
+                        }
+                    })
+
+        return Design.show_compaction(reports, dry)
+
+    # """星痕回溯"""
+    @staticmethod
+    async def replay_archive(src_total_place: str, target: str) -> None:
+        """
+        解析任务目录名或存档路径，将原始采集存档逐轮重新送入解析器并显示结果。
+        """
+        if not (archive_file := Path(target)).is_file():
+            target_dir, *_ = await Memrix.locate(src_total_place, target)
+            archive_file = target_dir / const.SUMMARY / target / f"{target}{const.ARCHIVE_SUFFIX}"
+
+        if not archive_file.is_file():
+            raise MemrixError(f"Missing raw capture archive: {archive_file}")
+
+        rows = await asyncio.to_thread(lambda: list(Archive.replay(archive_file)))
+        return Design.show_replay(rows)
+
     # """真相快照"""
     async def observation(self, reporter: typing.Optional["Reporter"] = None) -> None:
         """
         执行报告生成流程，载入任务数据、渲染多任务报告并输出 HTML，含动画与错误处理机制。
         """
-        original = Path(self.src_total_place) / const.TOTAL_DIR / const.TREE_DIR
+        if reporter:
+            target_dir, src, dst = Path(reporter.group_dir), reporter.scene, reporter.classify_type
+        else:
+            target_dir, src, dst = await self.locate(self.src_total_place, self.forge)
 
-        target_dir = original / Path(reporter.group_dir).name if reporter else original / self.forge
         if not target_dir.exists():
             raise MemrixError(f"Target directory {target_dir.name} does not exist ...")
 
@@ -552,10 +1175,6 @@ class Memrix(object):
             "Storm": "mem_rendition", "Sleek": "gfx_rendition"
         }
 
-        if len(parts := target_dir.name.split("_")) != 2:
-            raise MemrixError(f"Unexpected directory name format: {target_dir.name}")
-        src, dst = parts
-
         try:
             render = segment_router[dst]
         except KeyError:
@@ -563,9 +1182,14 @@ class Memrix(object):
 
         reporter = reporter or Reporter(self.src_total_place, src, dst, self.align)
 
-        for file in [reporter.db_file, reporter.team_file]:
-            if not Path(file).is_file():
-                raise MemrixError(f"Missing valid data file: {file}")
+        for shard in (shards := reporter.shard_files()):
+            async with aiosqlite.connect(shard) as db:
+                await self.replay_journals(reporter, db)
+
+        if not shards:
+            raise MemrixError(f"Missing valid data file: {reporter.db_file}")
+        if not Path(reporter.team_file).is_file():
+            raise MemrixError(f"Missing valid data file: {reporter.team_file}")
 
         try:
             team_data = await FileAssist.read_yaml(reporter.team_file)
@@ -585,8 +1209,10 @@ class Memrix(object):
             name="animation task"
         )
 
-        async with aiosqlite.connect(reporter.db_file) as db:
-            with ProcessPoolExecutor(initializer=Active.active, initargs=(const.SHOW_LEVEL,)) as executor:
+        workers = os.cpu_count() or 1
+
+        async with Pool(shards, workers) as pool:
+            with ProcessPoolExecutor(workers, initializer=Active.active, initargs=(const.SHOW_LEVEL,)) as executor:
                 self.memories.update({
                     "MSG": f"Rendering {total} tasks",
                     "TMS": f"{time.time() - reporter.before_time:.1f} s"
@@ -594,7 +1220,7 @@ class Memrix(object):
 
                 func, loop = getattr(reporter, render), asyncio.get_running_loop()
 
-                if not (resp := await func(db, loop, executor, self.memories, team_data, self.layer)):
+                if not (resp := await func(pool, loop, executor, self.memories, team_data, self.layer)):
                     animation_event.set()
                     await self.animation_task
                     raise MemrixError(f"Rendering tasks failed")
@@ -647,7 +1273,10 @@ class Perfetto(object):
         self.trace_loc = trace_loc
 
         self.last_record: str = ""
-        self.backgrounds: list["asyncio.Task"] = []
+        # 拉取任务与输出流读取任务完成后自动移出，长时间运行时集合大小有界
+        self.backgrounds: set["asyncio.Task"] = set()
+        self.streams: set["asyncio.Task"] = set()
+        self.inflight = 2
 
     @staticmethod
     async def input_stream(transports: "asyncio.subprocess.Process") -> None:
@@ -679,8 +1308,9 @@ class Perfetto(object):
         transports = await self.device.perfetto_start(
             device_folder, target_folder
         )
-        _ = asyncio.create_task(self.input_stream(transports))
-        _ = asyncio.create_task(self.error_stream(transports))
+        for stream in (self.input_stream(transports), self.error_stream(transports)):
+            self.streams.add(task := asyncio.create_task(stream))
+            task.add_done_callback(self.streams.discard)
 
         return target_folder
 
@@ -720,9 +1350,11 @@ class Perfetto(object):
             })
             await asyncio.sleep(self.gfx_speed)
             await self.device.perfetto_close()
-            self.backgrounds.append(asyncio.create_task(
-                self.close(target_folder))
-            )
+            # 拉取积压时等待最早的任务完成，不无限堆积在途任务
+            if len(self.backgrounds) >= self.inflight:
+                await asyncio.wait(self.backgrounds, return_when=asyncio.FIRST_COMPLETED)
+            self.backgrounds.add(task := asyncio.create_task(self.close(target_folder)))
+            task.add_done_callback(self.backgrounds.discard)
             memories.update({
                 "PFT": "[bold #87FFD7]Push ..."
             })
@@ -856,6 +1488,29 @@ async def main() -> typing.Any:
 
     await authorize.verify_license(lic_file)
 
+    # Notes: ========== 全局目录 ==========
+    if cmd_lines.index is not None:
+        catalog_file = os.path.join(src_total_place, const.TOTAL_DIR, const.CATALOG_FILE)
+        entries = await Catalog.search(
+            catalog_file, cmd_lines.index, cmd_lines.focus, cmd_lines.imply, cmd_lines.scene
+        ) if Path(catalog_file).parent.exists() else []
+        return Design.show_catalog(entries)
+
+    # Notes: ========== 数据交换 ==========
+    if cmd_lines.export:
+        return await Memrix.exchange_export(src_total_place, cmd_lines.export, cmd_lines.arrow, align)
+
+    if cmd_lines.ingest:
+        return await Memrix.exchange_ingest(src_total_place, cmd_lines.ingest, cmd_lines.scene, align)
+
+    # Notes: ========== 保留策略 ==========
+    if cmd_lines.shrink:
+        return await Memrix.compaction(src_total_place, align, cmd_lines.dry)
+
+    # Notes: ========== 存档重放 ==========
+    if cmd_lines.replay:
+        return await Memrix.replay_archive(src_total_place, cmd_lines.replay)
+
     # Notes: ========== 工具路径设置 ==========
     if platform == "win32":
         supports = os.path.join(turbo, "Windows").format()